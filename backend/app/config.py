@@ -1,11 +1,76 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, List, Optional
 
 class Settings(BaseSettings):
     SECRET_KEY: str = "your-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    USER_CACHE_SIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: float = 60
+    APPROVAL_RULES_TTL_SECONDS: float = 30
+    AUTH_TRUST_TOKEN_CLAIMS: bool = False
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: Optional[int] = None
+    PASSWORD_HASH_BULK_WORKERS: Optional[int] = None
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    PASSWORD_HASH_USE_PROCESSES: bool = True
     DATABASE_URL: str = "sqlite:///./payroll.db"
+    AUTO_MIGRATE: bool = True
+    DATABASE_REPLICA_URLS: List[str] = []
+    REPLICA_STICKY_SECONDS: float = 5
+    REPLICA_RETRY_SECONDS: float = 30
+    REPLICA_HEALTH_CHECK_INTERVAL_SECONDS: float = 10
+    REPLICA_MAX_LAG_SECONDS: Optional[float] = None
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    SQLITE_WAL: bool = True
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KB: int = 20000
+    SQLITE_MMAP_SIZE: int = 268435456
+    ASYNC_ROUTES: bool = False
+    CACHE_URL: Optional[str] = None
+    CACHE_MAX_ENTRIES: int = 10000
+    CACHE_DEFAULT_TTL_SECONDS: float = 30
+    EVENTS_BROKER_URL: Optional[str] = None
+    EVENTS_QUEUE_SIZE: int = 100
+    EVENTS_HEARTBEAT_SECONDS: float = 15
+    EXPORT_CHUNK_SIZE: int = 1000
+    CHANGE_FEED_SETTLE_SECONDS: float = 2
+    SMTP_HOST: Optional[str] = None
+    SMTP_PORT: int = 587
+    SMTP_USERNAME: Optional[str] = None
+    SMTP_PASSWORD: Optional[str] = None
+    SMTP_USE_TLS: bool = True
+    SMTP_FROM: str = "payroll@example.com"
+    SMTP_TIMEOUT_SECONDS: float = 10
+    SMTP_CONNECTIONS: int = 4
+    OUTBOX_BATCH_SIZE: int = 200
+    OUTBOX_MAX_ATTEMPTS: int = 5
+    OUTBOX_RETRY_BASE_SECONDS: float = 30
+    OUTBOX_POLL_INTERVAL_SECONDS: float = 5
+    PDF_CACHE_DIR: str = "./pdf_cache"
+    PDF_RENDER_WORKERS: Optional[int] = None
+    PDF_RENDER_USE_PROCESSES: bool = False
+    JOBS_WORKERS: int = 2
+    JOBS_RESULT_DIR: str = "./job_results"
+    DEFAULT_PAGE_SIZE: int = 100
+    MAX_PAGE_SIZE: int = 1000
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_URL: Optional[str] = None
+    RATE_LIMIT_ANONYMOUS: str = "300/minute"
+    RATE_LIMIT_AUTHENTICATED: str = "600/minute"
+    RATE_LIMIT_ROUTES: Dict[str, str] = {}
+    RATE_LIMIT_TRUSTED_PROXIES: List[str] = []
+    RATE_LIMIT_EXEMPT_PATHS: List[str] = ["/", "/health", "/metrics"]
+    RATE_LIMIT_EVICT_INTERVAL_SECONDS: float = 60
+    METRICS_ENABLED: bool = True
+    QUERY_BUDGET_ENABLED: bool = False
+    QUERY_BUDGET_MAX_QUERIES: int = 20
+    QUERY_BUDGET_SLOW_QUERY_MS: float = 100
     
     class Config:
         env_file = ".env"
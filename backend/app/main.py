@@ -1,30 +1,95 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from .models.user import Base
-from .models.salary_slip import SalarySlip
-from .models.expense import Expense
-from .utils.database import engine
-from .routes import auth, admin, employee
+from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi.utils import generate_unique_id
+from .config import settings
+from .utils.database import get_engine
+from .utils.replicas import replicas
+from .utils.migrations import run_migrations
+from .utils.password_hasher import password_hasher, PasswordHasherBusy
+from .services.slip_documents import slip_documents
+from .services.email import email_service
+from .services.outbox import outbox_dispatcher
+from .services.jobs import job_service
+from .services.events import event_broker
+from .middleware.rate_limit import rate_limiter
+from .middleware.logging import RequestLoggingMiddleware
+from .utils.query_budget import QueryBudgetMiddleware
+from .utils.metrics import metrics
+from .routes import auth, admin, employee, jobs, events
 
-Base.metadata.create_all(bind=engine)
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Nothing touches the database at import time; deployments that migrate
+    # in a release step set AUTO_MIGRATE=false
+    if settings.AUTO_MIGRATE:
+        run_migrations(get_engine())
+    eviction = asyncio.create_task(rate_limiter.evict_forever(settings.RATE_LIMIT_EVICT_INTERVAL_SECONDS))
+    replica_checks = (
+        asyncio.create_task(replicas.check_forever(settings.REPLICA_HEALTH_CHECK_INTERVAL_SECONDS))
+        if replicas.urls else None
+    )
+    if email_service.configured:
+        outbox_dispatcher.start()
+    else:
+        logger.warning("SMTP_HOST is not set; notifications stay queued in the outbox")
+    job_service.resume_queued()
+    event_broker.start()
+    yield
+    event_broker.stop()
+    eviction.cancel()
+    if replica_checks is not None:
+        replica_checks.cancel()
+    outbox_dispatcher.stop()
+    job_service.shutdown()
+    password_hasher.shutdown()
+    slip_documents.shutdown()
 
 app = FastAPI(
     title="Payroll Management System",
     description="A comprehensive payroll management system with role-based access control",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
+# Registered before CORS so CORS wraps it and 429 responses still carry CORS headers
+app.middleware("http")(rate_limiter)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-RateLimit-Limit", "X-RateLimit-Remaining", "Retry-After"],
 )
 
+if settings.QUERY_BUDGET_ENABLED:
+    app.add_middleware(
+        QueryBudgetMiddleware,
+        max_queries=settings.QUERY_BUDGET_MAX_QUERIES,
+        slow_query_ms=settings.QUERY_BUDGET_SLOW_QUERY_MS
+    )
+
+if settings.METRICS_ENABLED:
+    # Outermost, so rejected and failed requests are measured as well
+    app.add_middleware(RequestLoggingMiddleware)
+
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Too many concurrent sign-ins, please retry shortly"},
+        headers={"Retry-After": "1"}
+    )
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     import traceback
@@ -37,10 +102,25 @@ async def global_exception_handler(request: Request, exc: Exception):
 
 from .routes import analytics
 
+if settings.ASYNC_ROUTES:
+    # Registered first so they take precedence; paths without an async
+    # variant fall through to the sync routers below
+    from .routes.async_api import (
+        auth as async_auth, admin as async_admin,
+        employee as async_employee, analytics as async_analytics
+    )
+    for async_module in (async_auth, async_admin, async_employee, async_analytics):
+        app.include_router(
+            async_module.router,
+            generate_unique_id_function=lambda route: "async_" + generate_unique_id(route)
+        )
+
 app.include_router(auth.router)
 app.include_router(admin.router)
 app.include_router(employee.router)
 app.include_router(analytics.router)
+app.include_router(jobs.router)
+app.include_router(events.router)
 
 @app.get("/")
 def root():
@@ -54,3 +134,7 @@ def root():
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def get_metrics():
+    return metrics.render()
@@ -1,17 +1,44 @@
-from fastapi import Request
 import time
 import logging
+from ..utils.metrics import metrics
 
 logger = logging.getLogger(__name__)
 
-async def log_requests(request: Request, call_next):
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    
-    logger.info(
-        f"{request.method} {request.url.path} "
-        f"completed in {process_time:.2f}s with status {response.status_code}"
-    )
-    
-    return response
+class RequestLoggingMiddleware:
+    """Logs each request and records its latency and DB work in ``metrics``.
+
+    Plain ASGI rather than ``@app.middleware("http")``: it runs on every
+    request, and the ``BaseHTTPMiddleware`` wrapper costs more than the
+    measurement itself.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = metrics.start_request()
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            process_time = time.perf_counter() - start_time
+            # Label by route template, not raw path, to keep label cardinality bounded
+            route_path = getattr(scope.get("route"), "path", "unmatched")
+            metrics.finish_request(scope["method"], route_path, status_code, process_time, stats)
+            logger.info(
+                "%s %s completed in %.1fms with status %s (%s queries, %.1fms in DB)",
+                scope["method"], scope["path"], process_time * 1000, status_code,
+                stats.queries, stats.db_seconds * 1000
+            )
@@ -1,25 +1,266 @@
-from fastapi import Request, HTTPException
-from collections import defaultdict
-from datetime import datetime, timedelta
+"""Sliding-window-counter rate limiting.
+
+Each key keeps only the counts of the current and previous fixed windows;
+the request rate is estimated by weighting the previous window by how much
+of it still overlaps the sliding window. Memory per key is constant and
+idle keys are evicted in the background.
+"""
+import asyncio
+import fnmatch
+import ipaddress
+import logging
+import math
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from ..config import settings
+from ..utils.auth import decode_token
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+class RateLimitRule(NamedTuple):
+    limit: int
+    window_seconds: int
+
+def parse_rate(text: str) -> RateLimitRule:
+    """Parse ``"<count>/<second|minute|hour|day>"``, e.g. ``"60/minute"``."""
+    count, _, period = text.partition("/")
+    try:
+        return RateLimitRule(int(count), PERIODS[period.strip().rstrip("s")])
+    except (ValueError, KeyError):
+        raise ValueError(f"Invalid rate limit {text!r}, expected e.g. '60/minute'")
+
+class Decision(NamedTuple):
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: int
+
+def _decide(rule: RateLimitRule, now: float, current: int, previous: int) -> Decision:
+    """Decide on a request given the counts before it was recorded."""
+    elapsed = (now % rule.window_seconds) / rule.window_seconds
+    estimated = previous * (1 - elapsed) + current
+    if estimated + 1 > rule.limit:
+        if previous:
+            # Time until the previous window's weight has decayed enough
+            needed = (estimated + 1 - rule.limit) / previous * rule.window_seconds
+            retry_after = min(needed, rule.window_seconds * (1 - elapsed))
+        else:
+            retry_after = rule.window_seconds * (1 - elapsed)
+        return Decision(False, rule.limit, 0, max(1, math.ceil(retry_after)))
+    return Decision(True, rule.limit, int(rule.limit - estimated - 1), 0)
+
+class LocalRateLimitStore:
+    """Per-process counters. Also the stand-in for a shared store when no
+    ``RATE_LIMIT_URL`` is configured."""
+
+    def __init__(self):
+        # key -> [window index, current count, previous count, window seconds]
+        self._counters: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._counters)
+
+    def hit(self, key: str, rule: RateLimitRule, now: Optional[float] = None) -> Decision:
+        return self.hit_many([(key, rule)], now)[0]
+
+    def hit_many(self, hits: List[Tuple[str, RateLimitRule]], now: Optional[float] = None) -> List[Decision]:
+        """Decide on every key; quota is consumed only if all of them allow."""
+        now = time.time() if now is None else now
+        with self._lock:
+            counters, decisions = [], []
+            for key, rule in hits:
+                window = int(now // rule.window_seconds)
+                counter = self._counters.get(key)
+                if counter is None:
+                    counter = self._counters[key] = [window, 0, 0, rule.window_seconds]
+                elif counter[0] != window:
+                    counter[2] = counter[1] if counter[0] == window - 1 else 0
+                    counter[0], counter[1] = window, 0
+                counters.append(counter)
+                decisions.append(_decide(rule, now, counter[1], counter[2]))
+            if all(decision.allowed for decision in decisions):
+                for counter in counters:
+                    counter[1] += 1
+        return decisions
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """Drop keys whose windows no longer affect any decision."""
+        now = time.time() if now is None else now
+        with self._lock:
+            idle = [
+                key for key, (window, _, _, seconds) in self._counters.items()
+                if window < int(now // seconds) - 1
+            ]
+            for key in idle:
+                del self._counters[key]
+        return len(idle)
+
+class RedisRateLimitStore:
+    """Counters shared by every worker; Redis key expiry handles eviction."""
+
+    blocking = True
+
+    def __init__(self, client, prefix: str = "payroll:ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+
+    def hit(self, key: str, rule: RateLimitRule, now: Optional[float] = None) -> Decision:
+        return self.hit_many([(key, rule)], now)[0]
+
+    def hit_many(self, hits: List[Tuple[str, RateLimitRule]], now: Optional[float] = None) -> List[Decision]:
+        now = time.time() if now is None else now
+        current_keys = []
+        pipe = self.client.pipeline()
+        for key, rule in hits:
+            window = int(now // rule.window_seconds)
+            current_keys.append(f"{self.prefix}{key}:{window}")
+            pipe.incr(current_keys[-1])
+            pipe.expire(current_keys[-1], rule.window_seconds * 2)
+            pipe.get(f"{self.prefix}{key}:{window - 1}")
+        results = pipe.execute()
+        decisions = [
+            _decide(rule, now, int(results[3 * i]) - 1, int(results[3 * i + 2] or 0))
+            for i, (_, rule) in enumerate(hits)
+        ]
+        if not all(decision.allowed for decision in decisions):
+            # A rejected request consumes no quota under any of its keys
+            pipe = self.client.pipeline()
+            for current_key in current_keys:
+                pipe.decr(current_key)
+            pipe.execute()
+        return decisions
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        return 0
 
 class RateLimiter:
-    def __init__(self, requests_per_minute=60):
-        self.requests_per_minute = requests_per_minute
-        self.requests = defaultdict(list)
-    
+    """HTTP middleware applying a per-client limit plus optional per-route limits.
+
+    Authenticated requests are counted per user (from the bearer token's
+    ``sub`` claim), anonymous ones per client IP. Route rules are keyed by
+    ``"<METHOD> <path glob>"`` and are checked in addition to the client limit;
+    a request rejected by any rule consumes no quota.
+
+    Behind a reverse proxy, list the proxy addresses or networks in
+    ``trusted_proxies`` so the client IP is taken from ``X-Forwarded-For``.
+    """
+
+    def __init__(
+        self,
+        store,
+        anonymous: str = "60/minute",
+        authenticated: str = "600/minute",
+        routes: Optional[Dict[str, str]] = None,
+        exempt_paths: Tuple[str, ...] = (),
+        trusted_proxies: Tuple[str, ...] = (),
+        enabled: bool = True
+    ):
+        self.store = store
+        self.anonymous = parse_rate(anonymous)
+        self.authenticated = parse_rate(authenticated)
+        self.routes = []
+        for route, rate in (routes or {}).items():
+            method, _, pattern = route.partition(" ")
+            self.routes.append((method.upper(), pattern, parse_rate(rate)))
+        self.exempt_paths = set(exempt_paths)
+        self.trusted_proxies = [ipaddress.ip_network(proxy, strict=False) for proxy in trusted_proxies]
+        self.enabled = enabled
+
+    def _is_trusted_proxy(self, host: str) -> bool:
+        try:
+            address = ipaddress.ip_address(host)
+        except ValueError:
+            return False
+        return any(address in network for network in self.trusted_proxies)
+
+    def client_ip(self, request: Request) -> str:
+        host = request.client.host if request.client else "unknown"
+        if not self._is_trusted_proxy(host):
+            return host
+        # The nearest address not added by one of our proxies is the client
+        forwarded = request.headers.get("x-forwarded-for", "")
+        for hop in reversed([hop.strip() for hop in forwarded.split(",") if hop.strip()]):
+            host = hop
+            if not self._is_trusted_proxy(hop):
+                break
+        return host
+
+    def identify(self, request: Request) -> Tuple[str, bool]:
+        authorization = request.headers.get("authorization", "")
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() == "bearer" and token:
+            payload = decode_token(token)
+            if payload and payload.get("sub") is not None:
+                return f"user:{payload['sub']}", True
+        return f"ip:{self.client_ip(request)}", False
+
+    def check(self, request: Request) -> Decision:
+        identity, authenticated = self.identify(request)
+        rule = self.authenticated if authenticated else self.anonymous
+        hits = [(f"client:{identity}", rule)]
+        method, path = request.method, request.url.path
+        for route_method, pattern, route_rule in self.routes:
+            if route_method in (method, "*") and fnmatch.fnmatchcase(path, pattern):
+                hits.append((f"route:{route_method} {pattern}:{identity}", route_rule))
+
+        decisions = self.store.hit_many(hits)
+        rejected = [decision for decision in decisions if not decision.allowed]
+        if rejected:
+            return rejected[0]
+        return min(decisions, key=lambda decision: decision.remaining)
+
     async def __call__(self, request: Request, call_next):
-        client_ip = request.client.host
-        now = datetime.now()
-        
-        self.requests[client_ip] = [
-            req_time for req_time in self.requests[client_ip]
-            if now - req_time < timedelta(minutes=1)
-        ]
-        
-        if len(self.requests[client_ip]) >= self.requests_per_minute:
-            raise HTTPException(status_code=429, detail="Too many requests")
-        
-        self.requests[client_ip].append(now)
-        return await call_next(request)
-
-rate_limiter = RateLimiter()
+        if not self.enabled or request.url.path in self.exempt_paths:
+            return await call_next(request)
+
+        if getattr(self.store, "blocking", False):
+            decision = await run_in_threadpool(self.check, request)
+        else:
+            decision = self.check(request)
+        headers = {
+            "X-RateLimit-Limit": str(decision.limit),
+            "X-RateLimit-Remaining": str(decision.remaining)
+        }
+        if not decision.allowed:
+            headers["Retry-After"] = str(decision.retry_after)
+            return JSONResponse(status_code=429, content={"detail": "Too many requests"}, headers=headers)
+
+        response = await call_next(request)
+        response.headers.update(headers)
+        return response
+
+    async def evict_forever(self, interval_seconds: float):
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                evicted = self.store.evict_idle()
+                if evicted:
+                    logger.debug("Evicted %s idle rate limit keys", evicted)
+            except Exception:
+                logger.exception("Rate limit eviction failed")
+
+def create_store():
+    if settings.RATE_LIMIT_URL:
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_URL is set but the 'redis' package is not installed")
+        return RedisRateLimitStore(redis.Redis.from_url(settings.RATE_LIMIT_URL))
+    return LocalRateLimitStore()
+
+rate_limiter = RateLimiter(
+    create_store(),
+    anonymous=settings.RATE_LIMIT_ANONYMOUS,
+    authenticated=settings.RATE_LIMIT_AUTHENTICATED,
+    routes=settings.RATE_LIMIT_ROUTES,
+    exempt_paths=tuple(settings.RATE_LIMIT_EXEMPT_PATHS),
+    trusted_proxies=tuple(settings.RATE_LIMIT_TRUSTED_PROXIES),
+    enabled=settings.RATE_LIMIT_ENABLED
+)
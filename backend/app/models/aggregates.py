@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
+from .user import Base
+from ..utils.money import Money
+
+class MonthlySalaryTotal(Base):
+    __tablename__ = "monthly_salary_totals"
+    
+    month_year = Column(String, primary_key=True)
+    total_net_salary = Column(Money, nullable=False, default=0)
+    slip_count = Column(Integer, nullable=False, default=0)
+
+class ExpenseTotal(Base):
+    __tablename__ = "expense_totals"
+    __table_args__ = (
+        Index("ix_expense_totals_status_category", "status", "category"),
+    )
+    
+    employee_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    category = Column(String, primary_key=True)
+    status = Column(String, primary_key=True)
+    total_amount = Column(Money, nullable=False, default=0)
+    expense_count = Column(Integer, nullable=False, default=0)
+
+class ExpenseMonthlyTotal(Base):
+    """Per-employee spend by expense month, for approval rule caps."""
+    __tablename__ = "expense_monthly_totals"
+    
+    employee_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    month_year = Column(String, primary_key=True)
+    category = Column(String, primary_key=True)
+    status = Column(String, primary_key=True)
+    total_amount = Column(Money, nullable=False, default=0)
+    expense_count = Column(Integer, nullable=False, default=0)
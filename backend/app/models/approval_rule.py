@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from datetime import datetime
+from .user import Base
+from ..utils.money import Money
+
+class ApprovalRule(Base):
+    """Auto-approves submitted expenses that fit its limits.
+
+    ``category`` and ``employee_id`` narrow the rule when set.
+    ``max_amount`` bounds a single expense and ``monthly_cap`` the
+    employee's approved spend for the expense month (in ``category`` when
+    set, otherwise overall), including the new expense.
+    """
+    __tablename__ = "approval_rules"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)
+    category = Column(String, nullable=True)
+    employee_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    max_amount = Column(Money, nullable=True)
+    monthly_cap = Column(Money, nullable=True)
+    is_active = Column(Boolean, nullable=False, default=True)
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,13 +1,21 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Date
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Date, Index
 from datetime import datetime
 from .user import Base
+from ..utils.money import Money
 
 class Expense(Base):
     __tablename__ = "expenses"
+    __table_args__ = (
+        Index("ix_expenses_employee_id_status", "employee_id", "status"),
+        Index("ix_expenses_employee_id_created_at", "employee_id", "created_at", "id"),
+        Index("ix_expenses_status_created_at", "status", "created_at", "id"),
+        Index("ix_expenses_created_at", "created_at", "id"),
+        Index("ix_expenses_updated_at", "updated_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     employee_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    amount = Column(Float, nullable=False)
+    amount = Column(Money, nullable=False)
     category = Column(String, nullable=False)
     description = Column(String, nullable=False)
     expense_date = Column(Date, nullable=False)
@@ -16,3 +24,4 @@ class Expense(Base):
     reviewed_by = Column(Integer, ForeignKey("users.id"), nullable=True)
     reviewed_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
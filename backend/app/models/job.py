@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, Text, Float, Boolean, DateTime, ForeignKey, Index
+from datetime import datetime
+from .user import Base
+
+class Job(Base):
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_status_created_at", "status", "created_at"),
+        Index("ix_jobs_created_by_created_at", "created_by", "created_at"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="queued")  # queued, running, succeeded, failed, cancelled
+    params = Column(Text, nullable=True)
+    result = Column(Text, nullable=True)
+    error = Column(String, nullable=True)
+    progress = Column(Float, nullable=False, default=0)
+    progress_message = Column(String, nullable=True)
+    cancel_requested = Column(Boolean, nullable=False, default=False)
+    # Input held only in the submitting process's memory, never in this table
+    inline_input = Column(Boolean, nullable=False, default=False)
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
@@ -1,19 +1,27 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Index
 from datetime import datetime
 from .user import Base
+from ..utils.money import Money
 
 class SalarySlip(Base):
     __tablename__ = "salary_slips"
+    __table_args__ = (
+        Index("uq_salary_slips_employee_id_month_year", "employee_id", "month_year", unique=True),
+        Index("ix_salary_slips_month_year", "month_year"),
+        Index("ix_salary_slips_employee_id_created_at", "employee_id", "created_at", "id"),
+        Index("ix_salary_slips_created_at", "created_at", "id"),
+        Index("ix_salary_slips_updated_at", "updated_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     employee_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     month_year = Column(String, nullable=False)
-    basic_salary = Column(Float, nullable=False)
-    allowances = Column(Float, default=0)
-    deductions = Column(Float, default=0)
-    bonuses = Column(Float, default=0)
-    tax = Column(Float, default=0)
-    net_salary = Column(Float, nullable=False)
+    basic_salary = Column(Money, nullable=False)
+    allowances = Column(Money, default=0)
+    deductions = Column(Money, default=0)
+    bonuses = Column(Money, default=0)
+    tax = Column(Money, default=0)
+    net_salary = Column(Money, nullable=False)
     notes = Column(Text, nullable=True)
     created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
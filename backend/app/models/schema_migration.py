@@ -0,0 +1,10 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+from .user import Base
+
+class SchemaMigration(Base):
+    __tablename__ = "schema_migrations"
+    
+    version = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)
+    applied_at = Column(DateTime, default=datetime.utcnow)
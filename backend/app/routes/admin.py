@@ -1,28 +1,65 @@
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List
-from datetime import datetime
-from io import StringIO
-from ..schemas.salary_slip import SalarySlipCreate, SalarySlipResponse, SalarySlipUpdate
-from ..schemas.expense import ExpenseResponse, ExpenseUpdate
-from ..schemas.user import UserResponse
+from typing import List, Optional
+from datetime import date, datetime
+from ..schemas.salary_slip import (
+    SalarySlipCreate, SalarySlipResponse, SalarySlipUpdate, PayrollRunCreate, PayrollRunResponse
+)
+from ..schemas.expense import ExpenseBatchReview, ExpenseBatchReviewResponse, ExpenseResponse, ExpenseUpdate
+from ..schemas.user import UserResponse, EmployeeImportRequest, EmployeeImportResponse
+from ..schemas.job import JobAccepted
+from ..schemas.change_feed import ChangeFeedResponse
+from ..schemas.approval_rule import ApprovalRuleCreate, ApprovalRuleResponse, ApprovalRuleUpdate
 from ..models.salary_slip import SalarySlip
 from ..models.expense import Expense
+from ..models.approval_rule import ApprovalRule
 from ..models.user import User
 from ..utils.auth import require_admin
+from ..utils import database
 from ..utils.database import get_db
+from ..utils.replicas import get_read_db, read_session_factory, replicas
+from ..utils.pagination import PageParams, paginate
+from ..utils.metrics import metrics
+from ..config import settings
 from ..services.export import export_service
+from ..services.payroll import payroll_service
+from ..services.user_import import user_import_service
+from ..services.aggregates import aggregate_service
+from ..services.change_feed import change_feed_service
+from ..services.dashboard import dashboard_service
+from ..services.slip_documents import slip_documents
+from ..services.email import email_service
+from ..services.expense_review import expense_review_service
+from ..services.approval_rules import approval_rule_service
+from ..services.jobs import job_service
+from ..services import job_handlers  # noqa: F401 - registers the job kinds
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
+ACCEPTED = {202: {"model": JobAccepted, "description": "Queued as a background job"}}
+
+def _submit_job(db: Session, kind: str, current_user: User, params=None, payload=None) -> JSONResponse:
+    """Queue ``kind`` and answer 202 with where to poll for the outcome."""
+    job = job_service.submit(db, kind, params, created_by=current_user.id, payload=payload)
+    status_url = f"/jobs/{job.id}"
+    return JSONResponse(
+        status_code=202,
+        content={"job_id": job.id, "status": job.status, "status_url": status_url},
+        headers={"Location": status_url}
+    )
+
 @router.post("/salary-slips", response_model=SalarySlipResponse)
 def create_salary_slip(
     slip: SalarySlipCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
-    net_salary = slip.basic_salary + slip.allowances + slip.bonuses - slip.deductions - slip.tax
+    net_salary = payroll_service.compute_net_salary(
+        slip.basic_salary, slip.allowances, slip.bonuses, slip.deductions, slip.tax
+    )
     new_slip = SalarySlip(
         employee_id=slip.employee_id,
         month_year=slip.month_year,
@@ -36,10 +73,61 @@ def create_salary_slip(
         created_by=current_user.id
     )
     db.add(new_slip)
-    db.commit()
+    employee_email = db.query(User.email).filter(User.id == slip.employee_id).scalar()
+    if employee_email:
+        email_service.send_salary_slip_notification(db, employee_email, slip.month_year)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=f"Salary slip for {slip.month_year} already exists")
     db.refresh(new_slip)
     return new_slip
 
+@router.post("/payroll-runs", response_model=PayrollRunResponse, responses=ACCEPTED)
+def create_payroll_run(
+    run: PayrollRunCreate,
+    background: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    if (run.items is None) == (run.template is None):
+        raise HTTPException(status_code=400, detail="Provide either items or template")
+
+    if background:
+        return _submit_job(db, "payroll_run", current_user, params={
+            "month_year": run.month_year,
+            "created_by": current_user.id,
+            "chunk_size": run.chunk_size,
+            "items": [item.dict() for item in run.items] if run.items is not None else None,
+            "template": run.template.dict() if run.template is not None else None
+        })
+
+    if run.items is not None:
+        items = [item.dict() for item in run.items]
+    else:
+        items = payroll_service.build_template_items(db, run.template)
+
+    return payroll_service.run_payroll(
+        db, run.month_year, items, created_by=current_user.id, chunk_size=run.chunk_size
+    )
+
+@router.post("/payroll-runs/{month_year}/recompute", responses=ACCEPTED)
+def recompute_payroll_month(
+    month_year: str,
+    apply: bool = False,
+    background: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    if background:
+        return _submit_job(
+            db, "ledger_recompute", current_user, params={"month_year": month_year, "apply": apply}
+        )
+    # Imported on use: NumPy adds ~130ms to every cold start otherwise
+    from ..services.ledger import ledger_service
+    return ledger_service.recompute_month(db, month_year, apply=apply)
+
 @router.put("/salary-slips/{slip_id}", response_model=SalarySlipResponse)
 def update_salary_slip(
     slip_id: int,
@@ -55,25 +143,59 @@ def update_salary_slip(
     for key, value in update_data.items():
         setattr(slip, key, value)
     
-    slip.net_salary = slip.basic_salary + slip.allowances + slip.bonuses - slip.deductions - slip.tax
+    slip.net_salary = payroll_service.compute_net_salary(
+        slip.basic_salary, slip.allowances, slip.bonuses, slip.deductions, slip.tax
+    )
     slip.updated_at = datetime.utcnow()
-    db.commit()
+    month_year = slip.month_year
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=f"Salary slip for {month_year} already exists")
     db.refresh(slip)
     return slip
 
 @router.get("/salary-slips", response_model=List[SalarySlipResponse])
 def get_all_salary_slips(
-    db: Session = Depends(get_db),
+    response: Response,
+    employee_id: Optional[int] = None,
+    month_year: Optional[str] = None,
+    page: PageParams = Depends(),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_admin)
 ):
-    return db.query(SalarySlip).order_by(SalarySlip.created_at.desc()).all()
+    query = db.query(SalarySlip)
+    if employee_id is not None:
+        query = query.filter(SalarySlip.employee_id == employee_id)
+    if month_year:
+        query = query.filter(SalarySlip.month_year == month_year)
+    return paginate(query, SalarySlip, page, response)
 
 @router.get("/expenses", response_model=List[ExpenseResponse])
 def get_all_expenses(
-    db: Session = Depends(get_db),
+    response: Response,
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    employee_id: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    page: PageParams = Depends(),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_admin)
 ):
-    return db.query(Expense).order_by(Expense.created_at.desc()).all()
+    query = db.query(Expense)
+    if status:
+        query = query.filter(Expense.status == status)
+    if category:
+        query = query.filter(Expense.category == category)
+    if employee_id is not None:
+        query = query.filter(Expense.employee_id == employee_id)
+    if date_from:
+        query = query.filter(Expense.expense_date >= date_from)
+    if date_to:
+        query = query.filter(Expense.expense_date <= date_to)
+    return paginate(query, Expense, page, response)
 
 @router.patch("/expenses/{expense_id}", response_model=ExpenseResponse)
 def update_expense_status(
@@ -86,6 +208,10 @@ def update_expense_status(
     if not expense:
         raise HTTPException(status_code=404, detail="Expense not found")
     
+    if expense.status != expense_update.status:
+        employee_email = db.query(User.email).filter(User.id == expense.employee_id).scalar()
+        if employee_email:
+            email_service.send_expense_status_notification(db, employee_email, expense_update.status)
     expense.status = expense_update.status
     expense.reviewed_by = current_user.id
     expense.reviewed_at = datetime.utcnow()
@@ -93,52 +219,220 @@ def update_expense_status(
     db.refresh(expense)
     return expense
 
+@router.post("/expenses/review", response_model=ExpenseBatchReviewResponse, response_model_exclude_none=True)
+def review_expenses(
+    review: ExpenseBatchReview,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    if (review.ids is None) == (review.filter is None):
+        raise HTTPException(status_code=400, detail="Provide either ids or filter")
+    criteria = review.filter.dict() if review.filter is not None else {}
+    if criteria.get("current_status", "pending") == review.status:
+        raise HTTPException(status_code=400, detail="Expenses are already in that status")
+
+    return expense_review_service.review(
+        db, review.status, current_user.id, ids=review.ids, **criteria
+    )
+
+@router.get("/approval-rules", response_model=List[ApprovalRuleResponse])
+def get_approval_rules(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    return db.query(ApprovalRule).order_by(ApprovalRule.id).all()
+
+@router.post("/approval-rules", response_model=ApprovalRuleResponse)
+def create_approval_rule(
+    rule: ApprovalRuleCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    if rule.max_amount is None and rule.monthly_cap is None:
+        raise HTTPException(status_code=400, detail="Set max_amount, monthly_cap or both")
+    new_rule = ApprovalRule(**rule.dict(), created_by=current_user.id)
+    db.add(new_rule)
+    db.commit()
+    db.refresh(new_rule)
+    approval_rule_service.invalidate()
+    return new_rule
+
+@router.put("/approval-rules/{rule_id}", response_model=ApprovalRuleResponse)
+def update_approval_rule(
+    rule_id: int,
+    rule_update: ApprovalRuleUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    rule = db.query(ApprovalRule).filter(ApprovalRule.id == rule_id).first()
+    if not rule:
+        raise HTTPException(status_code=404, detail="Approval rule not found")
+
+    for key, value in rule_update.dict(exclude_unset=True).items():
+        setattr(rule, key, value)
+    if rule.max_amount is None and rule.monthly_cap is None:
+        raise HTTPException(status_code=400, detail="Set max_amount, monthly_cap or both")
+    db.commit()
+    db.refresh(rule)
+    approval_rule_service.invalidate()
+    return rule
+
+@router.delete("/approval-rules/{rule_id}", status_code=204)
+def delete_approval_rule(
+    rule_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    rule = db.query(ApprovalRule).filter(ApprovalRule.id == rule_id).first()
+    if not rule:
+        raise HTTPException(status_code=404, detail="Approval rule not found")
+    db.delete(rule)
+    db.commit()
+    approval_rule_service.invalidate()
+    return Response(status_code=204)
+
+@router.get("/changes", response_model=ChangeFeedResponse)
+def get_changes(
+    cursor: Optional[str] = None,
+    since: Optional[datetime] = None,
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    # Read from the primary: a lagging replica could surface rows behind the cursor
+    return change_feed_service.changes(db, cursor=cursor, since=since, limit=limit)
+
 @router.get("/employees", response_model=List[UserResponse])
 def get_all_employees(
+    response: Response,
+    page: PageParams = Depends(),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_admin)
+):
+    return paginate(db.query(User).filter(User.role == "employee"), User, page, response)
+
+@router.post("/employees/import", response_model=EmployeeImportResponse, responses=ACCEPTED)
+def import_employees(
+    request: EmployeeImportRequest,
+    background: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    rows = [user.dict() for user in request.users]
+    if background:
+        return _submit_job(
+            db, "employee_import", current_user, params={"chunk_size": request.chunk_size}, payload=rows
+        )
+    return user_import_service.import_users(db, rows, chunk_size=request.chunk_size)
+
+@router.post("/employees/import/csv", response_model=EmployeeImportResponse, responses=ACCEPTED)
+async def import_employees_csv(
+    file: UploadFile = File(...),
+    chunk_size: int = Query(1000, ge=1, le=10000),
+    background: bool = False,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
-    return db.query(User).filter(User.role == "employee").all()
+    try:
+        rows = user_import_service.parse_csv(await file.read())
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid CSV: {exc}")
+    if background:
+        return await run_in_threadpool(
+            _submit_job, db, "employee_import", current_user, {"chunk_size": chunk_size}, rows
+        )
+    return await run_in_threadpool(user_import_service.import_users, db, rows, chunk_size)
 
 @router.get("/dashboard-stats")
 def get_dashboard_stats(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
-    total_employees = db.query(User).filter(User.role == "employee").count()
-    pending_expenses = db.query(Expense).filter(Expense.status == "pending").count()
-    total_salary_slips = db.query(SalarySlip).count()
-    
-    return {
-        "total_employees": total_employees,
-        "pending_expenses": pending_expenses,
-        "total_salary_slips": total_salary_slips
-    }
+    return dashboard_service.admin_stats(db)
 
-@router.get("/salary-slips/export")
+@router.post("/analytics/rebuild", responses=ACCEPTED)
+def rebuild_analytics_aggregates(
+    background: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    if background:
+        return _submit_job(db, "analytics_rebuild", current_user)
+    aggregate_service.rebuild(db.connection())
+    db.commit()
+    return {"status": "rebuilt"}
+
+@router.get("/db-pool")
+def get_db_pool_status(current_user: User = Depends(require_admin)):
+    status = {"primary": database.pool_status(database.engine)}
+    if database._async_engine is not None:
+        status["primary_async"] = database.pool_status(database._async_engine)
+    if replicas.urls:
+        status["replicas"] = replicas.status()
+    return status
+
+@router.get("/metrics")
+def get_route_metrics(current_user: User = Depends(require_admin)):
+    return metrics.summary()
+
+@router.get("/salary-slips/export", responses=ACCEPTED)
 def export_salary_slips(
+    request: Request,
+    background: bool = False,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
-    slips = db.query(SalarySlip).all()
-    csv_data = export_service.export_salary_slips_to_csv(slips)
-    
+    if background:
+        return _submit_job(db, "salary_slips_export", current_user)
     return StreamingResponse(
-        iter([csv_data]),
+        export_service.stream_salary_slips_csv(read_session_factory(request), settings.EXPORT_CHUNK_SIZE),
         media_type="text/csv",
         headers={"Content-Disposition": "attachment; filename=salary_slips.csv"}
     )
 
-@router.get("/expenses/export")
+@router.get("/salary-slips/archive", responses=ACCEPTED)
+def download_salary_slip_archive(
+    month_year: str,
+    background: bool = False,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_admin)
+):
+    if background:
+        return _submit_job(db, "salary_slip_archive", current_user, params={"month_year": month_year})
+    archive_path = slip_documents.build_month_archive(db, month_year)
+    if archive_path is None:
+        raise HTTPException(status_code=404, detail=f"No salary slips for {month_year}")
+    return FileResponse(
+        archive_path, media_type="application/zip", filename=f"salary-slips-{month_year}.zip"
+    )
+
+@router.get("/salary-slips/{slip_id}/pdf")
+async def download_salary_slip(
+    slip_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    found = await run_in_threadpool(slip_documents.load_slip, db, slip_id)
+    if not found:
+        raise HTTPException(status_code=404, detail="Salary slip not found")
+    slip, employee = found
+    return Response(
+        content=await slip_documents.pdf_for(slip, employee),
+        media_type="application/pdf",
+        headers={"Content-Disposition": f"attachment; filename={slip_documents.filename(slip)}"}
+    )
+
+@router.get("/expenses/export", responses=ACCEPTED)
 def export_expenses(
+    request: Request,
+    background: bool = False,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
-    expenses = db.query(Expense).all()
-    csv_data = export_service.export_expenses_to_csv(expenses)
-    
+    if background:
+        return _submit_job(db, "expenses_export", current_user)
     return StreamingResponse(
-        iter([csv_data]),
+        export_service.stream_expenses_csv(read_session_factory(request), settings.EXPORT_CHUNK_SIZE),
         media_type="text/csv",
         headers={"Content-Disposition": "attachment; filename=expenses.csv"}
     )
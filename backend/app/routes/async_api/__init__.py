@@ -0,0 +1 @@
+# Async route variants, served ahead of the sync routes when ASYNC_ROUTES is enabled
@@ -0,0 +1,165 @@
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import date, datetime
+from ...schemas.salary_slip import SalarySlipCreate, SalarySlipResponse, SalarySlipUpdate
+from ...schemas.expense import ExpenseResponse, ExpenseUpdate
+from ...schemas.user import UserResponse
+from ...models.salary_slip import SalarySlip
+from ...models.expense import Expense
+from ...models.user import User
+from ...utils.auth import require_admin_async
+from ...utils.database import get_async_db
+from ...utils.replicas import get_async_read_db
+from ...utils.pagination import PageParams, keyset_statement, page_rows
+from ...services.payroll import payroll_service
+from ...services.dashboard import dashboard_service
+from ...services.email import email_service
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+@router.post("/salary-slips", response_model=SalarySlipResponse)
+async def create_salary_slip(
+    slip: SalarySlipCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_admin_async)
+):
+    net_salary = payroll_service.compute_net_salary(
+        slip.basic_salary, slip.allowances, slip.bonuses, slip.deductions, slip.tax
+    )
+    new_slip = SalarySlip(
+        employee_id=slip.employee_id,
+        month_year=slip.month_year,
+        basic_salary=slip.basic_salary,
+        allowances=slip.allowances,
+        deductions=slip.deductions,
+        bonuses=slip.bonuses,
+        tax=slip.tax,
+        net_salary=net_salary,
+        notes=slip.notes,
+        created_by=current_user.id
+    )
+    db.add(new_slip)
+    employee_email = await db.scalar(select(User.email).where(User.id == slip.employee_id))
+    if employee_email:
+        email_service.send_salary_slip_notification(db, employee_email, slip.month_year)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=f"Salary slip for {slip.month_year} already exists")
+    await db.refresh(new_slip)
+    return new_slip
+
+@router.put("/salary-slips/{slip_id}", response_model=SalarySlipResponse)
+async def update_salary_slip(
+    slip_id: int,
+    slip_update: SalarySlipUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_admin_async)
+):
+    slip = await db.get(SalarySlip, slip_id)
+    if not slip:
+        raise HTTPException(status_code=404, detail="Salary slip not found")
+    
+    update_data = slip_update.dict(exclude_unset=True)
+    for key, value in update_data.items():
+        setattr(slip, key, value)
+    
+    slip.net_salary = payroll_service.compute_net_salary(
+        slip.basic_salary, slip.allowances, slip.bonuses, slip.deductions, slip.tax
+    )
+    slip.updated_at = datetime.utcnow()
+    month_year = slip.month_year
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=f"Salary slip for {month_year} already exists")
+    await db.refresh(slip)
+    return slip
+
+@router.get("/salary-slips", response_model=List[SalarySlipResponse])
+async def get_all_salary_slips(
+    response: Response,
+    employee_id: Optional[int] = None,
+    month_year: Optional[str] = None,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(require_admin_async)
+):
+    statement = select(SalarySlip)
+    if employee_id is not None:
+        statement = statement.where(SalarySlip.employee_id == employee_id)
+    if month_year:
+        statement = statement.where(SalarySlip.month_year == month_year)
+    result = await db.execute(keyset_statement(statement, SalarySlip, page))
+    return page_rows(result.scalars(), page, response)
+
+@router.get("/expenses", response_model=List[ExpenseResponse])
+async def get_all_expenses(
+    response: Response,
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    employee_id: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(require_admin_async)
+):
+    statement = select(Expense)
+    if status:
+        statement = statement.where(Expense.status == status)
+    if category:
+        statement = statement.where(Expense.category == category)
+    if employee_id is not None:
+        statement = statement.where(Expense.employee_id == employee_id)
+    if date_from:
+        statement = statement.where(Expense.expense_date >= date_from)
+    if date_to:
+        statement = statement.where(Expense.expense_date <= date_to)
+    result = await db.execute(keyset_statement(statement, Expense, page))
+    return page_rows(result.scalars(), page, response)
+
+@router.patch("/expenses/{expense_id}", response_model=ExpenseResponse)
+async def update_expense_status(
+    expense_id: int,
+    expense_update: ExpenseUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_admin_async)
+):
+    expense = await db.get(Expense, expense_id)
+    if not expense:
+        raise HTTPException(status_code=404, detail="Expense not found")
+    
+    if expense.status != expense_update.status:
+        employee_email = await db.scalar(select(User.email).where(User.id == expense.employee_id))
+        if employee_email:
+            email_service.send_expense_status_notification(db, employee_email, expense_update.status)
+    expense.status = expense_update.status
+    expense.reviewed_by = current_user.id
+    expense.reviewed_at = datetime.utcnow()
+    await db.commit()
+    await db.refresh(expense)
+    return expense
+
+@router.get("/employees", response_model=List[UserResponse])
+async def get_all_employees(
+    response: Response,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(require_admin_async)
+):
+    statement = select(User).where(User.role == "employee")
+    result = await db.execute(keyset_statement(statement, User, page))
+    return page_rows(result.scalars(), page, response)
+
+@router.get("/dashboard-stats")
+async def get_dashboard_stats(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_admin_async)
+):
+    return await dashboard_service.admin_stats_async(db)
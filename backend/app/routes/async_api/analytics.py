@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from ...utils.auth import get_current_user_async, require_admin_async
+from ...utils.replicas import get_async_read_db
+from ...models.user import User
+from ...services.analytics import analytics_service
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+# The analytics service is written against a sync Session; run_sync drives it
+# on the async connection, so the queries are still awaited on the event loop
+
+@router.get("/salary-trends")
+async def get_salary_trends(
+    months: int = 6,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(require_admin_async)
+):
+    return await db.run_sync(analytics_service.get_monthly_salary_trends, months)
+
+@router.get("/expense-breakdown")
+async def get_expense_breakdown(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(require_admin_async)
+):
+    return await db.run_sync(analytics_service.get_expense_category_breakdown)
+
+@router.get("/employee-expenses")
+async def get_employee_expenses(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(require_admin_async)
+):
+    return await db.run_sync(analytics_service.get_employee_expense_summary)
+
+@router.get("/my-expense-breakdown")
+async def get_my_expense_breakdown(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await db.run_sync(analytics_service.get_expense_category_breakdown, current_user.id)
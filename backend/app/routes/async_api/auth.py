@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+from ...schemas.user import UserCreate, UserLogin, UserResponse, Token
+from ...models.user import User
+from ...utils.auth import create_access_token, get_current_user_async, get_current_user_record_async
+from ...utils.password_hasher import password_hasher
+from ...utils.database import get_async_db
+
+router = APIRouter(prefix="/auth", tags=["auth"])
+
+@router.post("/signup", response_model=UserResponse)
+async def signup(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    existing_user = (await db.execute(select(User.id).where(User.email == user.email))).first()
+    if existing_user:
+        raise HTTPException(status_code=400, detail="Email already registered")
+    
+    new_user = User(
+        email=user.email,
+        password_hash=await password_hasher.hash(user.password),
+        full_name=user.full_name,
+        role=user.role
+    )
+    db.add(new_user)
+    await db.commit()
+    await db.refresh(new_user)
+    return new_user
+
+@router.post("/login", response_model=Token)
+async def login(user: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    db_user = (await db.execute(select(User).where(User.email == user.email))).scalar_one_or_none()
+    if not db_user or not await password_hasher.verify(user.password, db_user.password_hash):
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    
+    access_token = create_access_token(data={"sub": db_user.id, "role": db_user.role})
+    return {"access_token": access_token, "token_type": "bearer"}
+
+@router.get("/me", response_model=UserResponse)
+async def get_me(current_user: User = Depends(get_current_user_record_async)):
+    return current_user
+
+@router.get("/employees", response_model=List[UserResponse])
+async def get_employees(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return (await db.execute(select(User).where(User.role == "employee"))).scalars().all()
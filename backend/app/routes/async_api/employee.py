@@ -0,0 +1,82 @@
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import date
+from ...schemas.expense import ExpenseCreate, ExpenseResponse
+from ...schemas.salary_slip import SalarySlipResponse
+from ...models.expense import Expense
+from ...models.salary_slip import SalarySlip
+from ...models.user import User
+from ...utils.auth import get_current_user_async
+from ...utils.database import get_async_db
+from ...utils.replicas import get_async_read_db
+from ...utils.pagination import PageParams, keyset_statement, page_rows
+from ...services.approval_rules import approval_rule_service
+from ...services.dashboard import dashboard_service
+
+router = APIRouter(prefix="/employee", tags=["employee"])
+
+@router.post("/expenses", response_model=ExpenseResponse)
+async def create_expense(
+    expense: ExpenseCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    new_expense = Expense(
+        employee_id=current_user.id,
+        amount=expense.amount,
+        category=expense.category,
+        description=expense.description,
+        expense_date=expense.expense_date,
+        receipt_url=expense.receipt_url
+    )
+    await db.run_sync(approval_rule_service.apply, new_expense)
+    db.add(new_expense)
+    await db.commit()
+    await db.refresh(new_expense)
+    return new_expense
+
+@router.get("/expenses", response_model=List[ExpenseResponse])
+async def get_my_expenses(
+    response: Response,
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    statement = select(Expense).where(Expense.employee_id == current_user.id)
+    if status:
+        statement = statement.where(Expense.status == status)
+    if category:
+        statement = statement.where(Expense.category == category)
+    if date_from:
+        statement = statement.where(Expense.expense_date >= date_from)
+    if date_to:
+        statement = statement.where(Expense.expense_date <= date_to)
+    result = await db.execute(keyset_statement(statement, Expense, page))
+    return page_rows(result.scalars(), page, response)
+
+@router.get("/salary-slips", response_model=List[SalarySlipResponse])
+async def get_my_salary_slips(
+    response: Response,
+    month_year: Optional[str] = None,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    statement = select(SalarySlip).where(SalarySlip.employee_id == current_user.id)
+    if month_year:
+        statement = statement.where(SalarySlip.month_year == month_year)
+    result = await db.execute(keyset_statement(statement, SalarySlip, page))
+    return page_rows(result.scalars(), page, response)
+
+@router.get("/dashboard-stats")
+async def get_employee_dashboard_stats(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await dashboard_service.employee_stats_async(db, current_user.id)
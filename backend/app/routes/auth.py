@@ -1,41 +1,52 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import List
 from ..schemas.user import UserCreate, UserLogin, UserResponse, Token
 from ..models.user import User
-from ..utils.auth import hash_password, verify_password, create_access_token, get_current_user
+from ..utils.auth import create_access_token, get_current_user, get_current_user_record
+from ..utils.password_hasher import password_hasher
 from ..utils.database import get_db
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+def _find_user_by_email(db: Session, email: str):
+    return db.query(User).filter(User.email == email).first()
+
+def _save_user(db: Session, user: User):
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+# signup and login are async so bcrypt runs on the password hasher's own
+# pool; their short DB calls are handed to the threadpool explicitly
+
 @router.post("/signup", response_model=UserResponse)
-def signup(user: UserCreate, db: Session = Depends(get_db)):
-    existing_user = db.query(User).filter(User.email == user.email).first()
+async def signup(user: UserCreate, db: Session = Depends(get_db)):
+    existing_user = await run_in_threadpool(_find_user_by_email, db, user.email)
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
     
     new_user = User(
         email=user.email,
-        password_hash=hash_password(user.password),
+        password_hash=await password_hasher.hash(user.password),
         full_name=user.full_name,
         role=user.role
     )
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-    return new_user
+    return await run_in_threadpool(_save_user, db, new_user)
 
 @router.post("/login", response_model=Token)
-def login(user: UserLogin, db: Session = Depends(get_db)):
-    db_user = db.query(User).filter(User.email == user.email).first()
-    if not db_user or not verify_password(user.password, db_user.password_hash):
+async def login(user: UserLogin, db: Session = Depends(get_db)):
+    db_user = await run_in_threadpool(_find_user_by_email, db, user.email)
+    if not db_user or not await password_hasher.verify(user.password, db_user.password_hash):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     access_token = create_access_token(data={"sub": db_user.id, "role": db_user.role})
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/me", response_model=UserResponse)
-def get_me(current_user: User = Depends(get_current_user)):
+def get_me(current_user: User = Depends(get_current_user_record)):
     return current_user
 
 @router.get("/employees", response_model=List[UserResponse])
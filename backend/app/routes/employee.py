@@ -1,8 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract
-from typing import List
-from datetime import datetime
+from typing import List, Optional
+from datetime import date
 from ..schemas.expense import ExpenseCreate, ExpenseResponse
 from ..schemas.salary_slip import SalarySlipResponse
 from ..models.expense import Expense
@@ -10,6 +10,11 @@ from ..models.salary_slip import SalarySlip
 from ..models.user import User
 from ..utils.auth import get_current_user
 from ..utils.database import get_db
+from ..utils.replicas import get_read_db
+from ..utils.pagination import PageParams, paginate
+from ..services.approval_rules import approval_rule_service
+from ..services.dashboard import dashboard_service
+from ..services.slip_documents import slip_documents
 
 router = APIRouter(prefix="/employee", tags=["employee"])
 
@@ -27,6 +32,7 @@ def create_expense(
         expense_date=expense.expense_date,
         receipt_url=expense.receipt_url
     )
+    approval_rule_service.apply(db, new_expense)
     db.add(new_expense)
     db.commit()
     db.refresh(new_expense)
@@ -34,38 +40,58 @@ def create_expense(
 
 @router.get("/expenses", response_model=List[ExpenseResponse])
 def get_my_expenses(
-    db: Session = Depends(get_db),
+    response: Response,
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    page: PageParams = Depends(),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    return db.query(Expense).filter(Expense.employee_id == current_user.id).order_by(Expense.created_at.desc()).all()
+    query = db.query(Expense).filter(Expense.employee_id == current_user.id)
+    if status:
+        query = query.filter(Expense.status == status)
+    if category:
+        query = query.filter(Expense.category == category)
+    if date_from:
+        query = query.filter(Expense.expense_date >= date_from)
+    if date_to:
+        query = query.filter(Expense.expense_date <= date_to)
+    return paginate(query, Expense, page, response)
 
 @router.get("/salary-slips", response_model=List[SalarySlipResponse])
 def get_my_salary_slips(
-    db: Session = Depends(get_db),
+    response: Response,
+    month_year: Optional[str] = None,
+    page: PageParams = Depends(),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    query = db.query(SalarySlip).filter(SalarySlip.employee_id == current_user.id)
+    if month_year:
+        query = query.filter(SalarySlip.month_year == month_year)
+    return paginate(query, SalarySlip, page, response)
+
+@router.get("/salary-slips/{slip_id}/pdf")
+async def download_my_salary_slip(
+    slip_id: int,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    return db.query(SalarySlip).filter(SalarySlip.employee_id == current_user.id).order_by(SalarySlip.created_at.desc()).all()
+    found = await run_in_threadpool(slip_documents.load_slip, db, slip_id)
+    if not found or found[0].employee_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Salary slip not found")
+    slip, employee = found
+    return Response(
+        content=await slip_documents.pdf_for(slip, employee),
+        media_type="application/pdf",
+        headers={"Content-Disposition": f"attachment; filename={slip_documents.filename(slip)}"}
+    )
 
 @router.get("/dashboard-stats")
 def get_employee_dashboard_stats(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    current_month = datetime.now().strftime("%Y-%m")
-    
-    current_month_slip = db.query(SalarySlip).filter(
-        SalarySlip.employee_id == current_user.id,
-        SalarySlip.month_year == current_month
-    ).first()
-    
-    total_expenses = db.query(Expense).filter(Expense.employee_id == current_user.id).count()
-    pending_expenses = db.query(Expense).filter(
-        Expense.employee_id == current_user.id,
-        Expense.status == "pending"
-    ).count()
-    
-    return {
-        "current_month_salary": current_month_slip.net_salary if current_month_slip else 0,
-        "total_expenses": total_expenses,
-        "pending_expenses": pending_expenses
-    }
+    return dashboard_service.employee_stats(db, current_user.id)
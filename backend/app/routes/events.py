@@ -0,0 +1,83 @@
+import asyncio
+import json
+import time
+from functools import partial
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from typing import Callable, Optional
+from ..models.user import User
+from ..utils.auth import decode_token, get_current_user, get_current_user_record
+from ..config import settings
+from ..services.events import event_hub
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+def get_stream_token(request: Request, access_token: Optional[str] = None) -> str:
+    # EventSource cannot set headers, so browsers pass the token as ?access_token=
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        token = access_token
+    if not token:
+        raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+    return token
+
+def get_stream_user(token: str = Depends(get_stream_token)) -> User:
+    return get_current_user(token)
+
+def still_authorized(token: str, role: str) -> bool:
+    """Whether the token is still valid and its user still exists with ``role``."""
+    try:
+        return get_current_user_record(token).role == role
+    except HTTPException:
+        return False
+
+async def event_stream(
+    user_id: int,
+    is_admin: bool,
+    heartbeat_seconds: float,
+    expires_at: Optional[float] = None,
+    authorize: Optional[Callable[[], bool]] = None
+):
+    """Yield SSE frames until the client leaves, ``expires_at`` (epoch seconds)
+    passes, or ``authorize`` fails at a heartbeat."""
+    subscription = event_hub.subscribe(user_id, is_admin)
+    try:
+        yield "retry: 5000\n\n"
+        next_heartbeat = time.monotonic() + heartbeat_seconds
+        while True:
+            timeout = next_heartbeat - time.monotonic()
+            if expires_at is not None:
+                if time.time() >= expires_at:
+                    return
+                timeout = min(timeout, expires_at - time.time())
+            changes = await subscription.next(max(timeout, 0))
+            if changes is not None:
+                yield f"event: changes\ndata: {json.dumps(changes)}\n\n"
+            # Re-check on schedule even when changes keep the stream busy
+            if time.monotonic() < next_heartbeat:
+                continue
+            next_heartbeat = time.monotonic() + heartbeat_seconds
+            if authorize is not None and not await asyncio.to_thread(authorize):
+                return
+            if changes is None:
+                # Keeps proxies from closing an idle connection
+                yield ": keepalive\n\n"
+    finally:
+        event_hub.unsubscribe(subscription)
+
+@router.get("/stream")
+async def stream_events(token: str = Depends(get_stream_token), current_user: User = Depends(get_stream_user)):
+    """Push ``changes`` events when salary slips or expenses visible to the caller are committed.
+
+    The stream ends when the token expires, or at the next heartbeat after
+    the user is deleted or their role changes.
+    """
+    return StreamingResponse(
+        event_stream(
+            current_user.id, current_user.role == "admin", settings.EVENTS_HEARTBEAT_SECONDS,
+            expires_at=decode_token(token).get("exp"),
+            authorize=partial(still_authorized, token, current_user.role)
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,96 @@
+import json
+import os
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+from typing import List
+from ..schemas.job import JobResponse
+from ..models.job import Job
+from ..models.user import User
+from ..utils.auth import get_current_user
+from ..utils.database import get_db
+from ..services.jobs import FINISHED, job_service
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+def _job_response(job: Job) -> dict:
+    result = json.loads(job.result) if job.result else None
+    result_url = None
+    if isinstance(result, dict) and "file" in result:
+        # Server paths stay private; the file is downloaded through result_url
+        result = {key: value for key, value in result.items() if key != "file"}
+        result_url = f"/jobs/{job.id}/result"
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "progress": job.progress,
+        "progress_message": job.progress_message,
+        "cancel_requested": job.cancel_requested,
+        "result": result,
+        "result_url": result_url,
+        "error": job.error,
+        "created_by": job.created_by,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+def _get_visible_job(db: Session, job_id: int, current_user: User) -> Job:
+    job = db.get(Job, job_id)
+    # Other users' jobs are reported as missing rather than forbidden
+    if job is None or (current_user.role != "admin" and job.created_by != current_user.id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.get("", response_model=List[JobResponse])
+def list_my_jobs(
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    jobs = (
+        db.query(Job)
+        .filter(Job.created_by == current_user.id)
+        .order_by(Job.created_at.desc(), Job.id.desc())
+        .limit(limit)
+        .all()
+    )
+    return [_job_response(job) for job in jobs]
+
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return _job_response(_get_visible_job(db, job_id, current_user))
+
+@router.post("/{job_id}/cancel", response_model=JobResponse)
+def cancel_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    job = _get_visible_job(db, job_id, current_user)
+    if job.status in FINISHED:
+        raise HTTPException(status_code=409, detail=f"Job already {job.status}")
+    return _job_response(job_service.cancel(db, job))
+
+@router.get("/{job_id}/result")
+def download_job_result(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    job = _get_visible_job(db, job_id, current_user)
+    if job.status != "succeeded":
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    result = json.loads(job.result) if job.result else None
+    if not isinstance(result, dict) or "file" not in result:
+        raise HTTPException(status_code=404, detail="Job has no file result")
+    if not os.path.exists(result["file"]):
+        raise HTTPException(status_code=410, detail="Job result file is no longer available")
+    return FileResponse(
+        result["file"], media_type=result.get("media_type"), filename=result.get("filename")
+    )
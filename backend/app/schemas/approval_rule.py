@@ -0,0 +1,31 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import Optional
+
+class ApprovalRuleCreate(BaseModel):
+    name: str
+    category: Optional[str] = None
+    employee_id: Optional[int] = None
+    max_amount: Optional[float] = Field(default=None, ge=0)
+    monthly_cap: Optional[float] = Field(default=None, ge=0)
+    is_active: bool = True
+
+class ApprovalRuleUpdate(BaseModel):
+    name: Optional[str] = None
+    max_amount: Optional[float] = Field(default=None, ge=0)
+    monthly_cap: Optional[float] = Field(default=None, ge=0)
+    is_active: Optional[bool] = None
+
+class ApprovalRuleResponse(BaseModel):
+    id: int
+    name: str
+    category: Optional[str]
+    employee_id: Optional[int]
+    max_amount: Optional[float]
+    monthly_cap: Optional[float]
+    is_active: bool
+    created_by: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from .expense import ExpenseResponse
+from .salary_slip import SalarySlipResponse
+
+class ChangeFeedResponse(BaseModel):
+    salary_slips: List[SalarySlipResponse]
+    expenses: List[ExpenseResponse]
+    next_cursor: Optional[str]
+    has_more: bool
@@ -1,9 +1,11 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime, date
-from typing import Optional
+from typing import List, Literal, Optional
+
+ExpenseStatus = Literal["pending", "approved", "rejected"]
 
 class ExpenseCreate(BaseModel):
-    amount: float
+    amount: float = Field(gt=0)
     category: str
     description: str
     expense_date: date
@@ -24,6 +26,26 @@ class ExpenseResponse(BaseModel):
     reviewed_by: Optional[int]
     reviewed_at: Optional[datetime]
     created_at: datetime
+    updated_at: datetime
 
     class Config:
         from_attributes = True
+
+class ExpenseReviewFilter(BaseModel):
+    current_status: ExpenseStatus = "pending"
+    category: Optional[str] = None
+    employee_id: Optional[int] = None
+    max_amount: Optional[float] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+
+class ExpenseBatchReview(BaseModel):
+    status: ExpenseStatus
+    ids: Optional[List[int]] = Field(default=None, max_length=10000)
+    filter: Optional[ExpenseReviewFilter] = None
+
+class ExpenseBatchReviewResponse(BaseModel):
+    status: str
+    updated: int
+    updated_ids: List[int]
+    skipped_ids: Optional[List[int]] = None
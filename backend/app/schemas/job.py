@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Optional
+
+class JobAccepted(BaseModel):
+    job_id: int
+    status: str
+    status_url: str
+
+class JobResponse(BaseModel):
+    id: int
+    kind: str
+    status: str
+    progress: float
+    progress_message: Optional[str] = None
+    cancel_requested: bool
+    result: Optional[Any] = None
+    result_url: Optional[str] = None
+    error: Optional[str] = None
+    created_by: Optional[int] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -1,6 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 class SalarySlipCreate(BaseModel):
     employee_id: int
@@ -37,3 +37,40 @@ class SalarySlipResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+class PayrollRunItem(BaseModel):
+    employee_id: int
+    basic_salary: float
+    allowances: float = 0
+    deductions: float = 0
+    bonuses: float = 0
+    tax: float = 0
+    notes: Optional[str] = None
+
+class PayrollRunTemplate(BaseModel):
+    basic_salary: float
+    allowances: float = 0
+    deductions: float = 0
+    bonuses: float = 0
+    tax: float = 0
+    notes: Optional[str] = None
+
+class PayrollRunCreate(BaseModel):
+    month_year: str
+    items: Optional[List[PayrollRunItem]] = None
+    template: Optional[PayrollRunTemplate] = None
+    chunk_size: int = Field(default=1000, ge=1, le=10000)
+
+class PayrollRunError(BaseModel):
+    index: int
+    employee_id: Optional[int]
+    error: str
+
+class PayrollRunResponse(BaseModel):
+    month_year: str
+    requested: int
+    created: int
+    failed: int
+    errors: List[PayrollRunError]
+    elapsed_seconds: float
+    slips_per_second: float
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 class UserCreate(BaseModel):
     email: EmailStr
@@ -25,3 +25,28 @@ class UserResponse(BaseModel):
 class Token(BaseModel):
     access_token: str
     token_type: str
+
+class EmployeeImportRow(BaseModel):
+    email: EmailStr
+    password: str = Field(min_length=1)
+    full_name: Optional[str] = None
+    role: str = "employee"
+
+class EmployeeImportRequest(BaseModel):
+    users: List[EmployeeImportRow]
+    chunk_size: int = Field(default=1000, ge=1, le=10000)
+
+class EmployeeImportResult(BaseModel):
+    index: int
+    email: Optional[str]
+    status: str
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+class EmployeeImportResponse(BaseModel):
+    requested: int
+    created: int
+    failed: int
+    results: List[EmployeeImportResult]
+    elapsed_seconds: float
+    users_per_second: float
@@ -0,0 +1,193 @@
+"""Summary tables for analytics, maintained in the same transaction as writes.
+
+``monthly_salary_totals`` holds per-month net totals, ``expense_totals``
+per-(employee, category, status) sums and counts, and
+``expense_monthly_totals`` the same split by expense month. ORM writes are
+folded in by an ``after_flush`` listener; bulk Core statements must call
+``apply_salary_deltas``/``apply_expense_deltas`` themselves.
+
+Backfill or repair with ``python -m app.services.aggregates``.
+"""
+from collections import defaultdict
+from decimal import Decimal
+from typing import Dict, Tuple
+from sqlalchemy import String, cast, delete, event, func, insert, inspect, select, update
+from sqlalchemy.orm import Session
+from ..models.aggregates import MonthlySalaryTotal, ExpenseTotal, ExpenseMonthlyTotal
+from ..models.salary_slip import SalarySlip
+from ..models.expense import Expense
+from ..utils.money import from_cents, to_cents
+
+# model -> (group-by attributes, summed attribute)
+TRACKED = {
+    SalarySlip: (("month_year",), "net_salary"),
+    Expense: (("employee_id", "category", "status", "expense_date"), "amount"),
+}
+
+def expense_month(expense_date) -> str:
+    return expense_date.strftime("%Y-%m") if hasattr(expense_date, "strftime") else str(expense_date)[:7]
+
+class AggregateService:
+    def apply_salary_deltas(self, connection, deltas: Dict[str, Tuple[Decimal, int]]):
+        rows = [
+            {"month_year": month_year, "total_net_salary": amount, "slip_count": count}
+            for month_year, (amount, count) in deltas.items() if amount or count
+        ]
+        self._upsert(
+            connection, MonthlySalaryTotal.__table__, ["month_year"],
+            ["total_net_salary", "slip_count"], rows
+        )
+
+    def apply_expense_deltas(self, connection, deltas: Dict[Tuple[int, str, str, str], Tuple[Decimal, int]]):
+        """Apply ``{(employee_id, category, status, month_year): (amount, count)}`` to both expense summaries."""
+        totals = defaultdict(lambda: [0, 0])
+        monthly = []
+        for (employee_id, category, status, month_year), (amount, count) in deltas.items():
+            if not amount and not count:
+                continue
+            totals[(employee_id, category, status)][0] += amount
+            totals[(employee_id, category, status)][1] += count
+            monthly.append({
+                "employee_id": employee_id, "month_year": month_year, "category": category,
+                "status": status, "total_amount": amount, "expense_count": count
+            })
+        rows = [
+            {"employee_id": employee_id, "category": category, "status": status,
+             "total_amount": amount, "expense_count": count}
+            for (employee_id, category, status), (amount, count) in totals.items() if amount or count
+        ]
+        self._upsert(
+            connection, ExpenseTotal.__table__, ["employee_id", "category", "status"],
+            ["total_amount", "expense_count"], rows
+        )
+        self._upsert(
+            connection, ExpenseMonthlyTotal.__table__, ["employee_id", "month_year", "category", "status"],
+            ["total_amount", "expense_count"], monthly
+        )
+
+    def rebuild(self, connection):
+        """Recompute every summary row from the base tables."""
+        connection.execute(delete(MonthlySalaryTotal))
+        connection.execute(insert(MonthlySalaryTotal).from_select(
+            ["month_year", "total_net_salary", "slip_count"],
+            select(
+                SalarySlip.month_year,
+                func.coalesce(func.sum(SalarySlip.net_salary), 0),
+                func.count(SalarySlip.id)
+            ).group_by(SalarySlip.month_year)
+        ))
+        connection.execute(delete(ExpenseTotal))
+        connection.execute(insert(ExpenseTotal).from_select(
+            ["employee_id", "category", "status", "total_amount", "expense_count"],
+            select(
+                Expense.employee_id,
+                Expense.category,
+                func.coalesce(Expense.status, "pending"),
+                func.coalesce(func.sum(Expense.amount), 0),
+                func.count(Expense.id)
+            ).group_by(Expense.employee_id, Expense.category, func.coalesce(Expense.status, "pending"))
+        ))
+        # Dates are stored and cast as ISO strings, so the month is the first seven characters
+        month_year = func.substr(cast(Expense.expense_date, String), 1, 7)
+        connection.execute(delete(ExpenseMonthlyTotal))
+        connection.execute(insert(ExpenseMonthlyTotal).from_select(
+            ["employee_id", "month_year", "category", "status", "total_amount", "expense_count"],
+            select(
+                Expense.employee_id,
+                month_year,
+                Expense.category,
+                func.coalesce(Expense.status, "pending"),
+                func.coalesce(func.sum(Expense.amount), 0),
+                func.count(Expense.id)
+            ).group_by(Expense.employee_id, month_year, Expense.category, func.coalesce(Expense.status, "pending"))
+        ))
+
+    def _upsert(self, connection, table, key_columns, value_columns, rows):
+        if not rows:
+            return
+        dialect = connection.dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            if dialect == "sqlite":
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            statement = dialect_insert(table)
+            statement = statement.on_conflict_do_update(
+                index_elements=key_columns,
+                set_={name: table.c[name] + statement.excluded[name] for name in value_columns}
+            )
+            connection.execute(statement, rows)
+            return
+
+        # Portable fallback: increment, then insert the keys that did not exist yet
+        for row in rows:
+            result = connection.execute(
+                update(table)
+                .where(*(table.c[name] == row[name] for name in key_columns))
+                .values({name: table.c[name] + row[name] for name in value_columns})
+            )
+            if result.rowcount == 0:
+                connection.execute(insert(table).values(row))
+
+aggregate_service = AggregateService()
+
+def _snapshot(obj, names, previous=False):
+    """Attribute values as of now, or as loaded before this flush."""
+    state = inspect(obj)
+    values = []
+    for name in names:
+        history = state.attrs[name].history
+        source = (history.deleted if previous else history.added) or history.unchanged
+        values.append(source[0] if source else getattr(obj, name))
+    return tuple(values)
+
+def _collect(session: Session):
+    deltas = {model: defaultdict(lambda: [0, 0]) for model in TRACKED}
+
+    def add(obj, previous, sign):
+        keys, amount = TRACKED[type(obj)]
+        *key, value = _snapshot(obj, keys + (amount,), previous)
+        if type(obj) is Expense:
+            key[-1] = expense_month(key[-1])
+        entry = deltas[type(obj)][tuple(key)]
+        # Freshly assigned values may still be floats; loaded ones are Decimals
+        entry[0] += sign * (to_cents(value) or 0)
+        entry[1] += sign
+
+    for obj in session.new:
+        if type(obj) in TRACKED:
+            add(obj, False, 1)
+    for obj in session.dirty:
+        if type(obj) in TRACKED and session.is_modified(obj):
+            add(obj, True, -1)
+            add(obj, False, 1)
+    for obj in session.deleted:
+        if type(obj) in TRACKED:
+            add(obj, True, -1)
+
+    salary = {key[0]: (from_cents(cents), count) for key, (cents, count) in deltas[SalarySlip].items()}
+    expenses = {key: (from_cents(cents), count) for key, (cents, count) in deltas[Expense].items()}
+    return salary, expenses
+
+@event.listens_for(Session, "after_flush")
+def _maintain_aggregates(session, flush_context):
+    salary, expenses = _collect(session)
+    if salary or expenses:
+        connection = session.connection()
+        aggregate_service.apply_salary_deltas(connection, salary)
+        aggregate_service.apply_expense_deltas(connection, expenses)
+
+# Load the previous value when these attributes are assigned, so the flush
+# listener can always subtract the old contribution
+for _attribute in (
+    SalarySlip.month_year, SalarySlip.net_salary,
+    Expense.employee_id, Expense.category, Expense.status, Expense.expense_date, Expense.amount
+):
+    event.listen(_attribute, "set", lambda *args: None, active_history=True)
+
+if __name__ == "__main__":
+    from ..utils.database import engine
+
+    with engine.begin() as conn:
+        aggregate_service.rebuild(conn)
+    print("Analytics aggregates rebuilt")
@@ -1,29 +1,34 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract
-from datetime import datetime, timedelta
-from ..models.salary_slip import SalarySlip
-from ..models.expense import Expense
+from sqlalchemy import func
+from ..models.aggregates import MonthlySalaryTotal, ExpenseTotal
 from ..models.user import User
 
+# Reads come from the summary tables maintained by services.aggregates, so
+# each query is proportional to the number of groups rather than rows
+
 class AnalyticsService:
     def get_monthly_salary_trends(self, db: Session, months: int = 6):
         results = db.query(
-            SalarySlip.month_year,
-            func.sum(SalarySlip.net_salary).label('total')
-        ).group_by(SalarySlip.month_year).order_by(SalarySlip.month_year.desc()).limit(months).all()
+            MonthlySalaryTotal.month_year,
+            MonthlySalaryTotal.total_net_salary.label('total')
+        ).filter(MonthlySalaryTotal.slip_count > 0).order_by(
+            MonthlySalaryTotal.month_year.desc()
+        ).limit(months).all()
         
         return [{"month": r.month_year, "total": float(r.total)} for r in results]
     
     def get_expense_category_breakdown(self, db: Session, employee_id: int = None):
         query = db.query(
-            Expense.category,
-            func.sum(Expense.amount).label('total')
-        ).filter(Expense.status == 'approved')
+            ExpenseTotal.category,
+            func.sum(ExpenseTotal.total_amount).label('total')
+        ).filter(ExpenseTotal.status == 'approved')
         
         if employee_id:
-            query = query.filter(Expense.employee_id == employee_id)
+            query = query.filter(ExpenseTotal.employee_id == employee_id)
         
-        results = query.group_by(Expense.category).all()
+        results = query.group_by(ExpenseTotal.category).having(
+            func.sum(ExpenseTotal.expense_count) > 0
+        ).all()
         return [{"category": r.category, "total": float(r.total)} for r in results]
     
     def get_employee_expense_summary(self, db: Session):
@@ -31,9 +36,11 @@ class AnalyticsService:
             User.id,
             User.full_name,
             User.email,
-            func.count(Expense.id).label('total_expenses'),
-            func.sum(Expense.amount).label('total_amount')
-        ).join(Expense, User.id == Expense.employee_id).group_by(User.id).all()
+            func.sum(ExpenseTotal.expense_count).label('total_expenses'),
+            func.sum(ExpenseTotal.total_amount).label('total_amount')
+        ).join(ExpenseTotal, User.id == ExpenseTotal.employee_id).group_by(User.id).having(
+            func.sum(ExpenseTotal.expense_count) > 0
+        ).all()
         
         return [{
             "employee_id": r.id,
@@ -0,0 +1,130 @@
+"""Auto-approval of submitted expenses by admin-defined rules.
+
+Active rules are compiled into a ``RuleMatcher`` that is cached per process
+and reloaded after ``APPROVAL_RULES_TTL_SECONDS`` (immediately in the
+process that changed them). Evaluating an expense checks at most four
+buckets, one per (category, employee) scope, with a bisect each, so the
+cost stays flat as rules are added. Monthly caps are checked against
+``expense_monthly_totals`` and only when an amount-eligible rule has one.
+
+Caps are checked against committed totals: two expenses submitted at the
+same moment by one employee can both fit under a cap they exceed together.
+"""
+import math
+import threading
+import time
+from bisect import bisect_left
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..models.aggregates import ExpenseMonthlyTotal
+from ..models.approval_rule import ApprovalRule
+from ..models.expense import Expense
+from ..utils.money import to_cents
+from .aggregates import expense_month
+
+UNLIMITED = math.inf
+
+class _Bucket(NamedTuple):
+    limits: List[float]           # max_amount in cents, ascending
+    best_caps: List[float]        # highest monthly cap among rules[i:]
+    best_rules: List[int]         # the rule holding that cap
+
+class RuleMatcher:
+    def __init__(self, rules: Iterable[ApprovalRule]):
+        grouped: Dict[Tuple[Optional[str], Optional[int]], List[Tuple[float, float, int]]] = {}
+        for rule in rules:
+            limit = UNLIMITED if rule.max_amount is None else to_cents(rule.max_amount)
+            cap = UNLIMITED if rule.monthly_cap is None else to_cents(rule.monthly_cap)
+            grouped.setdefault((rule.category, rule.employee_id), []).append((limit, cap, rule.id))
+
+        self.rule_count = sum(len(entries) for entries in grouped.values())
+        self._buckets: Dict[Tuple[Optional[str], Optional[int]], _Bucket] = {}
+        for scope, entries in grouped.items():
+            entries.sort()
+            best_caps, best_rules = [0.0] * len(entries), [0] * len(entries)
+            best = (-1.0, 0)
+            for index in range(len(entries) - 1, -1, -1):
+                _, cap, rule_id = entries[index]
+                if cap > best[0]:
+                    best = (cap, rule_id)
+                best_caps[index], best_rules[index] = best
+            self._buckets[scope] = _Bucket([entry[0] for entry in entries], best_caps, best_rules)
+
+    def match(self, employee_id: int, category: str, amount_cents: int,
+              spent: Callable[[Optional[str]], int]) -> Optional[int]:
+        """The id of a rule approving this expense, or None.
+
+        ``spent(category)`` returns the employee's approved cents for the
+        month, in ``category`` or overall when it is None.
+        """
+        for scope in ((category, employee_id), (category, None), (None, employee_id), (None, None)):
+            bucket = self._buckets.get(scope)
+            if bucket is None:
+                continue
+            index = bisect_left(bucket.limits, amount_cents)
+            if index == len(bucket.limits):
+                continue
+            cap = bucket.best_caps[index]
+            if cap == UNLIMITED or spent(scope[0]) + amount_cents <= cap:
+                return bucket.best_rules[index]
+        return None
+
+class ApprovalRuleService:
+    def __init__(self, ttl_seconds: float = 30):
+        self.ttl_seconds = ttl_seconds
+        self._matcher: Optional[RuleMatcher] = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def matcher(self, db: Session) -> RuleMatcher:
+        matcher = self._matcher
+        if matcher is not None and self._expires_at > time.monotonic():
+            return matcher
+        with self._lock:
+            if self._matcher is None or self._expires_at <= time.monotonic():
+                rules = db.execute(select(ApprovalRule).where(ApprovalRule.is_active.is_(True))).scalars().all()
+                self._matcher = RuleMatcher(rules)
+                self._expires_at = time.monotonic() + self.ttl_seconds
+            return self._matcher
+
+    def invalidate(self):
+        self._expires_at = 0.0
+
+    def monthly_spend(self, db: Session, employee_id: int, month_year: str, category: Optional[str] = None) -> int:
+        """Approved cents for the employee and month, read from the summary table."""
+        query = select(func.coalesce(func.sum(ExpenseMonthlyTotal.total_amount), 0)).where(
+            ExpenseMonthlyTotal.employee_id == employee_id,
+            ExpenseMonthlyTotal.month_year == month_year,
+            ExpenseMonthlyTotal.status == "approved"
+        )
+        if category is not None:
+            query = query.where(ExpenseMonthlyTotal.category == category)
+        return to_cents(db.execute(query).scalar())
+
+    def apply(self, db: Session, expense: Expense) -> Optional[int]:
+        """Approve ``expense`` in place if a rule allows it; returns the rule id."""
+        amount_cents = to_cents(expense.amount)
+        # A credit would lower the month's spend and let later claims past their caps
+        if amount_cents is None or amount_cents <= 0:
+            return None
+        matcher = self.matcher(db)
+        if not matcher.rule_count:
+            return None
+        month_year = expense_month(expense.expense_date)
+        spent_by_scope = {}
+
+        def spent(category):
+            if category not in spent_by_scope:
+                spent_by_scope[category] = self.monthly_spend(db, expense.employee_id, month_year, category)
+            return spent_by_scope[category]
+
+        rule_id = matcher.match(expense.employee_id, expense.category, amount_cents, spent)
+        if rule_id is not None:
+            expense.status = "approved"
+            expense.reviewed_at = datetime.utcnow()
+        return rule_id
+
+approval_rule_service = ApprovalRuleService(settings.APPROVAL_RULES_TTL_SECONDS)
@@ -0,0 +1,84 @@
+"""Incremental feed of created and updated salary slips and expenses.
+
+Rows are ordered by ``(updated_at, entity, id)`` and the cursor is the
+last row returned, so each poll is an index range scan on
+``(updated_at, id)`` per table. Rows written in the last
+``settle_seconds`` are held back until later polls. A transaction that
+commits after a newer one cannot then slip in behind a cursor that has
+already moved past its timestamp.
+"""
+import base64
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..models.expense import Expense
+from ..models.salary_slip import SalarySlip
+
+# Rows sharing an updated_at are ordered by entity name, then id
+ENTITIES = {"expense": Expense, "salary_slip": SalarySlip}
+
+def encode_cursor(updated_at: datetime, entity: str, row_id: int) -> str:
+    raw = f"{updated_at.isoformat()}|{entity}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(token: str) -> Tuple[datetime, str, int]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        updated_at, entity, row_id = base64.urlsafe_b64decode(padded).decode("utf-8").split("|")
+        return datetime.fromisoformat(updated_at), entity, int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+class ChangeFeedService:
+    def __init__(self, settle_seconds: float = 2):
+        self.settle_seconds = settle_seconds
+
+    def changes(self, db: Session, cursor: Optional[str] = None, since: Optional[datetime] = None,
+                limit: int = 100) -> Dict:
+        """Rows changed after ``cursor`` (or at/after ``since``), oldest first."""
+        if cursor:
+            position = decode_cursor(cursor)
+        elif since is not None:
+            position = (since, "", 0)
+        else:
+            position = None
+        until = datetime.utcnow() - timedelta(seconds=self.settle_seconds)
+
+        candidates = []
+        for entity, model in ENTITIES.items():
+            statement = select(model).where(model.updated_at <= until)
+            if position is not None:
+                statement = statement.where(self._after(model, entity, position))
+            rows = db.execute(
+                statement.order_by(model.updated_at, model.id).limit(limit + 1)
+            ).scalars().all()
+            candidates.extend((row.updated_at, entity, row.id, row) for row in rows)
+        candidates.sort(key=lambda candidate: candidate[:3])
+
+        page = candidates[:limit]
+        result = {
+            "salary_slips": [row for _, entity, _, row in page if entity == "salary_slip"],
+            "expenses": [row for _, entity, _, row in page if entity == "expense"],
+            "next_cursor": encode_cursor(*page[-1][:3]) if page else cursor,
+            "has_more": len(candidates) > limit
+        }
+        if result["next_cursor"] is None and position is not None:
+            # Nothing since ``since`` yet: hand back a cursor for the next poll
+            result["next_cursor"] = encode_cursor(*position)
+        return result
+
+    def _after(self, model, entity: str, position: Tuple[datetime, str, int]):
+        updated_at, cursor_entity, row_id = position
+        if entity > cursor_entity:
+            return model.updated_at >= updated_at
+        if entity < cursor_entity:
+            return model.updated_at > updated_at
+        return or_(
+            model.updated_at > updated_at,
+            and_(model.updated_at == updated_at, model.id > row_id)
+        )
+
+change_feed_service = ChangeFeedService(settings.CHANGE_FEED_SETTLE_SECONDS)
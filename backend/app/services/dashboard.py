@@ -0,0 +1,122 @@
+from datetime import datetime
+from sqlalchemy import case, func, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from ..models.salary_slip import SalarySlip
+from ..models.expense import Expense
+from ..models.user import User
+from ..utils.cache import response_cache
+from ..utils.change_tracking import on_commit
+
+ADMIN_STATS_KEY = "dashboard-stats:admin"
+EXPENSE_STATUSES = ("pending", "approved", "rejected")
+
+def employee_stats_key(employee_id: int, month_year: str) -> str:
+    return f"dashboard-stats:employee:{employee_id}:{month_year}"
+
+class DashboardService:
+    """Dashboard statistics served from the response cache.
+
+    Admin stats are shared by every admin; employee stats are cached per
+    employee and month. Entries are invalidated when a write that affects
+    them commits, and expire after ``CACHE_DEFAULT_TTL_SECONDS`` regardless.
+    """
+
+    def admin_stats(self, db: Session):
+        return response_cache.get_or_set(ADMIN_STATS_KEY, lambda: self.compute_admin_stats(db))
+
+    def employee_stats(self, db: Session, employee_id: int):
+        month_year = datetime.utcnow().strftime("%Y-%m")
+        return response_cache.get_or_set(
+            employee_stats_key(employee_id, month_year),
+            lambda: self.compute_employee_stats(db, employee_id, month_year)
+        )
+
+    async def admin_stats_async(self, db: AsyncSession):
+        return await response_cache.get_or_set_async(ADMIN_STATS_KEY, lambda: db.run_sync(self.compute_admin_stats))
+
+    async def employee_stats_async(self, db: AsyncSession, employee_id: int):
+        month_year = datetime.utcnow().strftime("%Y-%m")
+        return await response_cache.get_or_set_async(
+            employee_stats_key(employee_id, month_year),
+            lambda: db.run_sync(self.compute_employee_stats, employee_id, month_year)
+        )
+
+    def compute_admin_stats(self, db: Session):
+        """All admin dashboard figures in a single round trip."""
+        month_year = datetime.utcnow().strftime("%Y-%m")
+        expenses = select(*_expense_status_columns()).subquery()
+        slips = select(
+            func.count(SalarySlip.id).label("total_salary_slips"),
+            func.coalesce(func.sum(case((SalarySlip.month_year == month_year, 1), else_=0)), 0)
+            .label("month_salary_slips"),
+            func.coalesce(func.sum(case((SalarySlip.month_year == month_year, SalarySlip.net_salary), else_=0)), 0)
+            .label("month_net_salary")
+        ).subquery()
+        total_employees = select(func.count(User.id)).where(User.role == "employee").scalar_subquery()
+
+        # Both subqueries return exactly one row; join them so the FROM is not a cartesian product
+        row = db.execute(
+            select(total_employees.label("total_employees"), expenses, slips)
+            .select_from(slips).join(expenses, true())
+        ).one()._mapping
+        
+        return {
+            "total_employees": row["total_employees"],
+            "pending_expenses": row["pending_count"],
+            "total_salary_slips": row["total_salary_slips"],
+            "total_expenses": row["total_count"],
+            "expenses_by_status": _status_breakdown(row),
+            "current_month": {
+                "month_year": month_year,
+                "salary_slips": row["month_salary_slips"],
+                "net_salary_total": float(row["month_net_salary"])
+            }
+        }
+
+    def compute_employee_stats(self, db: Session, employee_id: int, month_year: str):
+        """All employee dashboard figures in a single round trip."""
+        current_month_salary = select(SalarySlip.net_salary).where(
+            SalarySlip.employee_id == employee_id,
+            SalarySlip.month_year == month_year
+        ).limit(1).scalar_subquery()
+
+        row = db.execute(
+            select(current_month_salary.label("current_month_salary"), *_expense_status_columns())
+            .where(Expense.employee_id == employee_id)
+        ).one()._mapping
+        
+        return {
+            "current_month_salary": float(row["current_month_salary"] or 0),
+            "total_expenses": row["total_count"],
+            "pending_expenses": row["pending_count"],
+            "expenses_by_status": _status_breakdown(row)
+        }
+
+def _expense_status_columns():
+    columns = [
+        func.count(Expense.id).label("total_count"),
+        func.coalesce(func.sum(Expense.amount), 0).label("total_amount"),
+    ]
+    for status in EXPENSE_STATUSES:
+        columns.append(func.coalesce(func.sum(case((Expense.status == status, 1), else_=0)), 0)
+                       .label(f"{status}_count"))
+        columns.append(func.coalesce(func.sum(case((Expense.status == status, Expense.amount), else_=0)), 0)
+                       .label(f"{status}_amount"))
+    return columns
+
+def _status_breakdown(row):
+    return {
+        status: {"count": row[f"{status}_count"], "amount": float(row[f"{status}_amount"])}
+        for status in EXPENSE_STATUSES
+    }
+
+dashboard_service = DashboardService()
+
+@on_commit
+def _invalidate_dashboard_stats(changes):
+    month_year = datetime.utcnow().strftime("%Y-%m")
+    employee_ids = {change.employee_id for change in changes if change.employee_id is not None}
+    response_cache.invalidate(
+        ADMIN_STATS_KEY, *(employee_stats_key(employee_id, month_year) for employee_id in employee_ids)
+    )
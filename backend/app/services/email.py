@@ -1,27 +1,149 @@
+import queue
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from typing import List
+from contextlib import contextmanager
+from datetime import datetime
+from email.message import EmailMessage
+from typing import Callable, Dict, List, Optional
+from sqlalchemy import insert
+from ..config import settings
+from ..models.outbox import OutboxMessage
+
+# Session.info flag telling the outbox dispatcher to wake up after commit
+OUTBOX_WAKE_FLAG = "outbox_enqueued"
+
+class SMTPConnectionPool:
+    """Keeps authenticated SMTP connections open between batches."""
+
+    def __init__(self, factory: Callable[[], smtplib.SMTP], size: int = 4):
+        self.factory = factory
+        self.size = size
+        self._idle = queue.LifoQueue(maxsize=size)
+
+    @contextmanager
+    def connection(self):
+        conn = None
+        try:
+            conn = self._idle.get_nowait()
+            if conn.noop()[0] != 250:
+                raise smtplib.SMTPServerDisconnected("stale connection")
+        except queue.Empty:
+            conn = self.factory()
+        except (smtplib.SMTPException, OSError):
+            _close_quietly(conn)
+            conn = self.factory()
+
+        try:
+            yield conn
+        except (smtplib.SMTPServerDisconnected, OSError):
+            _close_quietly(conn)
+            raise
+        else:
+            try:
+                self._idle.put_nowait(conn)
+            except queue.Full:
+                _close_quietly(conn)
+
+    def close(self):
+        while True:
+            try:
+                _close_quietly(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+def _close_quietly(conn):
+    if conn is None:
+        return
+    try:
+        conn.quit()
+    except (smtplib.SMTPException, OSError):
+        conn.close()
 
 class EmailService:
-    def __init__(self, smtp_host: str = "smtp.gmail.com", smtp_port: int = 587):
+    """Builds notifications and queues them in the outbox.
+
+    Nothing is sent inline: ``enqueue`` adds a row to the caller's
+    transaction and the outbox dispatcher delivers it after commit.
+    """
+
+    def __init__(
+        self,
+        smtp_host: Optional[str] = None,
+        smtp_port: int = 587,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: bool = True,
+        sender: str = "payroll@example.com",
+        timeout: float = 10,
+        smtp_factory: Optional[Callable[[], smtplib.SMTP]] = None
+    ):
         self.smtp_host = smtp_host
         self.smtp_port = smtp_port
-    
-    def send_email(self, to_email: str, subject: str, body: str):
-        """Send email notification (placeholder - configure SMTP in production)"""
-        print(f"Email would be sent to {to_email}: {subject}")
-        # In production, implement actual SMTP sending
-        pass
-    
-    def send_salary_slip_notification(self, employee_email: str, month_year: str):
-        subject = f"Salary Slip Generated - {month_year}"
-        body = f"Your salary slip for {month_year} has been generated."
-        self.send_email(employee_email, subject, body)
-    
-    def send_expense_status_notification(self, employee_email: str, status: str):
-        subject = f"Expense Request {status.title()}"
-        body = f"Your expense request has been {status}."
-        self.send_email(employee_email, subject, body)
-
-email_service = EmailService()
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.sender = sender
+        self.timeout = timeout
+        self.smtp_factory = smtp_factory or self._connect
+        self.configured = smtp_factory is not None or bool(smtp_host)
+
+    def _connect(self) -> smtplib.SMTP:
+        conn = smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=self.timeout)
+        if self.use_tls:
+            conn.starttls()
+        if self.username:
+            conn.login(self.username, self.password)
+        return conn
+
+    def build_message(self, recipient: str, subject: str, body: str) -> EmailMessage:
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = recipient
+        message["Subject"] = subject
+        message.set_content(body)
+        return message
+
+    def enqueue(self, db, recipient: str, subject: str, body: str):
+        """Queue one email in ``db``'s transaction (works with sync and async sessions)."""
+        db.add(OutboxMessage(recipient=recipient, subject=subject, body=body))
+        db.info[OUTBOX_WAKE_FLAG] = True
+
+    def enqueue_many(self, db, messages: List[Dict]):
+        """Queue ``{"recipient", "subject", "body"}`` dicts with one executemany insert."""
+        if not messages:
+            return
+        now = datetime.utcnow()
+        db.execute(insert(OutboxMessage), [
+            {**message, "status": "pending", "attempts": 0, "next_attempt_at": now, "created_at": now}
+            for message in messages
+        ])
+        db.info[OUTBOX_WAKE_FLAG] = True
+
+    def salary_slip_notification(self, employee_email: str, month_year: str) -> Dict:
+        return {
+            "recipient": employee_email,
+            "subject": f"Salary Slip Generated - {month_year}",
+            "body": f"Your salary slip for {month_year} has been generated."
+        }
+
+    def expense_status_notification(self, employee_email: str, status: str) -> Dict:
+        return {
+            "recipient": employee_email,
+            "subject": f"Expense Request {status.title()}",
+            "body": f"Your expense request has been {status}."
+        }
+
+    def send_salary_slip_notification(self, db, employee_email: str, month_year: str):
+        self.enqueue(db, **self.salary_slip_notification(employee_email, month_year))
+
+    def send_expense_status_notification(self, db, employee_email: str, status: str):
+        self.enqueue(db, **self.expense_status_notification(employee_email, status))
+
+email_service = EmailService(
+    smtp_host=settings.SMTP_HOST,
+    smtp_port=settings.SMTP_PORT,
+    username=settings.SMTP_USERNAME,
+    password=settings.SMTP_PASSWORD,
+    use_tls=settings.SMTP_USE_TLS,
+    sender=settings.SMTP_FROM,
+    timeout=settings.SMTP_TIMEOUT_SECONDS
+)
@@ -0,0 +1,180 @@
+"""Server-sent events for dashboards and expense lists.
+
+Each committed transaction that touches salary slips or expenses is
+published to the broker as one message listing its changes. Every
+worker's ``EventHub`` receives those messages and fans them out to its
+open streams. Employees get the changes to their own records and admins
+get all of them. A stream is an asyncio queue on the worker's event loop
+and holds no database connection, so idle clients cost little more than
+their socket.
+
+Without ``EVENTS_BROKER_URL`` the broker is in-process, which suffices
+for a single worker. With it, messages go through Redis pub/sub so every
+worker sees every commit.
+"""
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional, Set
+from ..config import settings
+from ..utils.change_tracking import Change, on_commit
+
+logger = logging.getLogger(__name__)
+
+PUBLISHED_ENTITIES = ("salary_slip", "expense")
+
+class Subscription:
+    def __init__(self, user_id: int, is_admin: bool, queue_size: int):
+        self.user_id = user_id
+        self.is_admin = is_admin
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+
+    def offer(self, changes: List[Dict]):
+        # A slow reader loses its oldest messages rather than growing without bound
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(changes)
+
+    async def next(self, timeout: float) -> Optional[List[Dict]]:
+        """The next message, or None if nothing arrived within ``timeout``."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+class EventHub:
+    """Open streams of this worker, keyed by audience."""
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._admins: Set[Subscription] = set()
+        self._employees: Dict[int, Set[Subscription]] = defaultdict(set)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def subscribe(self, user_id: int, is_admin: bool) -> Subscription:
+        """Must be called on the event loop that will read the subscription."""
+        self._loop = asyncio.get_running_loop()
+        subscription = Subscription(user_id, is_admin, self.queue_size)
+        if is_admin:
+            self._admins.add(subscription)
+        else:
+            self._employees[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        if subscription.is_admin:
+            self._admins.discard(subscription)
+            return
+        subscribers = self._employees.get(subscription.user_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._employees[subscription.user_id]
+
+    def connections(self) -> int:
+        return len(self._admins) + sum(len(subscribers) for subscribers in self._employees.values())
+
+    def deliver(self, changes: List[Dict]):
+        """Fan ``changes`` out to the open streams; safe to call from any thread."""
+        if not (self._admins or self._employees) or self._loop is None:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._fan_out, changes)
+        except RuntimeError:
+            # The loop has closed; its streams are gone with it
+            pass
+
+    def _fan_out(self, changes: List[Dict]):
+        for subscription in self._admins:
+            subscription.offer(changes)
+        by_employee = defaultdict(list)
+        for change in changes:
+            by_employee[change["employee_id"]].append(change)
+        for employee_id, own_changes in by_employee.items():
+            for subscription in self._employees.get(employee_id, ()):
+                subscription.offer(own_changes)
+
+class LocalBroker:
+    """Delivers straight to this process's hub."""
+
+    def __init__(self, hub: EventHub):
+        self.hub = hub
+
+    def publish(self, changes: List[Dict]):
+        self.hub.deliver(changes)
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+class RedisBroker:
+    """Redis pub/sub, so streams on every worker see every commit."""
+
+    def __init__(self, client, hub: EventHub, channel: str = "payroll:events"):
+        self.client = client
+        self.hub = hub
+        self.channel = channel
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def publish(self, changes: List[Dict]):
+        self.client.publish(self.channel, json.dumps(changes))
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self.channel)
+        self._thread = threading.Thread(target=self._listen, args=(pubsub,), name="event-broker", daemon=True)
+        self._thread.start()
+
+    def _listen(self, pubsub):
+        try:
+            while not self._stop.is_set():
+                try:
+                    message = pubsub.get_message(timeout=1.0)
+                except Exception:
+                    logger.exception("Event broker connection failed; retrying")
+                    self._stop.wait(1.0)
+                    continue
+                if message and message.get("type") == "message":
+                    self.hub.deliver(json.loads(message["data"]))
+        finally:
+            pubsub.close()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+def create_broker(hub: EventHub):
+    if settings.EVENTS_BROKER_URL:
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("EVENTS_BROKER_URL is set but the 'redis' package is not installed")
+        return RedisBroker(redis.Redis.from_url(settings.EVENTS_BROKER_URL), hub)
+    return LocalBroker(hub)
+
+event_hub = EventHub(settings.EVENTS_QUEUE_SIZE)
+event_broker = create_broker(event_hub)
+
+def _as_event(change: Change) -> Dict:
+    return {
+        "entity": change.entity, "id": change.entity_id,
+        "employee_id": change.employee_id, "action": change.action
+    }
+
+@on_commit
+def _publish_changes(changes: List[Change]):
+    events = [_as_event(change) for change in changes if change.entity in PUBLISHED_ENTITIES]
+    if events:
+        event_broker.publish(events)
@@ -0,0 +1,117 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session
+from ..models.expense import Expense
+from ..models.user import User
+from .aggregates import aggregate_service, expense_month
+from .email import email_service
+from ..utils.change_tracking import record_change
+from ..utils.money import from_cents, to_cents
+
+# Keep IN (...) lists well below SQLite's bound-parameter limit
+ID_CHUNK_SIZE = 500
+
+class ExpenseReviewService:
+    def review(
+        self,
+        db: Session,
+        status: str,
+        reviewed_by: int,
+        ids: Optional[List[int]] = None,
+        current_status: str = "pending",
+        category: Optional[str] = None,
+        employee_id: Optional[int] = None,
+        max_amount: Optional[float] = None,
+        date_from=None,
+        date_to=None
+    ) -> Dict:
+        """Move every matching ``current_status`` expense to ``status`` in set-based UPDATEs.
+
+        Matches either ``ids`` or the filters. Expenses in another status are
+        left alone, so ``ids`` that were not changed are reported as skipped.
+        """
+        # Rows from before status had a default are pending; keep the status index usable
+        if current_status == "pending":
+            conditions = [or_(Expense.status == current_status, Expense.status.is_(None))]
+        else:
+            conditions = [Expense.status == current_status]
+        if category is not None:
+            conditions.append(Expense.category == category)
+        if employee_id is not None:
+            conditions.append(Expense.employee_id == employee_id)
+        if max_amount is not None:
+            conditions.append(Expense.amount <= max_amount)
+        if date_from is not None:
+            conditions.append(Expense.expense_date >= date_from)
+        if date_to is not None:
+            conditions.append(Expense.expense_date <= date_to)
+
+        if ids is None:
+            changed = self._update(db, conditions, status, reviewed_by)
+        else:
+            requested = list(dict.fromkeys(ids))
+            changed = []
+            for start in range(0, len(requested), ID_CHUNK_SIZE):
+                chunk = requested[start:start + ID_CHUNK_SIZE]
+                changed.extend(self._update(db, conditions + [Expense.id.in_(chunk)], status, reviewed_by))
+
+        # Core updates bypass the ORM flush hooks that maintain the totals
+        deltas = defaultdict(lambda: [0, 0])
+        for _, owner, expense_category, amount, expense_date in changed:
+            cents = to_cents(amount) or 0
+            month_year = expense_month(expense_date)
+            previous = deltas[(owner, expense_category, current_status, month_year)]
+            previous[0] -= cents
+            previous[1] -= 1
+            current = deltas[(owner, expense_category, status, month_year)]
+            current[0] += cents
+            current[1] += 1
+        aggregate_service.apply_expense_deltas(db.connection(), {
+            key: (from_cents(cents), count) for key, (cents, count) in deltas.items()
+        })
+
+        for expense_id, owner, *_ in changed:
+            record_change(db, "expense", expense_id, owner, "updated")
+        emails = self._emails(db, {owner for _, owner, *_ in changed})
+        email_service.enqueue_many(db, [
+            email_service.expense_status_notification(emails[owner], status)
+            for _, owner, *_ in changed if owner in emails
+        ])
+        db.commit()
+
+        updated_ids = sorted(expense_id for expense_id, *_ in changed)
+        result = {"status": status, "updated": len(updated_ids), "updated_ids": updated_ids}
+        if ids is not None:
+            changed_ids = set(updated_ids)
+            result["skipped_ids"] = [expense_id for expense_id in requested if expense_id not in changed_ids]
+        return result
+
+    def _update(self, db: Session, conditions, status: str, reviewed_by: int):
+        values = {"status": status, "reviewed_by": reviewed_by, "reviewed_at": datetime.utcnow()}
+        returned = (Expense.id, Expense.employee_id, Expense.category, Expense.amount, Expense.expense_date)
+        if db.get_bind().dialect.update_returning:
+            return db.execute(
+                update(Expense).where(*conditions).values(values).returning(*returned),
+                execution_options={"synchronize_session": False}
+            ).all()
+
+        # No UPDATE ... RETURNING: lock the matching rows, then update exactly those
+        rows = db.execute(select(*returned).where(*conditions).with_for_update()).all()
+        if rows:
+            db.execute(
+                update(Expense).where(Expense.id.in_([row[0] for row in rows])).values(values),
+                execution_options={"synchronize_session": False}
+            )
+        return rows
+
+    def _emails(self, db: Session, user_ids) -> Dict[int, str]:
+        user_ids = list(user_ids)
+        found = {}
+        for start in range(0, len(user_ids), ID_CHUNK_SIZE):
+            chunk = user_ids[start:start + ID_CHUNK_SIZE]
+            found.update(db.execute(select(User.id, User.email).where(User.id.in_(chunk))).tuples().all())
+        return found
+
+expense_review_service = ExpenseReviewService()
@@ -1,16 +1,35 @@
 import csv
 from io import StringIO
-from typing import List
+from typing import Callable, Iterator, List
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from ..models.salary_slip import SalarySlip
+from ..models.expense import Expense
+
+SALARY_SLIP_HEADERS = [
+    'ID', 'Employee ID', 'Month', 'Basic Salary',
+    'Allowances', 'Bonuses', 'Deductions', 'Tax', 'Net Salary'
+]
+SALARY_SLIP_COLUMNS = (
+    SalarySlip.id, SalarySlip.employee_id, SalarySlip.month_year,
+    SalarySlip.basic_salary, SalarySlip.allowances, SalarySlip.bonuses,
+    SalarySlip.deductions, SalarySlip.tax, SalarySlip.net_salary
+)
+
+EXPENSE_HEADERS = [
+    'ID', 'Employee ID', 'Amount', 'Category',
+    'Description', 'Date', 'Status'
+]
+EXPENSE_COLUMNS = (
+    Expense.id, Expense.employee_id, Expense.amount, Expense.category,
+    Expense.description, Expense.expense_date, Expense.status
+)
 
 class ExportService:
     def export_salary_slips_to_csv(self, salary_slips: List) -> str:
         output = StringIO()
         writer = csv.writer(output)
-        
-        writer.writerow([
-            'ID', 'Employee ID', 'Month', 'Basic Salary', 
-            'Allowances', 'Bonuses', 'Deductions', 'Tax', 'Net Salary'
-        ])
+        writer.writerow(SALARY_SLIP_HEADERS)
         
         for slip in salary_slips:
             writer.writerow([
@@ -24,11 +43,7 @@ class ExportService:
     def export_expenses_to_csv(self, expenses: List) -> str:
         output = StringIO()
         writer = csv.writer(output)
-        
-        writer.writerow([
-            'ID', 'Employee ID', 'Amount', 'Category', 
-            'Description', 'Date', 'Status'
-        ])
+        writer.writerow(EXPENSE_HEADERS)
         
         for exp in expenses:
             writer.writerow([
@@ -38,4 +53,42 @@ class ExportService:
         
         return output.getvalue()
 
+    def stream_salary_slips_csv(
+        self, session_factory: Callable[[], Session], chunk_size: int = 1000
+    ) -> Iterator[bytes]:
+        statement = select(*SALARY_SLIP_COLUMNS).order_by(SalarySlip.id)
+        return self._stream_csv(session_factory, SALARY_SLIP_HEADERS, statement, chunk_size)
+
+    def stream_expenses_csv(
+        self, session_factory: Callable[[], Session], chunk_size: int = 1000
+    ) -> Iterator[bytes]:
+        statement = select(*EXPENSE_COLUMNS).order_by(Expense.id)
+        return self._stream_csv(session_factory, EXPENSE_HEADERS, statement, chunk_size)
+
+    def _stream_csv(self, session_factory, headers, statement, chunk_size):
+        """Yield CSV bytes one chunk of rows at a time.
+
+        Rows are fetched as plain column tuples through ``yield_per``, which
+        uses a server-side cursor where the driver supports one, so memory
+        stays bounded by ``chunk_size`` regardless of table size. The
+        generator owns its session so it stays open for as long as the
+        response is being streamed.
+        """
+        buffer = StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(headers)
+        yield self._drain(buffer)
+
+        with session_factory() as db:
+            result = db.execute(statement.execution_options(yield_per=chunk_size))
+            for rows in result.partitions():
+                writer.writerows(rows)
+                yield self._drain(buffer)
+
+    def _drain(self, buffer: StringIO) -> bytes:
+        data = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return data.encode('utf-8')
+
 export_service = ExportService()
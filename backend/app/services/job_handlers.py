@@ -0,0 +1,83 @@
+"""Handlers for the admin operations that can run as background jobs.
+
+Each handler opens its own session, so it can run on the in-process pool
+or in a dedicated worker process. File results are written to
+``JOBS_RESULT_DIR`` and served by ``GET /jobs/{id}/result``.
+"""
+import os
+from typing import Dict, List, Optional
+from ..config import settings
+from ..schemas.salary_slip import PayrollRunTemplate
+from ..utils.database import SessionLocal
+from ..utils.replicas import replicas
+from .aggregates import aggregate_service
+from .export import export_service
+from .jobs import JobContext, job_handler
+from .payroll import payroll_service
+from .slip_documents import slip_documents
+from .user_import import user_import_service
+
+def _result_path(ctx: JobContext, filename: str) -> str:
+    os.makedirs(settings.JOBS_RESULT_DIR, exist_ok=True)
+    return os.path.abspath(os.path.join(settings.JOBS_RESULT_DIR, f"job-{ctx.job_id}-{filename}"))
+
+@job_handler("payroll_run")
+def run_payroll(ctx: JobContext, month_year: str, created_by: int, chunk_size: int = 1000,
+                items: Optional[List[Dict]] = None, template: Optional[Dict] = None):
+    with SessionLocal() as db:
+        if items is None:
+            items = payroll_service.build_template_items(db, PayrollRunTemplate(**template))
+        return payroll_service.run_payroll(
+            db, month_year, items, created_by=created_by, chunk_size=chunk_size, progress=ctx.progress
+        )
+
+@job_handler("employee_import")
+def import_employees(ctx: JobContext, chunk_size: int = 1000):
+    # Rows include plaintext passwords, so they only ever live in ctx.payload
+    with SessionLocal() as db:
+        return user_import_service.import_users(db, ctx.payload, chunk_size=chunk_size, progress=ctx.progress)
+
+@job_handler("analytics_rebuild")
+def rebuild_analytics(ctx: JobContext):
+    with SessionLocal() as db:
+        aggregate_service.rebuild(db.connection())
+        db.commit()
+    return {"status": "rebuilt"}
+
+@job_handler("ledger_recompute")
+def recompute_ledger(ctx: JobContext, month_year: str, apply: bool = False):
+    from .ledger import ledger_service  # NumPy is only loaded when needed
+
+    with SessionLocal() as db:
+        return ledger_service.recompute_month(db, month_year, apply=apply)
+
+@job_handler("salary_slip_archive")
+def build_salary_slip_archive(ctx: JobContext, month_year: str):
+    with SessionLocal() as db:
+        archive_path = slip_documents.build_month_archive(db, month_year)
+    if archive_path is None:
+        raise ValueError(f"No salary slips for {month_year}")
+    return {
+        "file": archive_path,
+        "filename": f"salary-slips-{month_year}.zip",
+        "media_type": "application/zip"
+    }
+
+def _write_export(ctx: JobContext, chunks, filename: str) -> Dict:
+    path = _result_path(ctx, filename)
+    with open(path, "wb") as f:
+        for written, chunk in enumerate(chunks, start=1):
+            f.write(chunk)
+            if written % 10 == 0:
+                ctx.check_cancelled()
+    return {"file": path, "filename": filename, "media_type": "text/csv"}
+
+@job_handler("salary_slips_export")
+def export_salary_slips(ctx: JobContext):
+    chunks = export_service.stream_salary_slips_csv(replicas.read_session, settings.EXPORT_CHUNK_SIZE)
+    return _write_export(ctx, chunks, "salary_slips.csv")
+
+@job_handler("expenses_export")
+def export_expenses(ctx: JobContext):
+    chunks = export_service.stream_expenses_csv(replicas.read_session, settings.EXPORT_CHUNK_SIZE)
+    return _write_export(ctx, chunks, "expenses.csv")
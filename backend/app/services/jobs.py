@@ -0,0 +1,218 @@
+"""Background jobs for long-running admin operations.
+
+A job is a row in ``jobs`` plus a handler registered with ``@job_handler``.
+Jobs run on the in-process thread pool (``JOBS_WORKERS``) and can also be
+picked up by dedicated worker processes started with
+``python -m app.services.jobs``; claiming a job is a conditional UPDATE,
+so each job runs exactly once. Handlers report progress and honour
+cancellation through the ``JobContext`` they receive.
+"""
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Optional
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..models.job import Job
+from ..utils.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+FINISHED = ("succeeded", "failed", "cancelled")
+
+def _json_default(value):
+    # Money amounts are Decimals; results are read back as plain JSON numbers
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"{value.__class__.__name__} is not JSON serialisable")
+
+class JobCancelled(Exception):
+    pass
+
+_handlers: Dict[str, Callable] = {}
+
+def job_handler(kind: str):
+    """Register ``fn(ctx, **params) -> JSON-serialisable result`` for ``kind``."""
+    def register(fn):
+        _handlers[kind] = fn
+        return fn
+    return register
+
+class JobContext:
+    """Handed to a running handler; progress writes are throttled."""
+
+    def __init__(self, session_factory, job_id: int, payload: Any = None, min_interval_seconds: float = 0.5):
+        self.session_factory = session_factory
+        self.job_id = job_id
+        self.payload = payload
+        self.min_interval_seconds = min_interval_seconds
+        self._last_write = 0.0
+        self._cancelled = False
+
+    def progress(self, done: float, total: float = 1, message: Optional[str] = None):
+        """Record progress and raise ``JobCancelled`` if cancellation was requested."""
+        now = time.monotonic()
+        if now - self._last_write < self.min_interval_seconds and done < total:
+            return
+        self._last_write = now
+        fraction = min(1.0, done / total) if total else 1.0
+        with self.session_factory() as db:
+            db.execute(
+                update(Job).where(Job.id == self.job_id)
+                .values(progress=fraction, progress_message=message)
+            )
+            self._cancelled = bool(db.execute(
+                select(Job.cancel_requested).where(Job.id == self.job_id)
+            ).scalar())
+            db.commit()
+        self.check_cancelled()
+
+    def check_cancelled(self):
+        if self._cancelled:
+            raise JobCancelled()
+
+class JobService:
+    def __init__(self, session_factory, workers: int = 2):
+        self.session_factory = session_factory
+        self.workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._payloads: Dict[int, Any] = {}
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=max(1, self.workers), thread_name_prefix="job")
+            return self._executor
+
+    def submit(self, db: Session, kind: str, params: Optional[Dict] = None,
+               created_by: Optional[int] = None, payload: Any = None) -> Job:
+        """Persist a queued job and schedule it.
+
+        ``payload`` is for input that must not be written to the database
+        (e.g. an import's plaintext passwords); such jobs can only run in
+        this process.
+        """
+        if kind not in _handlers:
+            raise ValueError(f"Unknown job kind {kind!r}")
+        job = Job(
+            kind=kind, params=json.dumps(params or {}), created_by=created_by,
+            inline_input=payload is not None
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        if payload is not None:
+            self._payloads[job.id] = payload
+        # Jobs with in-memory input run here even when JOBS_WORKERS is 0
+        if self.workers > 0 or payload is not None:
+            self._get_executor().submit(self.run, job.id)
+        return job
+
+    def cancel(self, db: Session, job: Job) -> Job:
+        """Cancel a queued job outright, or ask a running one to stop."""
+        now = datetime.utcnow()
+        cancelled = db.execute(
+            update(Job).where(Job.id == job.id, Job.status == "queued")
+            .values(status="cancelled", cancel_requested=True, finished_at=now)
+        ).rowcount
+        if not cancelled:
+            db.execute(
+                update(Job).where(Job.id == job.id, Job.status == "running").values(cancel_requested=True)
+            )
+        db.commit()
+        if cancelled:
+            self._payloads.pop(job.id, None)
+        db.refresh(job)
+        return job
+
+    def _claim(self, job_id: int) -> bool:
+        with self.session_factory() as db:
+            claimed = db.execute(
+                update(Job).where(Job.id == job_id, Job.status == "queued")
+                .values(status="running", started_at=datetime.utcnow())
+            ).rowcount
+            db.commit()
+        return bool(claimed)
+
+    def _finish(self, job_id: int, status: str, result: Any = None, error: Optional[str] = None):
+        values = {"status": status, "finished_at": datetime.utcnow(), "error": error}
+        if status == "succeeded":
+            values.update(result=json.dumps(result, default=_json_default), progress=1.0)
+        with self.session_factory() as db:
+            db.execute(update(Job).where(Job.id == job_id).values(**values))
+            db.commit()
+
+    def run(self, job_id: int):
+        """Claim and execute one job; a job claimed elsewhere is skipped."""
+        if not self._claim(job_id):
+            return
+        payload = self._payloads.pop(job_id, None)
+        with self.session_factory() as db:
+            job = db.get(Job, job_id)
+            kind, params, inline_input = job.kind, json.loads(job.params or "{}"), job.inline_input
+
+        if inline_input and payload is None:
+            self._finish(job_id, "failed", error="Job input was lost (the process that accepted it restarted)")
+            return
+
+        context = JobContext(self.session_factory, job_id, payload)
+        try:
+            result = _handlers[kind](context, **params)
+        except JobCancelled:
+            self._finish(job_id, "cancelled")
+        except Exception as exc:
+            logger.exception("Job %s (%s) failed", job_id, kind)
+            self._finish(job_id, "failed", error=f"{exc.__class__.__name__}: {exc}"[:500])
+        else:
+            self._finish(job_id, "succeeded", result)
+
+    def resume_queued(self):
+        """Schedule jobs left queued, e.g. by a restart or another process."""
+        if self.workers <= 0:
+            return
+        with self.session_factory() as db:
+            job_ids = db.execute(
+                select(Job.id).where(Job.status == "queued", Job.inline_input.is_(False)).order_by(Job.id)
+            ).scalars().all()
+        for job_id in job_ids:
+            self._get_executor().submit(self.run, job_id)
+
+    def work_forever(self, poll_interval_seconds: float = 2):
+        """Loop for a dedicated worker process: run queued jobs one at a time."""
+        while True:
+            with self.session_factory() as db:
+                job_id = db.execute(
+                    select(Job.id)
+                    .where(Job.status == "queued", Job.inline_input.is_(False))
+                    .order_by(Job.id).limit(1)
+                ).scalar()
+            if job_id is None:
+                time.sleep(poll_interval_seconds)
+            else:
+                self.run(job_id)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+job_service = JobService(SessionLocal, workers=settings.JOBS_WORKERS)
+
+if __name__ == "__main__":
+    # Run as __main__, this file is a second copy of the module; use the
+    # importable one, which is where job_handlers registers the handlers
+    from . import job_handlers  # noqa: F401 - registers the handlers
+    from .jobs import job_service as worker_service
+
+    logging.basicConfig(level=logging.INFO)
+    logger.info("Job worker started")
+    worker_service.work_forever()
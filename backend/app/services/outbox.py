@@ -0,0 +1,200 @@
+"""Delivers queued notifications from ``notification_outbox``.
+
+The dispatcher thread claims due rows in batches, sends them over a small
+pool of persistent SMTP connections and records the outcome. Failures are
+retried with exponential backoff; permanent SMTP rejections and messages
+that exhaust their attempts are marked ``failed``. Claims carry a lease,
+so several app processes can run dispatchers against one database and a
+crashed dispatcher's rows are picked up again once the lease expires.
+"""
+import logging
+import smtplib
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from sqlalchemy import event, or_, select, update
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..models.outbox import OutboxMessage
+from ..utils.database import SessionLocal
+from .email import OUTBOX_WAKE_FLAG, SMTPConnectionPool, email_service
+
+logger = logging.getLogger(__name__)
+
+CLAIM_LEASE = timedelta(minutes=5)
+MAX_BACKOFF = timedelta(hours=1)
+
+class OutboxDispatcher:
+    def __init__(
+        self,
+        session_factory,
+        email_service,
+        batch_size: int = 200,
+        connections: int = 4,
+        max_attempts: int = 5,
+        retry_base_seconds: float = 30,
+        poll_interval_seconds: float = 5
+    ):
+        self.session_factory = session_factory
+        self.email_service = email_service
+        self.batch_size = batch_size
+        self.connections = connections
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self.pool = SMTPConnectionPool(email_service.smtp_factory, connections)
+        self._senders = ThreadPoolExecutor(max_workers=connections, thread_name_prefix="smtp")
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def wake(self):
+        self._wake.set()
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="outbox-dispatcher", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.pool.close()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                sent = self.dispatch_once()
+            except Exception:
+                logger.exception("Outbox dispatch failed")
+                sent = 0
+            # A full batch means more is probably waiting; otherwise sleep
+            if sent < self.batch_size:
+                self._wake.wait(self.poll_interval_seconds)
+                self._wake.clear()
+
+    def dispatch_once(self) -> int:
+        """Claim and deliver one batch; returns the number of messages handled."""
+        messages = self._claim()
+        if not messages:
+            return 0
+
+        slices = [messages[i::self.connections] for i in range(self.connections)]
+        outcomes: List[Tuple[OutboxMessage, Optional[Exception]]] = []
+        for result in self._senders.map(self._send_slice, [s for s in slices if s]):
+            outcomes.extend(result)
+        self._record(outcomes)
+        return len(messages)
+
+    def _claim(self) -> List[OutboxMessage]:
+        now = datetime.utcnow()
+        token = uuid.uuid4().hex
+        with self.session_factory() as db:
+            due = (
+                select(OutboxMessage.id)
+                .where(
+                    or_(OutboxMessage.status == "pending", OutboxMessage.status == "sending"),
+                    OutboxMessage.next_attempt_at <= now
+                )
+                .order_by(OutboxMessage.next_attempt_at, OutboxMessage.id)
+                .limit(self.batch_size)
+            )
+            db.execute(
+                update(OutboxMessage)
+                .where(OutboxMessage.id.in_(due.scalar_subquery()), OutboxMessage.next_attempt_at <= now)
+                .values(status="sending", claimed_by=token, next_attempt_at=now + CLAIM_LEASE)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            messages = db.execute(
+                select(OutboxMessage).where(OutboxMessage.claimed_by == token, OutboxMessage.status == "sending")
+            ).scalars().all()
+            db.expunge_all()
+        return messages
+
+    def _send_slice(self, messages: List[OutboxMessage]):
+        outcomes = []
+        remaining = list(messages)
+        while remaining:
+            try:
+                with self.pool.connection() as conn:
+                    while remaining:
+                        message = remaining[0]
+                        try:
+                            conn.send_message(self.email_service.build_message(
+                                message.recipient, message.subject, message.body
+                            ))
+                            outcomes.append((message, None))
+                        except (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError,
+                                smtplib.SMTPSenderRefused) as exc:
+                            # Refused for this message only; the connection is still usable
+                            outcomes.append((message, exc))
+                        remaining.pop(0)
+            except (smtplib.SMTPException, OSError) as exc:
+                # Connection-level failure: defer this slice's unsent messages
+                outcomes.extend((message, exc) for message in remaining)
+                remaining = []
+        return outcomes
+
+    def _record(self, outcomes):
+        now = datetime.utcnow()
+        sent_ids = [message.id for message, error in outcomes if error is None]
+        with self.session_factory() as db:
+            if sent_ids:
+                db.execute(
+                    update(OutboxMessage)
+                    .where(OutboxMessage.id.in_(sent_ids))
+                    .values(status="sent", sent_at=now, attempts=OutboxMessage.attempts + 1, last_error=None)
+                    .execution_options(synchronize_session=False)
+                )
+            for message, error in outcomes:
+                if error is None:
+                    continue
+                attempts = message.attempts + 1
+                permanent = isinstance(error, (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused)) or (
+                    isinstance(error, smtplib.SMTPResponseException) and 500 <= error.smtp_code < 600
+                )
+                failed = permanent or attempts >= self.max_attempts
+                backoff = min(timedelta(seconds=self.retry_base_seconds * 2 ** (attempts - 1)), MAX_BACKOFF)
+                db.execute(
+                    update(OutboxMessage)
+                    .where(OutboxMessage.id == message.id)
+                    .values(
+                        status="failed" if failed else "pending",
+                        attempts=attempts,
+                        next_attempt_at=now if failed else now + backoff,
+                        last_error=f"{error.__class__.__name__}: {error}"[:500]
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                if failed:
+                    logger.warning("Giving up on notification %s to %s: %s", message.id, message.recipient, error)
+            db.commit()
+
+def create_dispatcher():
+    return OutboxDispatcher(
+        SessionLocal,
+        email_service,
+        batch_size=settings.OUTBOX_BATCH_SIZE,
+        connections=settings.SMTP_CONNECTIONS,
+        max_attempts=settings.OUTBOX_MAX_ATTEMPTS,
+        retry_base_seconds=settings.OUTBOX_RETRY_BASE_SECONDS,
+        poll_interval_seconds=settings.OUTBOX_POLL_INTERVAL_SECONDS
+    )
+
+outbox_dispatcher = create_dispatcher()
+
+@event.listens_for(Session, "after_commit")
+def _wake_dispatcher(session):
+    if session.info.pop(OUTBOX_WAKE_FLAG, False):
+        outbox_dispatcher.wake()
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_enqueued(session, previous_transaction):
+    session.info.pop(OUTBOX_WAKE_FLAG, None)
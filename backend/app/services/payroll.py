@@ -0,0 +1,146 @@
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from sqlalchemy import insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from ..models.salary_slip import SalarySlip
+from ..models.user import User
+from .aggregates import aggregate_service
+from .email import email_service
+from ..utils.change_tracking import record_change
+from ..utils.money import from_cents, to_cents
+
+# Keep IN (...) lists well below SQLite's bound-parameter limit
+LOOKUP_CHUNK_SIZE = 500
+
+class PayrollService:
+    def compute_net_salary(self, basic_salary, allowances=0, bonuses=0, deductions=0, tax=0):
+        # Summed in integer cents, so the result is exact to the cent
+        cents = (
+            to_cents(basic_salary) + to_cents(allowances or 0) + to_cents(bonuses or 0)
+            - to_cents(deductions or 0) - to_cents(tax or 0)
+        )
+        return from_cents(cents)
+
+    def build_template_items(self, db: Session, template) -> List[Dict]:
+        """Expand a component template into one item per employee."""
+        components = template.dict()
+        employee_ids = db.execute(
+            select(User.id).where(User.role == "employee").order_by(User.id)
+        ).scalars().all()
+        return [{"employee_id": employee_id, **components} for employee_id in employee_ids]
+
+    def run_payroll(
+        self,
+        db: Session,
+        month_year: str,
+        items: List[Dict],
+        created_by: int,
+        chunk_size: int = 1000,
+        progress: Optional[Callable[[int, int], None]] = None
+    ) -> Dict:
+        """Create one salary slip per item using chunked executemany inserts.
+
+        Rows that cannot be inserted are reported in ``errors`` by their
+        position in ``items``; the remaining rows are still created.
+        ``progress(done, total)`` is called after each committed chunk.
+        """
+        started = time.perf_counter()
+        errors = []
+        requested_ids = {item["employee_id"] for item in items}
+        known_employees = self._existing_employees(db, requested_ids)
+        already_paid = set(db.execute(
+            select(SalarySlip.employee_id).where(SalarySlip.month_year == month_year)
+        ).scalars().all())
+
+        rows = []
+        seen = set()
+        now = datetime.utcnow()
+        for index, item in enumerate(items):
+            employee_id = item["employee_id"]
+            error = None
+            if employee_id not in known_employees:
+                error = "Employee not found"
+            elif employee_id in seen:
+                error = "Duplicate employee in payroll run"
+            elif employee_id in already_paid:
+                error = f"Salary slip for {month_year} already exists"
+            if error:
+                errors.append({"index": index, "employee_id": employee_id, "error": error})
+                continue
+
+            seen.add(employee_id)
+            rows.append((index, {
+                "employee_id": employee_id,
+                "month_year": month_year,
+                "basic_salary": item["basic_salary"],
+                "allowances": item.get("allowances", 0),
+                "deductions": item.get("deductions", 0),
+                "bonuses": item.get("bonuses", 0),
+                "tax": item.get("tax", 0),
+                "net_salary": self.compute_net_salary(
+                    item["basic_salary"],
+                    item.get("allowances", 0),
+                    item.get("bonuses", 0),
+                    item.get("deductions", 0),
+                    item.get("tax", 0)
+                ),
+                "notes": item.get("notes"),
+                "created_by": created_by,
+                "created_at": now,
+                "updated_at": now
+            }))
+
+        created = 0
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            try:
+                db.execute(insert(SalarySlip), [values for _, values in chunk])
+                # Core inserts bypass the ORM flush hooks that maintain the totals
+                aggregate_service.apply_salary_deltas(db.connection(), {
+                    month_year: (sum(values["net_salary"] for _, values in chunk), len(chunk))
+                })
+                for _, values in chunk:
+                    record_change(db, "salary_slip", None, values["employee_id"], "created")
+                # Queued in the same transaction, so a rolled-back chunk sends nothing
+                email_service.enqueue_many(db, [
+                    email_service.salary_slip_notification(known_employees[values["employee_id"]], month_year)
+                    for _, values in chunk
+                ])
+                db.commit()
+                created += len(chunk)
+            except SQLAlchemyError as exc:
+                db.rollback()
+                message = f"Chunk insert failed: {exc.__class__.__name__}"
+                errors.extend(
+                    {"index": index, "employee_id": values["employee_id"], "error": message}
+                    for index, values in chunk
+                )
+            if progress:
+                progress(start + len(chunk), len(rows))
+
+        elapsed = time.perf_counter() - started
+        errors.sort(key=lambda e: e["index"])
+        return {
+            "month_year": month_year,
+            "requested": len(items),
+            "created": created,
+            "failed": len(errors),
+            "errors": errors,
+            "elapsed_seconds": round(elapsed, 4),
+            "slips_per_second": round(created / elapsed, 1) if elapsed > 0 else float(created)
+        }
+
+    def _existing_employees(self, db: Session, employee_ids) -> Dict[int, str]:
+        """Map each existing employee id to its email."""
+        employee_ids = list(employee_ids)
+        found = {}
+        for start in range(0, len(employee_ids), LOOKUP_CHUNK_SIZE):
+            chunk = employee_ids[start:start + LOOKUP_CHUNK_SIZE]
+            found.update(db.execute(
+                select(User.id, User.email).where(User.id.in_(chunk), User.role == "employee")
+            ).tuples().all())
+        return found
+
+payroll_service = PayrollService()
@@ -1,26 +1,93 @@
-from datetime import datetime
+from typing import Dict, List
+
+PAGE_WIDTH = 595  # A4 in points
+PAGE_HEIGHT = 842
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def _money(value) -> str:
+    return f"${value or 0:,.2f}"
+
+def build_pdf(lines: List[tuple]) -> bytes:
+    """Write a single-page PDF from ``(x, y, font size, bold, text)`` lines.
+
+    Only the standard Helvetica fonts are used, so no font data is embedded
+    and no third-party PDF library is needed.
+    """
+    content = []
+    for x, y, size, bold, text in lines:
+        font = "F2" if bold else "F1"
+        content.append(f"BT /{font} {size} Tf {x} {y} Td ({_escape(text)}) Tj ET")
+    stream = "\n".join(content).encode("latin-1", "replace")
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+         f"/Resources << /Font << /F1 4 0 R /F2 5 0 R >> >> /Contents 6 0 R >>").encode("ascii"),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+        f"<< /Length {len(stream)} >>\nstream\n".encode("ascii") + stream + b"\nendstream",
+    ]
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n".encode("ascii") + body + b"\nendobj\n"
+    xref_offset = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("ascii")
+    for offset in offsets:
+        output += f"{offset:010d} 00000 n \n".encode("ascii")
+    output += (f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+               f"startxref\n{xref_offset}\n%%EOF\n").encode("ascii")
+    return bytes(output)
+
+def render_salary_slip_pdf(context: Dict) -> bytes:
+    """Render the salary slip template; takes plain data so it can run in a worker process."""
+    rows = [
+        ("Basic Salary", context["basic_salary"]),
+        ("Allowances", context["allowances"]),
+        ("Bonuses", context["bonuses"]),
+        ("Deductions", -(context["deductions"] or 0)),
+        ("Tax", -(context["tax"] or 0)),
+    ]
+    lines = [
+        (50, 780, 20, True, "Salary Slip"),
+        (50, 750, 11, False, f"Employee: {context['employee_name']}"),
+        (50, 734, 11, False, f"Employee ID: {context['employee_id']}"),
+        (50, 718, 11, False, f"Month: {context['month_year']}"),
+        (50, 702, 11, False, f"Slip #{context['id']}"),
+    ]
+    y = 660
+    for label, amount in rows:
+        lines.append((50, y, 12, False, label))
+        lines.append((380, y, 12, False, _money(amount)))
+        y -= 22
+    lines.append((50, y - 8, 13, True, "Net Salary"))
+    lines.append((380, y - 8, 13, True, _money(context["net_salary"])))
+    if context.get("notes"):
+        lines.append((50, y - 48, 10, False, f"Notes: {context['notes']}"))
+    return build_pdf(lines)
 
 class PDFGenerator:
-    def generate_salary_slip_pdf(self, salary_slip, employee):
-        """Generate PDF for salary slip (placeholder - install reportlab for production)"""
-        html_content = f"""
-        <html>
-        <head><title>Salary Slip - {salary_slip.month_year}</title></head>
-        <body>
-            <h1>Salary Slip</h1>
-            <p>Employee: {employee.full_name or employee.email}</p>
-            <p>Month: {salary_slip.month_year}</p>
-            <table border="1">
-                <tr><td>Basic Salary</td><td>${salary_slip.basic_salary}</td></tr>
-                <tr><td>Allowances</td><td>${salary_slip.allowances}</td></tr>
-                <tr><td>Bonuses</td><td>${salary_slip.bonuses}</td></tr>
-                <tr><td>Deductions</td><td>${salary_slip.deductions}</td></tr>
-                <tr><td>Tax</td><td>${salary_slip.tax}</td></tr>
-                <tr><td><b>Net Salary</b></td><td><b>${salary_slip.net_salary}</b></td></tr>
-            </table>
-        </body>
-        </html>
-        """
-        return html_content
+    def slip_context(self, salary_slip, employee) -> Dict:
+        return {
+            "id": salary_slip.id,
+            "employee_id": salary_slip.employee_id,
+            "employee_name": employee.full_name or employee.email,
+            "month_year": salary_slip.month_year,
+            "basic_salary": salary_slip.basic_salary,
+            "allowances": salary_slip.allowances,
+            "bonuses": salary_slip.bonuses,
+            "deductions": salary_slip.deductions,
+            "tax": salary_slip.tax,
+            "net_salary": salary_slip.net_salary,
+            "notes": salary_slip.notes,
+        }
+
+    def generate_salary_slip_pdf(self, salary_slip, employee) -> bytes:
+        return render_salary_slip_pdf(self.slip_context(salary_slip, employee))
 
 pdf_generator = PDFGenerator()
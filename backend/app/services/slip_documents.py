@@ -0,0 +1,149 @@
+"""Rendered salary slip PDFs, cached on disk.
+
+A slip's file name contains its id and ``updated_at``, so an edited slip
+simply misses the cache and its old rendering is removed when the new one
+is written. Rendering runs on a dedicated worker pool.
+"""
+import asyncio
+import glob
+import hashlib
+import multiprocessing
+import os
+import threading
+import zipfile
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..models.salary_slip import SalarySlip
+from ..models.user import User
+from .pdf_generator import pdf_generator, render_salary_slip_pdf
+
+class SlipDocumentService:
+    def __init__(self, cache_dir: str, workers: Optional[int] = None, use_processes: bool = True):
+        self.cache_dir = cache_dir
+        self.workers = workers or os.cpu_count() or 1
+        self.use_processes = use_processes
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.use_processes:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pdf")
+            return self._executor
+
+    def load_slip(self, db: Session, slip_id: int) -> Optional[Tuple[SalarySlip, User]]:
+        row = db.execute(
+            select(SalarySlip, User)
+            .join(User, User.id == SalarySlip.employee_id)
+            .where(SalarySlip.id == slip_id)
+        ).first()
+        return tuple(row) if row else None
+
+    def filename(self, slip: SalarySlip) -> str:
+        return f"salary-slip-{slip.month_year}-{slip.id}.pdf"
+
+    def cache_path(self, slip: SalarySlip) -> str:
+        version = int(slip.updated_at.timestamp() * 1_000_000) if slip.updated_at else 0
+        return os.path.join(self.cache_dir, "slips", f"slip-{slip.id}-{version}.pdf")
+
+    def cached(self, slip: SalarySlip) -> Optional[bytes]:
+        try:
+            with open(self.cache_path(slip), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def store(self, slip: SalarySlip, pdf: bytes):
+        path = self.cache_path(slip)
+        _write_atomic(path, pdf)
+        for stale in glob.glob(os.path.join(self.cache_dir, "slips", f"slip-{slip.id}-*.pdf")):
+            if stale != path:
+                _remove_quietly(stale)
+
+    async def pdf_for(self, slip: SalarySlip, employee: User) -> bytes:
+        loop = asyncio.get_running_loop()
+        pdf = await loop.run_in_executor(None, self.cached, slip)
+        if pdf is None:
+            context = pdf_generator.slip_context(slip, employee)
+            pdf = await loop.run_in_executor(self._get_executor(), render_salary_slip_pdf, context)
+            await loop.run_in_executor(None, self.store, slip, pdf)
+        return pdf
+
+    def build_month_archive(self, db: Session, month_year: str) -> Optional[str]:
+        """Write a zip of every slip for ``month_year`` and return its path.
+
+        The archive name is derived from the slips' ids and versions, so an
+        unchanged month is served from disk and only uncached slips are
+        rendered, in parallel on the worker pool.
+        """
+        rows = db.execute(
+            select(SalarySlip, User)
+            .join(User, User.id == SalarySlip.employee_id)
+            .where(SalarySlip.month_year == month_year)
+            .order_by(SalarySlip.employee_id)
+        ).all()
+        if not rows:
+            return None
+
+        digest = hashlib.sha1(
+            ",".join(os.path.basename(self.cache_path(slip)) for slip, _ in rows).encode("utf-8")
+        ).hexdigest()[:16]
+        archive_path = os.path.join(self.cache_dir, "archives", f"salary-slips-{month_year}-{digest}.zip")
+        if os.path.exists(archive_path):
+            return archive_path
+
+        documents = [self.cached(slip) for slip, _ in rows]
+        missing = [index for index, pdf in enumerate(documents) if pdf is None]
+        if missing:
+            contexts = [pdf_generator.slip_context(*rows[index]) for index in missing]
+            chunksize = max(1, len(contexts) // (self.workers * 4))
+            rendered = self._get_executor().map(render_salary_slip_pdf, contexts, chunksize=chunksize)
+            for index, pdf in zip(missing, rendered):
+                self.store(rows[index][0], pdf)
+                documents[index] = pdf
+
+        tmp_path = f"{archive_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        os.makedirs(os.path.dirname(archive_path), exist_ok=True)
+        with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as archive:
+            for (slip, employee), pdf in zip(rows, documents):
+                archive.writestr(f"{month_year}-employee-{employee.id}-slip-{slip.id}.pdf", pdf)
+        os.replace(tmp_path, archive_path)
+
+        pattern = os.path.join(self.cache_dir, "archives", f"salary-slips-{month_year}-*.zip")
+        for stale in glob.glob(pattern):
+            if stale != archive_path:
+                _remove_quietly(stale)
+        return archive_path
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+def _write_atomic(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def _remove_quietly(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+slip_documents = SlipDocumentService(
+    settings.PDF_CACHE_DIR,
+    workers=settings.PDF_RENDER_WORKERS,
+    use_processes=settings.PDF_RENDER_USE_PROCESSES
+)
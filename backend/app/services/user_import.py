@@ -0,0 +1,121 @@
+import csv
+import io
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from ..models.user import User
+from ..schemas.user import EmployeeImportRow
+from ..utils.change_tracking import record_change
+from ..utils.password_hasher import password_hasher
+from .payroll import LOOKUP_CHUNK_SIZE
+
+CSV_COLUMNS = ("email", "password", "full_name", "role")
+
+class UserImportService:
+    def parse_csv(self, content: bytes) -> List[Dict]:
+        """Read ``email,password[,full_name,role]`` rows; blank cells count as missing."""
+        reader = csv.DictReader(io.StringIO(content.decode("utf-8-sig")))
+        missing = {"email", "password"} - set(reader.fieldnames or ())
+        if missing:
+            raise ValueError(f"CSV is missing required columns: {', '.join(sorted(missing))}")
+        return [
+            {name: row[name] for name in CSV_COLUMNS if row.get(name) not in (None, "")}
+            for row in reader
+        ]
+
+    def import_users(
+        self,
+        db: Session,
+        rows: List[Dict],
+        chunk_size: int = 1000,
+        progress: Optional[Callable[[int, int], None]] = None
+    ) -> Dict:
+        """Create users in bulk and report the outcome of every row.
+
+        Duplicates are found with set-based IN lookups, passwords are hashed
+        in parallel on the password hasher pool and rows are written with
+        chunked executemany inserts. A failed chunk is rolled back and its
+        rows reported; the other chunks are still committed.
+        ``progress(done, total)`` is called after each chunk.
+        """
+        started = time.perf_counter()
+        results = [None] * len(rows)
+        valid = []
+        for index, row in enumerate(rows):
+            try:
+                valid.append((index, EmployeeImportRow(**row)))
+            except ValidationError as exc:
+                error = exc.errors()[0]
+                field = ".".join(str(part) for part in error["loc"])
+                results[index] = self._error(index, row.get("email"), f"{field}: {error['msg']}")
+
+        existing = self._existing_emails(db, {user.email for _, user in valid})
+        pending = []
+        seen = set()
+        for index, user in valid:
+            if user.email in existing:
+                results[index] = self._error(index, user.email, "Email already registered")
+            elif user.email in seen:
+                results[index] = self._error(index, user.email, "Duplicate email in import")
+            else:
+                seen.add(user.email)
+                pending.append((index, user))
+
+        now = datetime.utcnow()
+        for start in range(0, len(pending), chunk_size):
+            chunk = pending[start:start + chunk_size]
+            # Only rows that will actually be inserted pay for a bcrypt hash
+            hashes = password_hasher.hash_many([user.password for _, user in chunk])
+            values = [{
+                "email": user.email,
+                "password_hash": password_hash,
+                "full_name": user.full_name,
+                "role": user.role,
+                "created_at": now
+            } for (_, user), password_hash in zip(chunk, hashes)]
+            try:
+                created = db.execute(insert(User).returning(User.id, User.email), values).all()
+                ids = {email: user_id for user_id, email in created}
+                for user_id in ids.values():
+                    record_change(db, "user", user_id, user_id, "created")
+                db.commit()
+            except SQLAlchemyError as exc:
+                db.rollback()
+                message = f"Chunk insert failed: {exc.__class__.__name__}"
+                for index, user in chunk:
+                    results[index] = self._error(index, user.email, message)
+            else:
+                for index, user in chunk:
+                    results[index] = {
+                        "index": index, "email": user.email, "status": "created", "id": ids[user.email]
+                    }
+            if progress:
+                progress(start + len(chunk), len(pending))
+
+        elapsed = time.perf_counter() - started
+        created_count = sum(1 for result in results if result["status"] == "created")
+        return {
+            "requested": len(rows),
+            "created": created_count,
+            "failed": len(rows) - created_count,
+            "results": results,
+            "elapsed_seconds": round(elapsed, 4),
+            "users_per_second": round(created_count / elapsed, 1) if elapsed > 0 else float(created_count)
+        }
+
+    def _error(self, index: int, email, message: str) -> Dict:
+        return {"index": index, "email": email, "status": "error", "error": message}
+
+    def _existing_emails(self, db: Session, emails) -> set:
+        emails = list(emails)
+        found = set()
+        for start in range(0, len(emails), LOOKUP_CHUNK_SIZE):
+            chunk = emails[start:start + LOOKUP_CHUNK_SIZE]
+            found.update(db.execute(select(User.email).where(User.email.in_(chunk))).scalars().all())
+        return found
+
+user_import_service = UserImportService()
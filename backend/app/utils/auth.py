@@ -3,14 +3,18 @@ from jose import JWTError, jwt
 import bcrypt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from ..config import settings
 from ..models.user import User
+from .user_cache import user_cache
+from .database import get_async_db
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)).decode('utf-8')
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
@@ -30,36 +34,96 @@ def decode_token(token: str):
     except JWTError:
         return None
 
-def get_current_user(token: str = Depends(oauth2_scheme)):
-    from ..utils.database import SessionLocal
-    credentials_exception = HTTPException(
+def _credentials_exception():
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def _decode_claims(token: str):
     payload = decode_token(token)
     if payload is None:
-        raise credentials_exception
+        raise _credentials_exception()
     
     user_id_str = payload.get("sub")
     if user_id_str is None:
-        raise credentials_exception
+        raise _credentials_exception()
     
     try:
         user_id = int(user_id_str)
     except (ValueError, TypeError):
-        raise credentials_exception
-    
+        raise _credentials_exception()
+    return user_id, payload
+
+def get_current_user_record(token: str = Depends(oauth2_scheme)):
+    """Resolve the full user row, served from the user cache when possible."""
+    from ..utils.database import SessionLocal
+    user_id, _ = _decode_claims(token)
+
+    user = user_cache.get(user_id)
+    if user is not None:
+        return user
+
     db = SessionLocal()
     try:
         user = db.query(User).filter(User.id == user_id).first()
         if user is None:
-            raise credentials_exception
+            raise _credentials_exception()
+        user_cache.set(user_id, user)
         return user
     finally:
         db.close()
 
+def get_current_user(token: str = Depends(oauth2_scheme)):
+    """Authorize a request.
+
+    With ``AUTH_TRUST_TOKEN_CLAIMS`` enabled the user is built from the
+    verified ``sub`` and ``role`` claims without touching the database;
+    role changes and deletions then take effect when the token expires.
+    """
+    if settings.AUTH_TRUST_TOKEN_CLAIMS:
+        user_id, payload = _decode_claims(token)
+        role = payload.get("role")
+        if role:
+            return User(id=user_id, role=role)
+    return get_current_user_record(token)
+
 def require_admin(current_user: User = Depends(get_current_user)):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
     return current_user
+
+async def get_current_user_record_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+):
+    user_id, _ = _decode_claims(token)
+
+    user = user_cache.get(user_id)
+    if user is not None:
+        return user
+
+    user = (await db.execute(select(User).where(User.id == user_id))).scalar_one_or_none()
+    if user is None:
+        raise _credentials_exception()
+    # Detach it so a rollback in this request's session cannot expire the cached copy
+    db.expunge(user)
+    user_cache.set(user_id, user)
+    return user
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if settings.AUTH_TRUST_TOKEN_CLAIMS:
+        user_id, payload = _decode_claims(token)
+        role = payload.get("role")
+        if role:
+            return User(id=user_id, role=role)
+    return await get_current_user_record_async(token, db)
+
+async def require_admin_async(current_user: User = Depends(get_current_user_async)):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return current_user
@@ -0,0 +1,148 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+from ..config import settings
+
+# Invalidation counters outlive any cached value by a wide margin
+GENERATION_TTL_SECONDS = 24 * 3600
+
+class LocalCacheBackend:
+    """In-process LRU with per-entry TTL. Also the stand-in for a shared
+    backend when no ``CACHE_URL`` is configured."""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._generations = OrderedDict()
+        self._lock = threading.Lock()
+
+    def generation(self, key: str) -> int:
+        with self._lock:
+            return self._generations.get(key, 0)
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl_seconds: float, generation: Optional[int] = None):
+        with self._lock:
+            if generation is not None and generation != self._generations.get(key, 0):
+                return
+            self._entries[key] = (time.monotonic() + ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys: str):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+                self._generations[key] = self._generations.get(key, 0) + 1
+                self._generations.move_to_end(key)
+            # A forgotten counter restarts at 0, which still differs from any in-flight read after a bump
+            while len(self._generations) > self.max_entries:
+                self._generations.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+class RedisCacheBackend:
+    """Shared backend for multi-worker deployments; values are stored as JSON.
+
+    Each value is stored with the key's generation at the time it was
+    computed. An invalidation from any worker bumps the generation, so a
+    value computed before it is ignored on read even if it was written after.
+    """
+
+    def __init__(self, client, prefix: str = "payroll:cache:"):
+        self.client = client
+        self.prefix = prefix
+
+    def _generation_key(self, key: str) -> str:
+        return f"{self.prefix}generation:{key}"
+
+    def generation(self, key: str) -> int:
+        return int(self.client.get(self._generation_key(key)) or 0)
+
+    def get(self, key: str) -> Optional[Any]:
+        raw, generation = self.client.mget(self.prefix + key, self._generation_key(key))
+        if raw is None:
+            return None
+        entry = json.loads(raw)
+        if entry["generation"] != int(generation or 0):
+            return None
+        return entry["value"]
+
+    def set(self, key: str, value: Any, ttl_seconds: float, generation: Optional[int] = None):
+        if generation is None:
+            generation = self.generation(key)
+        self.client.set(
+            self.prefix + key, json.dumps({"generation": generation, "value": value}), px=int(ttl_seconds * 1000)
+        )
+
+    def delete(self, *keys: str):
+        if keys:
+            self.client.delete(*(self.prefix + key for key in keys))
+        for key in keys:
+            self.client.incr(self._generation_key(key))
+            self.client.expire(self._generation_key(key), GENERATION_TTL_SECONDS)
+
+    def clear(self):
+        for key in self.client.scan_iter(self.prefix + "*"):
+            self.client.delete(key)
+
+class ResponseCache:
+    def __init__(self, backend, default_ttl_seconds: float = 30):
+        self.backend = backend
+        self.default_ttl_seconds = default_ttl_seconds
+
+    def get(self, key: str) -> Optional[Any]:
+        return self.backend.get(key)
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None, generation: Optional[int] = None):
+        """Cache ``value``; with ``generation``, only if ``key`` was not invalidated since it was read."""
+        self.backend.set(key, value, ttl_seconds or self.default_ttl_seconds, generation)
+
+    def get_or_set(self, key: str, factory: Callable[[], Any], ttl_seconds: Optional[float] = None):
+        value = self.backend.get(key)
+        if value is None:
+            # A commit invalidating the key while factory runs makes its result stale
+            generation = self.backend.generation(key)
+            value = factory()
+            self.set(key, value, ttl_seconds, generation)
+        return value
+
+    async def get_or_set_async(
+        self, key: str, factory: Callable[[], Awaitable[Any]], ttl_seconds: Optional[float] = None
+    ):
+        value = self.backend.get(key)
+        if value is None:
+            generation = self.backend.generation(key)
+            value = await factory()
+            self.set(key, value, ttl_seconds, generation)
+        return value
+
+    def invalidate(self, *keys: str):
+        self.backend.delete(*keys)
+
+def create_backend():
+    if settings.CACHE_URL:
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CACHE_URL is set but the 'redis' package is not installed")
+        return RedisCacheBackend(redis.Redis.from_url(settings.CACHE_URL))
+    return LocalCacheBackend(settings.CACHE_MAX_ENTRIES)
+
+response_cache = ResponseCache(create_backend(), settings.CACHE_DEFAULT_TTL_SECONDS)
@@ -0,0 +1,63 @@
+"""Commit-time notifications about changed users, salary slips and expenses.
+
+ORM writes are recorded automatically at flush; bulk Core statements call
+``record_change`` themselves. Subscribers registered with ``on_commit``
+receive the list of changes once the transaction has committed, and
+nothing if it rolls back.
+"""
+import logging
+from typing import Callable, List, NamedTuple, Optional
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from ..models.user import User
+from ..models.salary_slip import SalarySlip
+from ..models.expense import Expense
+
+logger = logging.getLogger(__name__)
+
+class Change(NamedTuple):
+    entity: str
+    entity_id: Optional[int]
+    employee_id: Optional[int]
+    action: str
+
+ENTITY_NAMES = {User: "user", SalarySlip: "salary_slip", Expense: "expense"}
+
+_subscribers: List[Callable[[List[Change]], None]] = []
+
+def on_commit(callback: Callable[[List[Change]], None]):
+    _subscribers.append(callback)
+    return callback
+
+def record_change(session: Session, entity: str, entity_id: Optional[int],
+                  employee_id: Optional[int], action: str):
+    session.info.setdefault("changes", []).append(Change(entity, entity_id, employee_id, action))
+
+def _employee_id(obj):
+    return obj.id if isinstance(obj, User) else obj.employee_id
+
+@event.listens_for(Session, "after_flush")
+def _record_flushed_changes(session, flush_context):
+    for objects, action in ((session.new, "created"), (session.dirty, "updated"), (session.deleted, "deleted")):
+        for obj in objects:
+            entity = ENTITY_NAMES.get(type(obj))
+            if entity is None or (action == "updated" and not session.is_modified(obj)):
+                continue
+            record_change(session, entity, obj.id, _employee_id(obj), action)
+
+@event.listens_for(Session, "after_commit")
+def _publish_changes(session):
+    changes = session.info.pop("changes", None)
+    if not changes:
+        return
+    for callback in _subscribers:
+        try:
+            callback(changes)
+        except Exception:
+            # The data is already committed; a failing subscriber must not
+            # turn a successful write into an error response
+            logger.exception("Change subscriber %r failed", callback)
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_changes(session, previous_transaction):
+    session.info.pop("changes", None)
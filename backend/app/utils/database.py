@@ -1,15 +1,200 @@
-from sqlalchemy import create_engine
+import threading
+import time
+from typing import Optional
+from fastapi import Request
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from ..config import settings
 
-# PostgreSQL doesn't need check_same_thread
-connect_args = {"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
-engine = create_engine(settings.DATABASE_URL, connect_args=connect_args)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SYNC_DRIVERS = {
+    "sqlite+aiosqlite": "sqlite",
+    "postgresql+asyncpg": "postgresql",
+}
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
 
-def get_db():
+def sync_database_url(url: str) -> str:
+    scheme, sep, rest = url.partition("://")
+    return SYNC_DRIVERS.get(scheme, scheme) + sep + rest
+
+def async_database_url(url: str) -> str:
+    scheme, sep, rest = url.partition("://")
+    if scheme not in SYNC_DRIVERS:
+        scheme = ASYNC_DRIVERS.get(scheme.split("+")[0], scheme)
+    return scheme + sep + rest
+
+class PoolStats:
+    """Checkout wait-time counters for a connection pool."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self._lock = threading.Lock()
+
+    def record_wait(self, seconds: float):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+class TimedPoolMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record_timeout()
+            raise
+        finally:
+            self.stats.record_wait(time.perf_counter() - started)
+
+class TimedQueuePool(TimedPoolMixin, QueuePool):
+    pass
+
+class TimedAsyncQueuePool(TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+def _is_sqlite_memory(url: str) -> bool:
+    return _is_sqlite(url) and (url.partition("://")[2] in ("", "/") or ":memory:" in url)
+
+def engine_options(url: str, poolclass) -> dict:
+    options = {}
+    if _is_sqlite(url):
+        # PostgreSQL doesn't need check_same_thread
+        options["connect_args"] = {"check_same_thread": False}
+    if not _is_sqlite_memory(url):
+        options.update(
+            poolclass=poolclass,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING
+        )
+    return options
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        if settings.SQLITE_WAL:
+            # WAL lets readers proceed while an expense is being written
+            cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        # A negative cache_size is measured in KiB rather than pages
+        cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    finally:
+        cursor.close()
+
+def create_configured_engine(url: str):
+    url = sync_database_url(url)
+    configured = create_engine(url, **engine_options(url, TimedQueuePool))
+    if _is_sqlite(url):
+        event.listen(configured, "connect", apply_sqlite_pragmas)
+    return configured
+
+def create_configured_async_engine(url: str):
+    url = async_database_url(url)
+    configured = create_async_engine(url, **engine_options(url, TimedAsyncQueuePool))
+    if _is_sqlite(url):
+        event.listen(configured.sync_engine, "connect", apply_sqlite_pragmas)
+    return configured
+
+def pool_status(target) -> dict:
+    pool = getattr(target, "sync_engine", target).pool
+    status = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        status.update(
+            size=pool.size(),
+            max_overflow=pool._max_overflow,
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+            utilization=round(pool.checkedout() / capacity, 3) if capacity else None
+        )
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        status.update(
+            checkouts=stats.checkouts,
+            timeouts=stats.timeouts,
+            wait_ms_avg=round(stats.wait_seconds_total * 1000 / stats.checkouts, 3) if stats.checkouts else 0.0,
+            wait_ms_max=round(stats.wait_seconds_max * 1000, 3)
+        )
+    return status
+
+class LazySessionmaker(sessionmaker):
+    """Creates the engine when the first session is opened, not at import."""
+
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None and "bind" not in local_kw:
+            get_engine()
+        return super().__call__(**local_kw)
+
+_engine = None
+_engine_lock = threading.Lock()
+SessionLocal = LazySessionmaker(autocommit=False, autoflush=False)
+
+def get_engine():
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_configured_engine(settings.DATABASE_URL)
+                SessionLocal.configure(bind=_engine)
+    return _engine
+
+def __getattr__(name):
+    # Keeps ``from app.utils.database import engine`` working without an import-time engine
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Created on first use so deployments without an async driver never need one
+_async_engine = None
+AsyncSessionLocal = async_sessionmaker(class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+def get_async_engine():
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_configured_async_engine(settings.DATABASE_URL)
+        AsyncSessionLocal.configure(bind=_async_engine)
+    return _async_engine
+
+# Session.info key: who is writing, so replica routing can keep their reads on the primary
+STICKY_KEY = "sticky_key"
+
+def sticky_key(request: Request) -> Optional[str]:
+    return request.headers.get("authorization")
+
+def get_db(request: Request):
     db = SessionLocal()
+    db.info[STICKY_KEY] = sticky_key(request)
     try:
         yield db
     finally:
         db.close()
+
+async def get_async_db(request: Request):
+    get_async_engine()
+    async with AsyncSessionLocal() as db:
+        db.info[STICKY_KEY] = sticky_key(request)
+        yield db
@@ -0,0 +1,167 @@
+"""In-process request and database metrics in the Prometheus text format.
+
+Latencies are recorded into fixed-bucket histograms, so memory does not
+grow with traffic and quantiles can be estimated from bucket counts.
+Database statements are timed through engine events and attributed to the
+current request via a context variable.
+"""
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile by linear interpolation inside its bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.buckets[index - 1] if index else 0.0
+                if index == len(self.buckets):
+                    return lower
+                return lower + (self.buckets[index] - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-1]
+
+class RequestStats:
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+_current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request_stats", default=None)
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _current_request.get()
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.requests: Dict[Tuple[str, str, str], int] = {}
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.db_seconds: Dict[Tuple[str, str], float] = {}
+        self.queries: Dict[Tuple[str, str], Histogram] = {}
+        self.query_latency = Histogram()
+
+    def start_request(self) -> RequestStats:
+        stats = RequestStats()
+        _current_request.set(stats)
+        with self._lock:
+            self.in_flight += 1
+        return stats
+
+    def finish_request(self, method: str, route: str, status_code: int, seconds: float, stats: RequestStats):
+        key = (method, route)
+        with self._lock:
+            self.in_flight -= 1
+            status_key = (method, route, str(status_code))
+            self.requests[status_key] = self.requests.get(status_key, 0) + 1
+            if key not in self.latency:
+                self.latency[key] = Histogram()
+                self.queries[key] = Histogram(QUERY_COUNT_BUCKETS)
+                self.db_seconds[key] = 0.0
+            self.latency[key].observe(seconds)
+            self.queries[key].observe(stats.queries)
+            self.db_seconds[key] += stats.db_seconds
+
+    def record_query(self, seconds: float):
+        stats = _current_request.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += seconds
+        with self._lock:
+            self.query_latency.observe(seconds)
+
+    def summary(self) -> List[Dict]:
+        """Per-route p50/p99 latency and average DB work, slowest p99 first."""
+        with self._lock:
+            rows = [{
+                "method": method,
+                "route": route,
+                "count": histogram.count,
+                "p50_ms": round(histogram.quantile(0.5) * 1000, 2),
+                "p99_ms": round(histogram.quantile(0.99) * 1000, 2),
+                "avg_queries": round(self.queries[(method, route)].sum / histogram.count, 2),
+                "avg_db_ms": round(self.db_seconds[(method, route)] / histogram.count * 1000, 2)
+            } for (method, route), histogram in self.latency.items() if histogram.count]
+        return sorted(rows, key=lambda row: row["p99_ms"], reverse=True)
+
+    def render(self) -> str:
+        lines = [
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+            "# TYPE http_requests_total counter"
+        ]
+        with self._lock:
+            for (method, route, status), count in sorted(self.requests.items()):
+                lines.append(f'http_requests_total{{method="{method}",route="{route}",status="{status}"}} {count}')
+            lines.append("# TYPE http_request_duration_seconds histogram")
+            for (method, route), histogram in sorted(self.latency.items()):
+                lines.extend(_histogram_lines("http_request_duration_seconds", histogram, method, route))
+            lines.append("# TYPE http_request_db_queries histogram")
+            for (method, route), histogram in sorted(self.queries.items()):
+                lines.extend(_histogram_lines("http_request_db_queries", histogram, method, route))
+            lines.append("# TYPE http_request_db_seconds_total counter")
+            for (method, route), seconds in sorted(self.db_seconds.items()):
+                lines.append(f'http_request_db_seconds_total{{method="{method}",route="{route}"}} {seconds:.6f}')
+            lines.append("# TYPE db_query_duration_seconds histogram")
+            lines.extend(_histogram_lines("db_query_duration_seconds", self.query_latency))
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self.requests.clear()
+            self.latency.clear()
+            self.db_seconds.clear()
+            self.queries.clear()
+            self.query_latency = Histogram()
+
+def _histogram_lines(name: str, histogram: Histogram, method: str = None, route: str = None) -> List[str]:
+    labels = f'method="{method}",route="{route}",' if method else ""
+    lines = []
+    cumulative = 0
+    for bound, bucket_count in zip(histogram.buckets, histogram.counts):
+        cumulative += bucket_count
+        lines.append(f'{name}_bucket{{{labels}le="{bound}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{{labels}le="+Inf"}} {histogram.count}')
+    suffix = f"{{{labels.rstrip(',')}}}" if labels else ""
+    lines.append(f"{name}_sum{suffix} {histogram.sum:.6f}")
+    lines.append(f"{name}_count{suffix} {histogram.count}")
+    return lines
+
+metrics = MetricsRegistry()
+
+# Registered on the Engine class so every engine (sync, the async engine's
+# sync core, replicas) is measured without wiring each one up
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_started = time.perf_counter()
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_metrics_started", None)
+    if started is not None:
+        metrics.record_query(time.perf_counter() - started)
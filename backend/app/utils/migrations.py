@@ -0,0 +1,149 @@
+"""Schema management for existing databases.
+
+``Base.metadata.create_all`` only creates missing tables; it never touches
+tables that already exist. Changes to existing tables are applied here as
+numbered migrations recorded in ``schema_migrations``. A brand-new database
+is created from the models and stamped with every version.
+
+Run manually with ``python -m app.utils.migrations``.
+"""
+import logging
+from typing import Callable, List, NamedTuple
+from sqlalchemy import DateTime, Integer, func, inspect, select, text, update
+from sqlalchemy.engine import Connection, Engine
+from ..models.user import Base
+from ..models.salary_slip import SalarySlip
+from ..models.expense import Expense
+from ..models.schema_migration import SchemaMigration
+from ..models import aggregates  # noqa: F401 - registers the summary tables
+from ..models.outbox import OutboxMessage  # noqa: F401 - registers the table
+from ..models.job import Job  # noqa: F401 - registers the table
+from ..models.approval_rule import ApprovalRule  # noqa: F401 - registers the table
+from ..services.aggregates import aggregate_service
+
+logger = logging.getLogger(__name__)
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    upgrade: Callable[[Connection], None]
+
+def _create_index(conn: Connection, name: str, table: str, columns, unique: bool = False):
+    conn.execute(text(
+        f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"
+    ))
+
+# The model indexes as of version 1. Frozen: an index added to a model later
+# is created by the migration that introduces it, after any columns it needs.
+VERSION_1_INDEXES = (
+    ("ix_users_role_created_at", "users", ("role", "created_at", "id"), False),
+    ("uq_salary_slips_employee_id_month_year", "salary_slips", ("employee_id", "month_year"), True),
+    ("ix_salary_slips_month_year", "salary_slips", ("month_year",), False),
+    ("ix_salary_slips_employee_id_created_at", "salary_slips", ("employee_id", "created_at", "id"), False),
+    ("ix_salary_slips_created_at", "salary_slips", ("created_at", "id"), False),
+    ("ix_expenses_employee_id_status", "expenses", ("employee_id", "status"), False),
+    ("ix_expenses_employee_id_created_at", "expenses", ("employee_id", "created_at", "id"), False),
+    ("ix_expenses_status_created_at", "expenses", ("status", "created_at", "id"), False),
+    ("ix_expenses_created_at", "expenses", ("created_at", "id"), False),
+)
+
+def _create_missing_indexes(conn: Connection):
+    duplicates = conn.execute(
+        select(SalarySlip.employee_id, SalarySlip.month_year)
+        .group_by(SalarySlip.employee_id, SalarySlip.month_year)
+        .having(func.count() > 1)
+        .limit(5)
+    ).all()
+    if duplicates:
+        raise RuntimeError(
+            "Cannot create unique index on salary_slips (employee_id, month_year); "
+            f"remove duplicate slips first, e.g. {[tuple(row) for row in duplicates]}"
+        )
+
+    for name, table, columns, unique in VERSION_1_INDEXES:
+        _create_index(conn, name, table, columns, unique)
+
+def _backfill_aggregates(conn: Connection):
+    aggregate_service.rebuild(conn)
+
+MONEY_COLUMNS = {
+    "salary_slips": ("basic_salary", "allowances", "deductions", "bonuses", "tax", "net_salary"),
+    "expenses": ("amount",),
+}
+
+def _money_to_cents(conn: Connection):
+    """Convert float dollar amounts to integer cents.
+
+    PostgreSQL changes the column types; SQLite cannot alter a column type
+    in place, so the values are rewritten as whole cents and the ``Money``
+    type rounds them on the way out. The summary tables are rebuilt from
+    the converted rows rather than converted themselves.
+
+    Databases built straight from the models with ``create_all`` (seed
+    scripts, benchmarks) already store cents in INTEGER columns without
+    any migration stamps; those tables are left alone.
+    """
+    inspector = inspect(conn)
+    for table, columns in MONEY_COLUMNS.items():
+        types = {column["name"]: column["type"] for column in inspector.get_columns(table)}
+        if all(isinstance(types[column], Integer) for column in columns):
+            continue
+        if conn.dialect.name == "postgresql":
+            conn.execute(text(f"ALTER TABLE {table} " + ", ".join(
+                f"ALTER COLUMN {column} TYPE BIGINT USING ROUND({column} * 100)::BIGINT"
+                for column in columns
+            )))
+        else:
+            conn.execute(text(f"UPDATE {table} SET " + ", ".join(
+                f"{column} = CAST(ROUND({column} * 100) AS INTEGER)" for column in columns
+            )))
+    if conn.dialect.name == "postgresql":
+        for table, column in (("monthly_salary_totals", "total_net_salary"), ("expense_totals", "total_amount")):
+            column_type = next(c["type"] for c in inspector.get_columns(table) if c["name"] == column)
+            if not isinstance(column_type, Integer):
+                conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE BIGINT USING 0"))
+    aggregate_service.rebuild(conn)
+
+def _track_updated_at(conn: Connection):
+    """Give expenses an ``updated_at`` and index both tables on it for the change feed."""
+    if "updated_at" not in {column["name"] for column in inspect(conn).get_columns("expenses")}:
+        conn.execute(text(f"ALTER TABLE expenses ADD COLUMN updated_at {DateTime().compile(dialect=conn.dialect)}"))
+    conn.execute(
+        update(Expense).where(Expense.updated_at.is_(None))
+        .values(updated_at=func.coalesce(Expense.reviewed_at, Expense.created_at))
+    )
+    conn.execute(
+        update(SalarySlip).where(SalarySlip.updated_at.is_(None)).values(updated_at=SalarySlip.created_at)
+    )
+    _create_index(conn, "ix_expenses_updated_at", "expenses", ("updated_at", "id"))
+    _create_index(conn, "ix_salary_slips_updated_at", "salary_slips", ("updated_at", "id"))
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "composite indexes for hot query paths", _create_missing_indexes),
+    Migration(2, "backfill analytics summary tables", _backfill_aggregates),
+    Migration(3, "store money as integer cents", _money_to_cents),
+    Migration(4, "backfill expense totals by month", _backfill_aggregates),
+    Migration(5, "track expense updated_at for the change feed", _track_updated_at),
+]
+
+def run_migrations(engine: Engine):
+    fresh = not inspect(engine).has_table("users")
+    Base.metadata.create_all(bind=engine)
+
+    with engine.begin() as conn:
+        applied = set(conn.execute(select(SchemaMigration.version)).scalars().all())
+        for migration in MIGRATIONS:
+            if migration.version in applied:
+                continue
+            if not fresh:
+                logger.info("Applying migration %s: %s", migration.version, migration.name)
+                migration.upgrade(conn)
+            conn.execute(SchemaMigration.__table__.insert().values(
+                version=migration.version, name=migration.name
+            ))
+
+if __name__ == "__main__":
+    from .database import engine
+
+    logging.basicConfig(level=logging.INFO)
+    run_migrations(engine)
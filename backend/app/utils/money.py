@@ -0,0 +1,50 @@
+"""Fixed-point money.
+
+Amounts are stored as integer cents in ``Money`` columns and surface in
+Python as ``Decimal`` with two places, so sums in SQL and in Python are
+exact. The API keeps exchanging plain JSON numbers; inputs are rounded
+half-up to the cent.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Optional
+from sqlalchemy import BigInteger, Numeric
+from sqlalchemy.sql import operators
+from sqlalchemy.types import TypeDecorator
+
+CENT = Decimal("0.01")
+
+def to_cents(value) -> Optional[int]:
+    if value is None:
+        return None
+    if isinstance(value, int):
+        return value * 100
+    # str() gives the shortest repr of a float, so 0.1 + 0.2 becomes 30 cents
+    amount = value if isinstance(value, Decimal) else Decimal(str(value))
+    return int(amount.quantize(CENT, rounding=ROUND_HALF_UP).scaleb(2))
+
+def from_cents(cents) -> Optional[Decimal]:
+    if cents is None:
+        return None
+    # Columns migrated in place on SQLite keep REAL affinity and return floats
+    return Decimal(int(round(cents))).scaleb(-2)
+
+def money(value) -> Optional[Decimal]:
+    """Round any number to a two-place ``Decimal``."""
+    return from_cents(to_cents(value))
+
+class Money(TypeDecorator):
+    """Integer cents in the database, ``Decimal`` in Python."""
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return to_cents(value)
+
+    def process_result_value(self, value, dialect):
+        return from_cents(value)
+
+    def coerce_compared_value(self, op, value):
+        # Scaling factors are plain numbers; binding them as Money would multiply them by 100
+        if op in (operators.mul, operators.truediv, operators.floordiv, operators.mod):
+            return Numeric()
+        return self
@@ -0,0 +1,73 @@
+import base64
+from datetime import datetime
+from typing import Optional, Tuple
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import and_, or_
+from ..config import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+class PageParams:
+    """Query parameters shared by every keyset-paginated list endpoint."""
+
+    def __init__(
+        self,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = Query(None, ge=1, le=settings.MAX_PAGE_SIZE),
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None
+    ):
+        # Callers that send neither limit nor cursor keep getting the whole list
+        if limit is None and cursor:
+            limit = settings.DEFAULT_PAGE_SIZE
+        self.cursor = cursor
+        self.limit = limit
+        self.created_from = created_from
+        self.created_to = created_to
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(token: str) -> Tuple[datetime, int]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        created_at, row_id = base64.urlsafe_b64decode(padded).decode("utf-8").split("|")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def keyset_statement(statement, model, page: PageParams):
+    """Apply the created_at range, cursor and ordering of ``page``.
+
+    Works on both ``Query`` and 2.0-style ``select()`` statements. The
+    cursor encodes the last row of the previous page, so every page is a
+    bounded index range scan instead of an OFFSET over skipped rows.
+    """
+    if page.created_from is not None:
+        statement = statement.filter(model.created_at >= page.created_from)
+    if page.created_to is not None:
+        statement = statement.filter(model.created_at <= page.created_to)
+    if page.cursor:
+        created_at, row_id = decode_cursor(page.cursor)
+        statement = statement.filter(or_(
+            model.created_at < created_at,
+            and_(model.created_at == created_at, model.id < row_id)
+        ))
+    statement = statement.order_by(model.created_at.desc(), model.id.desc())
+    if page.limit is None:
+        return statement
+    return statement.limit(page.limit + 1)
+
+def page_rows(rows, page: PageParams, response: Response):
+    """Trim the look-ahead row and expose the next cursor in ``X-Next-Cursor``."""
+    rows = list(rows)
+    if page.limit is not None and len(rows) > page.limit:
+        rows = rows[:page.limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
+    return rows
+
+def paginate(query, model, page: PageParams, response: Response):
+    """Return one page of ``query`` ordered newest first on (created_at, id)."""
+    return page_rows(keyset_statement(query, model, page).all(), page, response)
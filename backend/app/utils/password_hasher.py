@@ -0,0 +1,115 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional
+import bcrypt
+from ..config import settings
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many hash/verify operations are already queued."""
+
+def _hash(password: str, rounds: int) -> str:
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=rounds)).decode('utf-8')
+
+def _verify(password: str, hashed_password: str) -> bool:
+    return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+class PasswordHasher:
+    """Runs bcrypt on a dedicated, size-limited worker pool.
+
+    Hashing never occupies the request threadpool, and at most
+    ``max_pending`` operations may be queued or running; beyond that
+    callers get ``PasswordHasherBusy`` immediately instead of piling up.
+    Bulk hashing runs on a separate pool of ``bulk_workers``, so an import
+    never queues work ahead of logins and signups.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_pending: int = 64,
+                 rounds: int = 12, use_processes: bool = True, bulk_workers: Optional[int] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.bulk_workers = bulk_workers or max(1, self.workers // 2)
+        self.max_pending = max_pending
+        self.rounds = rounds
+        self.use_processes = use_processes
+        self._executor: Optional[Executor] = None
+        self._bulk_executor: Optional[Executor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _new_executor(self, workers: int, name: str) -> Executor:
+        if self.use_processes:
+            # spawn: forking a process that holds DB connections and threads is unsafe
+            return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        # bcrypt releases the GIL, so threads also use multiple cores
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._new_executor(self.workers, "bcrypt")
+            return self._executor
+
+    def _get_bulk_executor(self) -> Executor:
+        with self._lock:
+            if self._bulk_executor is None:
+                self._bulk_executor = self._new_executor(self.bulk_workers, "bcrypt-bulk")
+            return self._bulk_executor
+
+    def _admit(self, count: int = 1):
+        with self._lock:
+            if self._pending + count > self.max_pending:
+                raise PasswordHasherBusy()
+            self._pending += count
+
+    def _release(self, count: int = 1):
+        with self._lock:
+            self._pending -= count
+
+    async def _run(self, fn, *args):
+        self._admit()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self._release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash, password, self.rounds)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(_verify, password, hashed_password)
+
+    def hash_many(self, passwords: List[str]) -> List[str]:
+        """Hash a batch in parallel on the bulk pool, blocking the caller.
+
+        Bulk work bypasses admission control; it is bounded by the bulk pool
+        size and never delays ``hash``/``verify``.
+        """
+        if not passwords:
+            return []
+        chunksize = max(1, len(passwords) // (self.bulk_workers * 4))
+        return list(self._get_bulk_executor().map(
+            _hash, passwords, [self.rounds] * len(passwords), chunksize=chunksize
+        ))
+
+    def shutdown(self):
+        with self._lock:
+            executors = (self._executor, self._bulk_executor)
+            self._executor = self._bulk_executor = None
+        for executor in executors:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    rounds=settings.BCRYPT_ROUNDS,
+    use_processes=settings.PASSWORD_HASH_USE_PROCESSES,
+    bulk_workers=settings.PASSWORD_HASH_BULK_WORKERS
+)
@@ -0,0 +1,132 @@
+"""Query-count and slow-statement budgets.
+
+``QueryBudget`` is a context manager and decorator for tests: every
+statement issued anywhere in the process while it is active is counted,
+which also covers requests served by ``TestClient`` on its own thread. On
+exit it raises ``QueryBudgetExceeded`` listing the offending statements.
+
+``QueryBudgetMiddleware`` applies a per-request budget in development
+(``QUERY_BUDGET_ENABLED``) and logs violations with the route and SQL.
+"""
+import functools
+import logging
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+class QueryBudget:
+    def __init__(self, max_queries: Optional[int] = None, slow_query_ms: Optional[float] = None,
+                 label: Optional[str] = None):
+        self.max_queries = max_queries
+        self.slow_query_ms = slow_query_ms
+        self.label = label
+        self.statements: List[str] = []
+        self.slow: List[Tuple[float, str]] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def record(self, statement: str, elapsed_ms: float):
+        self.statements.append(statement)
+        if self.slow_query_ms is not None and elapsed_ms > self.slow_query_ms:
+            self.slow.append((elapsed_ms, statement))
+
+    def violations(self) -> List[str]:
+        problems = []
+        if self.max_queries is not None and self.count > self.max_queries:
+            repeated = "\n".join(
+                f"  {times}x {_shorten(statement)}"
+                for statement, times in Counter(self.statements).most_common(5)
+            )
+            problems.append(
+                f"{self.label or 'block'} issued {self.count} queries, budget is {self.max_queries}; "
+                f"most frequent:\n{repeated}"
+            )
+        for elapsed_ms, statement in self.slow:
+            problems.append(
+                f"{self.label or 'block'} ran a {elapsed_ms:.1f}ms statement "
+                f"(threshold {self.slow_query_ms}ms): {_shorten(statement)}"
+            )
+        return problems
+
+    def __enter__(self):
+        self.statements, self.slow = [], []
+        with _lock:
+            _global_budgets.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        with _lock:
+            _global_budgets.remove(self)
+        problems = self.violations()
+        if problems and exc_type is None:
+            raise QueryBudgetExceeded("\n".join(problems))
+        return False
+
+    def __call__(self, fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with QueryBudget(self.max_queries, self.slow_query_ms, self.label or fn.__name__):
+                return fn(*args, **kwargs)
+        return wrapper
+
+_lock = threading.Lock()
+_global_budgets: List[QueryBudget] = []
+_request_budget: ContextVar[Optional[QueryBudget]] = ContextVar("request_query_budget", default=None)
+
+def _shorten(statement: str, limit: int = 300) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= limit else statement[:limit] + "..."
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_budget_timer(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and (_global_budgets or _request_budget.get() is not None):
+        context._budget_started = time.perf_counter()
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_budget_statement(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_budget_started", None)
+    if started is None:
+        return
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    request_budget = _request_budget.get()
+    if request_budget is not None:
+        request_budget.record(statement, elapsed_ms)
+    with _lock:
+        budgets = list(_global_budgets)
+    for budget in budgets:
+        budget.record(statement, elapsed_ms)
+
+class QueryBudgetMiddleware:
+    """Development middleware logging requests that exceed the query budget."""
+
+    def __init__(self, app, max_queries: int = 20, slow_query_ms: float = 100):
+        self.app = app
+        self.max_queries = max_queries
+        self.slow_query_ms = slow_query_ms
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        budget = QueryBudget(self.max_queries, self.slow_query_ms)
+        token = _request_budget.set(budget)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_budget.reset(token)
+            route = getattr(scope.get("route"), "path", scope["path"])
+            budget.label = f"{scope['method']} {route}"
+            for problem in budget.violations():
+                logger.warning("Query budget exceeded: %s", problem)
@@ -0,0 +1,203 @@
+"""Routes read-only endpoints to read replicas.
+
+Sessions from ``get_read_db``/``get_async_read_db`` go to the configured
+``DATABASE_REPLICA_URLS`` in rotation and fall back to the primary when
+none is healthy. A replica that fails to connect is taken out of rotation
+until a health check (``check_forever``, started in the lifespan) finds it
+reachable again, and a PostgreSQL replica lagging more than
+``REPLICA_MAX_LAG_SECONDS`` is treated as down.
+
+Read-your-writes: a commit made through ``get_db``/``get_async_db`` marks the caller's
+bearer token as a recent writer, and that caller's reads stay on the
+primary for ``REPLICA_STICKY_SECONDS``. Stickiness is per process.
+"""
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event, exc, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from ..config import settings
+from .database import (
+    STICKY_KEY, AsyncSessionLocal, SessionLocal, create_configured_async_engine,
+    create_configured_engine, get_async_engine, pool_status, sticky_key
+)
+
+logger = logging.getLogger(__name__)
+
+REPLICA_FLAG = "replica"
+
+class ReplicaRouter:
+    def __init__(self, urls: List[str], sticky_seconds: float = 5, retry_seconds: float = 30,
+                 max_lag_seconds: Optional[float] = None):
+        self.urls = list(urls)
+        self.sticky_seconds = sticky_seconds
+        self.retry_seconds = retry_seconds
+        self.max_lag_seconds = max_lag_seconds
+        self._sessionmakers: Dict[str, sessionmaker] = {}
+        self._async_sessionmakers: Dict[str, async_sessionmaker] = {}
+        self._down_until: Dict[str, float] = {}
+        self._writers: Dict[str, float] = {}
+        self._rotation = itertools.count()
+        self._lock = threading.Lock()
+
+    def _sessionmaker(self, url: str) -> sessionmaker:
+        with self._lock:
+            if url not in self._sessionmakers:
+                self._sessionmakers[url] = sessionmaker(
+                    bind=create_configured_engine(url), autoflush=False, info={REPLICA_FLAG: url}
+                )
+            return self._sessionmakers[url]
+
+    def _async_sessionmaker(self, url: str) -> async_sessionmaker:
+        with self._lock:
+            if url not in self._async_sessionmakers:
+                self._async_sessionmakers[url] = async_sessionmaker(
+                    bind=create_configured_async_engine(url), class_=AsyncSession,
+                    autoflush=False, expire_on_commit=False, info={REPLICA_FLAG: url}
+                )
+            return self._async_sessionmakers[url]
+
+    def healthy(self) -> List[str]:
+        now = time.monotonic()
+        return [url for url in self.urls if self._down_until.get(url, 0) <= now]
+
+    def mark_down(self, url: str, reason: str = ""):
+        if self._down_until.get(url, 0) <= time.monotonic():
+            logger.warning("Replica %s out of rotation%s", url, f": {reason}" if reason else "")
+        self._down_until[url] = time.monotonic() + self.retry_seconds
+
+    def mark_up(self, url: str):
+        if self._down_until.pop(url, None) is not None:
+            logger.info("Replica %s back in rotation", url)
+
+    def mark_writer(self, key: Optional[str]):
+        if not key or not self.urls:
+            return
+        now = time.monotonic()
+        self._writers[key] = now + self.sticky_seconds
+        if len(self._writers) > 10000:
+            for stale in [k for k, until in self._writers.items() if until <= now]:
+                self._writers.pop(stale, None)
+
+    def is_sticky(self, key: Optional[str]) -> bool:
+        return bool(key) and self._writers.get(key, 0) > time.monotonic()
+
+    def _candidates(self, sticky_key: Optional[str]) -> List[str]:
+        """Healthy replicas to try in order, or none if the caller must use the primary."""
+        if not self.urls or self.is_sticky(sticky_key):
+            return []
+        healthy = self.healthy()
+        if not healthy:
+            return []
+        start = next(self._rotation) % len(healthy)
+        return healthy[start:] + healthy[:start]
+
+    def read_session(self, sticky_key: Optional[str] = None) -> Session:
+        """A session on a healthy replica, or on the primary as a fallback."""
+        for url in self._candidates(sticky_key):
+            session = self._sessionmaker(url)()
+            try:
+                # Connect now, so an unreachable replica fails over instead of failing the request
+                session.connection()
+                return session
+            except exc.DBAPIError as error:
+                session.close()
+                self.mark_down(url, error.__class__.__name__)
+        return SessionLocal()
+
+    async def read_async_session(self, sticky_key: Optional[str] = None) -> AsyncSession:
+        for url in self._candidates(sticky_key):
+            session = self._async_sessionmaker(url)()
+            try:
+                await session.connection()
+                return session
+            except exc.DBAPIError as error:
+                await session.close()
+                self.mark_down(url, error.__class__.__name__)
+        get_async_engine()
+        return AsyncSessionLocal()
+
+    def check_health(self):
+        for url in self.urls:
+            try:
+                with self._sessionmaker(url)() as session:
+                    session.execute(text("SELECT 1"))
+                    lag = self._replication_lag(session)
+            except exc.DBAPIError as error:
+                self.mark_down(url, error.__class__.__name__)
+                continue
+            if lag is not None and self.max_lag_seconds is not None and lag > self.max_lag_seconds:
+                self.mark_down(url, f"replication lag {lag:.1f}s")
+            else:
+                self.mark_up(url)
+
+    def _replication_lag(self, session: Session) -> Optional[float]:
+        if session.get_bind().dialect.name != "postgresql":
+            return None
+        return session.execute(text(
+            "SELECT CASE WHEN pg_is_in_recovery() "
+            "THEN COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+        )).scalar()
+
+    async def check_forever(self, interval_seconds: float):
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await run_in_threadpool(self.check_health)
+            except Exception:
+                logger.exception("Replica health check failed")
+
+    def status(self) -> List[Dict]:
+        healthy = set(self.healthy())
+        return [
+            {"url": _redact(url), "healthy": url in healthy,
+             **(pool_status(self._sessionmakers[url].kw["bind"]) if url in self._sessionmakers else {})}
+            for url in self.urls
+        ]
+
+def _redact(url: str) -> str:
+    scheme, sep, rest = url.partition("://")
+    credentials, at, host = rest.rpartition("@")
+    return scheme + sep + (credentials.split(":")[0] + ":***@" if at else "") + host
+
+replicas = ReplicaRouter(
+    settings.DATABASE_REPLICA_URLS,
+    sticky_seconds=settings.REPLICA_STICKY_SECONDS,
+    retry_seconds=settings.REPLICA_RETRY_SECONDS,
+    max_lag_seconds=settings.REPLICA_MAX_LAG_SECONDS
+)
+
+def get_read_db(request: Request):
+    db = replicas.read_session(sticky_key(request))
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_read_db(request: Request):
+    db = await replicas.read_async_session(sticky_key(request))
+    try:
+        yield db
+    finally:
+        await db.close()
+
+def read_session_factory(request: Request):
+    """For code that opens its own sessions, such as streaming exports."""
+    key = sticky_key(request)
+    return lambda: replicas.read_session(key)
+
+@event.listens_for(Session, "before_flush")
+def _refuse_replica_writes(session, flush_context, instances):
+    if session.info.get(REPLICA_FLAG):
+        raise RuntimeError("Attempted to write through a read-replica session")
+
+@event.listens_for(Session, "after_commit")
+def _remember_writer(session):
+    if not session.info.get(REPLICA_FLAG):
+        replicas.mark_writer(session.info.get(STICKY_KEY))
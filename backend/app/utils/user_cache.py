@@ -0,0 +1,69 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from sqlalchemy import event
+from ..config import settings
+from ..models.user import User
+from .change_tracking import on_commit
+
+class UserCache:
+    """Bounded in-process cache of authenticated users keyed by user id.
+
+    Entries expire after ``ttl_seconds`` and the least recently used entry
+    is evicted once ``max_size`` is reached. Cached users are detached
+    instances and must be treated as read-only.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 60):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[User]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return user
+
+    def set(self, user_id: int, user: User):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl_seconds, user)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+user_cache = UserCache(settings.USER_CACHE_SIZE, settings.USER_CACHE_TTL_SECONDS)
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _drop_changed_user(mapper, connection, target):
+    # Dropped at flush and again after commit (below), so a concurrent
+    # request cannot re-cache the pre-commit row in between
+    user_cache.invalidate(target.id)
+
+@on_commit
+def _invalidate_committed_users(changes):
+    for change in changes:
+        if change.entity == "user" and change.action != "created":
+            user_cache.invalidate(change.entity_id)
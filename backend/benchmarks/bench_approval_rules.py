@@ -0,0 +1,47 @@
+"""Expense rule evaluation cost as the rule set grows.
+
+Usage (from backend/):
+    python -m benchmarks.bench_approval_rules --evaluations 100000
+"""
+import argparse
+import random
+import time
+from app.models.approval_rule import ApprovalRule
+from app.services.approval_rules import RuleMatcher
+
+CATEGORIES = [f"Category{n}" for n in range(50)]
+
+def build_rules(count, rng):
+    return [
+        ApprovalRule(
+            id=n,
+            category=rng.choice(CATEGORIES + [None]),
+            employee_id=rng.choice([None, rng.randrange(1, 10_000)]),
+            max_amount=rng.randrange(10, 500),
+            monthly_cap=rng.choice([None, rng.randrange(500, 5000)])
+        )
+        for n in range(count)
+    ]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--evaluations", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    expenses = [
+        (rng.randrange(1, 10_000), rng.choice(CATEGORIES), rng.randrange(100, 60_000))
+        for _ in range(args.evaluations)
+    ]
+    spent = lambda category: 100_000  # noqa: E731 - stands in for the summary lookup
+
+    for count in (10, 1_000, 100_000):
+        matcher = RuleMatcher(build_rules(count, rng))
+        start = time.perf_counter()
+        approved = sum(matcher.match(*expense, spent) is not None for expense in expenses)
+        elapsed = time.perf_counter() - start
+        print(f"rules={count:7d}  {elapsed / len(expenses) * 1e6:6.2f}us per expense  "
+              f"({approved / len(expenses):.0%} auto-approved)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Show query plans and latency for the hot query shapes before and after
+the composite indexes are created.
+
+Usage (from backend/):
+    python -m benchmarks.bench_indexes --expenses 300000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from sqlalchemy import create_engine, insert, text
+from app.models.user import Base, User
+from app.models.salary_slip import SalarySlip
+from app.models.expense import Expense
+from app.utils.migrations import run_migrations
+
+HOT_QUERIES = {
+    "employee pending count": (
+        "SELECT count(*) FROM expenses WHERE employee_id = :employee_id AND status = 'pending'"
+    ),
+    "admin pending count": "SELECT count(*) FROM expenses WHERE status = 'pending'",
+    "employee expense page": (
+        "SELECT * FROM expenses WHERE employee_id = :employee_id "
+        "ORDER BY created_at DESC, id DESC LIMIT 100"
+    ),
+    "admin expense page": "SELECT * FROM expenses ORDER BY created_at DESC, id DESC LIMIT 100",
+    "slip for employee month": (
+        "SELECT * FROM salary_slips WHERE employee_id = :employee_id AND month_year = '2024-06'"
+    ),
+    "employee list page": (
+        "SELECT * FROM users WHERE role = 'employee' ORDER BY created_at DESC, id DESC LIMIT 100"
+    ),
+}
+
+def seed(engine, employees, expenses):
+    start = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{
+            "email": f"idx-{i}@example.com", "password_hash": "x",
+            "role": "admin" if i == 0 else "employee",
+            "created_at": start + timedelta(minutes=i)
+        } for i in range(employees)])
+        conn.execute(insert(SalarySlip), [{
+            "employee_id": employee_id, "month_year": f"2024-{month:02d}",
+            "basic_salary": 5000, "net_salary": 5000, "created_by": 1,
+            "created_at": start + timedelta(days=31 * month, seconds=employee_id),
+            "updated_at": start
+        } for employee_id in range(2, employees + 1) for month in range(1, 13)])
+        for offset in range(0, expenses, 50000):
+            conn.execute(insert(Expense), [{
+                "employee_id": random.randint(2, employees), "amount": 25.0,
+                "category": random.choice(["Travel", "Meals", "Supplies"]),
+                "description": "bench", "expense_date": date(2024, 1, 1),
+                "status": random.choice(["pending", "approved", "approved", "rejected"]),
+                "created_at": start + timedelta(seconds=offset + i)
+            } for i in range(min(50000, expenses - offset))])
+
+def measure(engine, repeats):
+    results = {}
+    with engine.connect() as conn:
+        for name, sql in HOT_QUERIES.items():
+            params = {"employee_id": random.randint(2, 100)}
+            plan = conn.execute(text("EXPLAIN QUERY PLAN " + sql), params).all()
+            started = time.perf_counter()
+            for _ in range(repeats):
+                conn.execute(text(sql), params).all()
+            elapsed_ms = (time.perf_counter() - started) * 1000 / repeats
+            results[name] = (elapsed_ms, "; ".join(row[-1] for row in plan))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--employees", type=int, default=5000)
+    parser.add_argument("--expenses", type=int, default=200000)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "bench_indexes.db")
+    engine = create_engine(f"sqlite:///{path}")
+    # Build the pre-migration schema: keep the column-level indexes the
+    # tables always had and drop the composite ones added in __table_args__
+    for table in Base.metadata.sorted_tables:
+        table.create(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                if not (len(index.columns) == 1 and list(index.columns)[0].index):
+                    index.drop(conn)
+
+    random.seed(7)
+    seed(engine, args.employees, args.expenses)
+    before = measure(engine, args.repeats)
+
+    started = time.perf_counter()
+    run_migrations(engine)
+    migration_seconds = time.perf_counter() - started
+    after = measure(engine, args.repeats)
+
+    print(f"{args.employees} users, {args.expenses} expenses, {(args.employees - 1) * 12} slips")
+    print(f"index migration took {migration_seconds:.2f}s\n")
+    for name in HOT_QUERIES:
+        (before_ms, before_plan), (after_ms, after_plan) = before[name], after[name]
+        print(f"{name}: {before_ms:8.2f}ms -> {after_ms:8.2f}ms")
+        print(f"    before: {before_plan}")
+        print(f"    after:  {after_plan}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Compare the vectorised ledger recompute with a row-by-row Decimal pass.
+
+Usage (from backend/):
+    python -m benchmarks.bench_ledger --slips 1000000
+"""
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+from app.models.user import Base, User
+from app.models.salary_slip import SalarySlip
+from app.models.expense import Expense  # noqa: F401 - registers the table
+from app.models.aggregates import MonthlySalaryTotal
+from app.services.ledger import ledger_service
+from app.utils.money import from_cents
+
+MONTH = "2024-01"
+
+INSERT_SLIP = (
+    "INSERT INTO salary_slips (employee_id, month_year, basic_salary, allowances, bonuses, deductions, "
+    "tax, net_salary, created_by) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1)"
+)
+
+def seed(engine, count, drift_every):
+    rng = np.random.default_rng(42)
+    components = rng.integers(0, 500_000, size=(count, 5), dtype=np.int64)
+    components[:, 0] += 1_000_000
+    net = components @ np.array([1, 1, 1, -1, -1])
+    net[::drift_every] += 1
+
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"id": 1, "email": "bench@example.com", "password_hash": "x", "role": "admin"}])
+        # Raw cents straight into the table; going through Money would only add conversion time.
+        # SQLite does not enforce the employee foreign key, so no user rows are needed.
+        employee_ids = np.arange(1, count + 1)
+        rows = np.column_stack([employee_ids, components, net]).tolist()
+        for start in range(0, count, 50_000):
+            conn.exec_driver_sql(INSERT_SLIP, [
+                (employee_id, MONTH, *amounts) for employee_id, *amounts in rows[start:start + 50_000]
+            ])
+        conn.execute(insert(MonthlySalaryTotal).values(
+            month_year=MONTH, total_net_salary=from_cents(int(net.sum())), slip_count=count
+        ))
+
+def row_by_row(db):
+    mismatched = 0
+    total = 0
+    for basic, allowances, bonuses, deductions, tax, net in db.execute(select(
+        SalarySlip.basic_salary, SalarySlip.allowances, SalarySlip.bonuses,
+        SalarySlip.deductions, SalarySlip.tax, SalarySlip.net_salary
+    ).where(SalarySlip.month_year == MONTH)):
+        expected = basic + allowances + bonuses - deductions - tax
+        total += expected
+        if expected != net:
+            mismatched += 1
+    return mismatched, total
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--slips", type=int, default=1_000_000)
+    parser.add_argument("--drift-every", type=int, default=1000)
+    args = parser.parse_args()
+
+    url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+
+    start = time.perf_counter()
+    seed(engine, args.slips, args.drift_every)
+    seed_elapsed = time.perf_counter() - start
+
+    with Session() as db:
+        start = time.perf_counter()
+        slow_mismatched, slow_total = row_by_row(db)
+        slow_elapsed = time.perf_counter() - start
+
+    with Session() as db:
+        start = time.perf_counter()
+        report = ledger_service.recompute_month(db, MONTH)
+        fast_elapsed = time.perf_counter() - start
+        load_start = time.perf_counter()
+        ledger_service.load_month(db, MONTH)
+        load_elapsed = time.perf_counter() - load_start
+
+    assert report["mismatched"] == slow_mismatched
+    assert report["recomputed_total"] == slow_total
+
+    count = args.slips
+    print(f"database:        {url}")
+    print(f"slips:           {count} (seeded in {seed_elapsed:.1f}s, {report['mismatched']} with drift)")
+    print(f"row-by-row:      {slow_elapsed:8.2f}s  {count / slow_elapsed:12.0f} slips/s")
+    print(f"vectorised:      {fast_elapsed:8.2f}s  {count / fast_elapsed:12.0f} slips/s "
+          f"(of which loading {load_elapsed:.2f}s)")
+    print(f"speedup:         {slow_elapsed / fast_elapsed:8.1f}x")
+    print(f"summary row:     {'consistent' if report['summary_consistent'] else 'inconsistent'}")
+
+if __name__ == "__main__":
+    main()
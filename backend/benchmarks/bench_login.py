@@ -0,0 +1,88 @@
+"""Login throughput: inline bcrypt in the request threadpool vs the
+dedicated password hasher pool, plus how a cheap route fares meanwhile.
+
+Usage (from backend/):
+    python -m benchmarks.bench_login --logins 200 --concurrency 100
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_login.db')}")
+
+import httpx  # noqa: E402
+from fastapi import Depends, HTTPException  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.schemas.user import UserLogin  # noqa: E402
+from app.utils.auth import create_access_token, hash_password, verify_password  # noqa: E402
+from app.utils.database import SessionLocal, get_db, get_engine  # noqa: E402
+from app.utils.migrations import run_migrations  # noqa: E402
+
+EMAIL = "bench-login@example.com"
+PASSWORD = "benchpass123"
+
+@app.post("/bench/legacy-login")
+def legacy_login(user: UserLogin, db: Session = Depends(get_db)):
+    # The original implementation: bcrypt on the shared request threadpool
+    db_user = db.query(User).filter(User.email == user.email).first()
+    if not db_user or not verify_password(user.password, db_user.password_hash):
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    return {"access_token": create_access_token({"sub": db_user.id}), "token_type": "bearer"}
+
+async def probe(client, stop, latencies):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.get("/health")
+        latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(0.01)
+
+async def storm(path, logins, concurrency):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=300) as client:
+        semaphore = asyncio.Semaphore(concurrency)
+        statuses = []
+
+        async def one():
+            async with semaphore:
+                response = await client.post(path, json={"email": EMAIL, "password": PASSWORD})
+                statuses.append(response.status_code)
+
+        stop, probe_latencies = asyncio.Event(), []
+        probe_task = asyncio.create_task(probe(client, stop, probe_latencies))
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(logins)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await probe_task
+
+    ok = statuses.count(200)
+    shed = statuses.count(503)
+    probe_p99 = sorted(probe_latencies)[int(len(probe_latencies) * 0.99)] * 1000 if probe_latencies else 0
+    print(f"{path:22s} {ok / elapsed:8.1f} logins/s  ok={ok} shed={shed}  "
+          f"/health p50={statistics.median(probe_latencies) * 1000:.1f}ms p99={probe_p99:.1f}ms")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    # httpx's ASGITransport does not run the lifespan
+    run_migrations(get_engine())
+    with SessionLocal() as db:
+        if not db.query(User).filter(User.email == EMAIL).first():
+            db.add(User(email=EMAIL, password_hash=hash_password(PASSWORD), role="employee"))
+            db.commit()
+
+    print(f"{args.logins} logins, concurrency {args.concurrency}, cpus {os.cpu_count()}")
+    asyncio.run(storm("/bench/legacy-login", args.logins, args.concurrency))
+    asyncio.run(storm("/auth/login", args.logins, args.concurrency))
+
+if __name__ == "__main__":
+    main()
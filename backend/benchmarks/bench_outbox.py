@@ -0,0 +1,78 @@
+"""Drain a large outbox through a simulated SMTP server.
+
+The stand-in server charges a fixed cost per connection (TCP + TLS +
+AUTH handshake) and per message, so the run shows what connection reuse
+and parallel connections buy compared with one connection per email.
+
+Usage (from backend/):
+    python -m benchmarks.bench_outbox --messages 20000 --connections 4
+"""
+import argparse
+import os
+import tempfile
+import time
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from app.models.user import Base
+from app.models.outbox import OutboxMessage
+from app.services.email import EmailService
+from app.services.outbox import OutboxDispatcher
+
+class SimulatedSMTP:
+    handshake_seconds = 0.2
+    send_seconds = 0.005
+
+    def __init__(self):
+        time.sleep(self.handshake_seconds)
+
+    def send_message(self, message):
+        time.sleep(self.send_seconds)
+
+    def noop(self):
+        return (250, b"OK")
+
+    def quit(self):
+        pass
+
+    def close(self):
+        pass
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--connections", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+
+    url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+
+    email_service = EmailService(smtp_factory=SimulatedSMTP)
+    with Session() as db:
+        email_service.enqueue_many(db, [
+            email_service.salary_slip_notification(f"employee-{i}@example.com", "2024-01")
+            for i in range(args.messages)
+        ])
+        db.commit()
+
+    dispatcher = OutboxDispatcher(
+        Session, email_service, batch_size=args.batch_size, connections=args.connections
+    )
+    start = time.perf_counter()
+    while dispatcher.dispatch_once():
+        pass
+    elapsed = time.perf_counter() - start
+    dispatcher.stop()
+
+    with Session() as db:
+        sent = db.scalar(select(func.count()).where(OutboxMessage.status == "sent"))
+    per_message = SimulatedSMTP.handshake_seconds + SimulatedSMTP.send_seconds
+    print(f"messages:                {args.messages} (sent={sent})")
+    print(f"dispatcher:              {elapsed:8.1f}s  {sent / elapsed:8.0f} msg/s "
+          f"({args.connections} pooled connections)")
+    print(f"connect-per-email est.:  {args.messages * per_message:8.1f}s  {1 / per_message:8.0f} msg/s")
+
+if __name__ == "__main__":
+    main()
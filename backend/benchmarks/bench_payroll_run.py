@@ -0,0 +1,96 @@
+"""Compare one-slip-per-commit creation with the bulk payroll run.
+
+Usage (from backend/):
+    python -m benchmarks.bench_payroll_run --employees 20000
+"""
+import argparse
+import os
+import tempfile
+import time
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import sessionmaker
+from app.models.user import Base, User
+from app.models.salary_slip import SalarySlip
+from app.models.expense import Expense  # noqa: F401 - registers the table
+from app.services.payroll import payroll_service
+
+def seed_employees(db, count):
+    admin = User(email="bench-admin@example.com", password_hash="x", role="admin")
+    db.add(admin)
+    db.add_all(
+        User(email=f"bench-{i}@example.com", password_hash="x", role="employee")
+        for i in range(count)
+    )
+    db.commit()
+    employee_ids = [u.id for u in db.query(User.id).filter(User.role == "employee")]
+    return admin.id, employee_ids
+
+def items_for(employee_ids):
+    return [{
+        "employee_id": employee_id,
+        "basic_salary": 5000.0,
+        "allowances": 800.0,
+        "deductions": 150.0,
+        "bonuses": 250.0,
+        "tax": 600.0
+    } for employee_id in employee_ids]
+
+def one_at_a_time(db, admin_id, items, month_year):
+    # Mirrors create_salary_slip: add, commit and refresh per slip
+    for item in items:
+        slip = SalarySlip(
+            month_year=month_year,
+            net_salary=payroll_service.compute_net_salary(
+                item["basic_salary"], item["allowances"], item["bonuses"],
+                item["deductions"], item["tax"]
+            ),
+            created_by=admin_id,
+            **item
+        )
+        db.add(slip)
+        db.commit()
+        db.refresh(slip)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--employees", type=int, default=5000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp()
+    url = args.database_url or f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+    engine = create_engine(url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+
+    with Session() as db:
+        admin_id, employee_ids = seed_employees(db, args.employees)
+    items = items_for(employee_ids)
+
+    with Session() as db:
+        start = time.perf_counter()
+        one_at_a_time(db, admin_id, items, "2024-01")
+        single_elapsed = time.perf_counter() - start
+        db.execute(delete(SalarySlip))
+        db.commit()
+
+    with Session() as db:
+        start = time.perf_counter()
+        result = payroll_service.run_payroll(
+            db, "2024-01", items, created_by=admin_id, chunk_size=args.chunk_size
+        )
+        bulk_elapsed = time.perf_counter() - start
+
+    count = len(items)
+    print(f"database:        {url}")
+    print(f"slips:           {count}")
+    print(f"one-at-a-time:   {single_elapsed:8.2f}s  {count / single_elapsed:10.0f} slips/s")
+    print(f"payroll run:     {bulk_elapsed:8.2f}s  {count / bulk_elapsed:10.0f} slips/s "
+          f"(created={result['created']}, failed={result['failed']})")
+    print(f"speedup:         {single_elapsed / bulk_elapsed:8.1f}x")
+    print("(HTTP round trips saved by the batch endpoint are not included)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Cold-start cost: importing the app and serving the first request.
+
+Each sample is a fresh interpreter, as on a serverless cold start. The
+first request runs the lifespan (and so migrations when AUTO_MIGRATE is
+on) before GET /health.
+
+Usage (from backend/):
+    python -m benchmarks.bench_startup --runs 10
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+PROBE = """
+import time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(app.main.app) as client:
+    client.get("/health")
+served = time.perf_counter()
+print(imported - started, served - started)
+"""
+
+def sample(env):
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], env=env, capture_output=True, text=True, check=True
+    ).stdout.split()
+    return float(output[-2]), float(output[-1])
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    database = os.path.join(tempfile.mkdtemp(), "bench_startup.db")
+    for auto_migrate in ("true", "false"):
+        env = {**os.environ, "DATABASE_URL": f"sqlite:///{database}", "AUTO_MIGRATE": auto_migrate}
+        sample(env)  # warm the OS file cache and create the schema
+        imports, first_requests = zip(*(sample(env) for _ in range(args.runs)))
+        print(f"AUTO_MIGRATE={auto_migrate:5s}  import p50={statistics.median(imports) * 1000:7.1f}ms  "
+              f"first request p50={statistics.median(first_requests) * 1000:7.1f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Compare signup-style user creation with the bulk employee import.
+
+Usage (from backend/):
+    python -m benchmarks.bench_user_import --users 2000 --rounds 12
+"""
+import argparse
+import os
+import tempfile
+import time
+import bcrypt
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.models.user import Base, User
+from app.models.salary_slip import SalarySlip  # noqa: F401 - registers the table
+from app.models.expense import Expense  # noqa: F401 - registers the table
+from app.models import aggregates  # noqa: F401 - registers the summary tables
+from app.services.user_import import user_import_service
+from app.utils.password_hasher import password_hasher
+
+def rows_for(prefix, count):
+    return [{"email": f"{prefix}-{i}@example.com", "password": f"pw-{i}"} for i in range(count)]
+
+def one_at_a_time(db, rows, rounds):
+    # Mirrors the original signup: lookup, inline hash, commit per user
+    for row in rows:
+        if db.query(User).filter(User.email == row["email"]).first():
+            continue
+        password_hash = bcrypt.hashpw(row["password"].encode("utf-8"), bcrypt.gensalt(rounds=rounds))
+        user = User(email=row["email"], password_hash=password_hash.decode("utf-8"), role="employee")
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    engine = create_engine(url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    password_hasher.rounds = args.rounds
+
+    try:
+        with Session() as db:
+            start = time.perf_counter()
+            one_at_a_time(db, rows_for("single", args.users), args.rounds)
+            single_elapsed = time.perf_counter() - start
+
+        with Session() as db:
+            start = time.perf_counter()
+            result = user_import_service.import_users(
+                db, rows_for("bulk", args.users), chunk_size=args.chunk_size
+            )
+            bulk_elapsed = time.perf_counter() - start
+    finally:
+        password_hasher.shutdown()
+
+    count = args.users
+    print(f"database:        {url}")
+    print(f"users:           {count} (bcrypt cost {args.rounds}, {password_hasher.workers} hash workers)")
+    print(f"one-at-a-time:   {single_elapsed:8.2f}s  {count / single_elapsed:10.1f} users/s")
+    print(f"bulk import:     {bulk_elapsed:8.2f}s  {count / bulk_elapsed:10.1f} users/s "
+          f"(created={result['created']}, failed={result['failed']})")
+    print(f"speedup:         {single_elapsed / bulk_elapsed:8.1f}x")
+    print(f"50k estimate:    {50000 / (count / bulk_elapsed) / 60:8.1f} min")
+
+if __name__ == "__main__":
+    main()
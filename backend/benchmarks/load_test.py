@@ -0,0 +1,87 @@
+"""Closed-loop HTTP load test for comparing the sync and async route paths.
+
+Start the API once per mode (with the rate limiter off, since every
+simulated client shares one user), then point this script at it:
+    export RATE_LIMIT_ENABLED=false
+    ASYNC_ROUTES=false uvicorn app.main:app --port 8000
+    python -m benchmarks.load_test --url http://localhost:8000 --concurrency 500
+
+    ASYNC_ROUTES=true uvicorn app.main:app --port 8000
+    python -m benchmarks.load_test --url http://localhost:8000 --concurrency 500
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+import httpx
+
+DEFAULT_PATHS = ["/employee/dashboard-stats", "/employee/expenses", "/employee/salary-slips"]
+
+async def get_token(client: httpx.AsyncClient, email: str, password: str) -> str:
+    if email is None:
+        email = f"load-{uuid.uuid4().hex[:12]}@example.com"
+        await client.post("/auth/signup", json={
+            "email": email, "password": password, "full_name": "Load Test", "role": "employee"
+        })
+    response = await client.post("/auth/login", json={"email": email, "password": password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+async def worker(client, paths, headers, deadline, latencies, errors):
+    i = 0
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        started = time.perf_counter()
+        try:
+            response = await client.get(path, headers=headers)
+            if response.status_code >= 400:
+                errors.append(response.status_code)
+                continue
+        except httpx.HTTPError as exc:
+            errors.append(type(exc).__name__)
+            continue
+        latencies.append(time.perf_counter() - started)
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+async def run(args):
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=args.timeout) as client:
+        token = await get_token(client, args.email, args.password)
+        headers = {"Authorization": f"Bearer {token}"}
+        latencies, errors = [], []
+        deadline = time.perf_counter() + args.duration
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            worker(client, args.paths, headers, deadline, latencies, errors)
+            for _ in range(args.concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+
+    print(f"target:       {args.url} {args.paths}")
+    print(f"concurrency:  {args.concurrency} for {elapsed:.1f}s")
+    print(f"requests:     {len(latencies)} ok, {len(errors)} failed")
+    if latencies:
+        print(f"throughput:   {len(latencies) / elapsed:.1f} req/s")
+        print(f"latency ms:   p50={percentile(latencies, 50) * 1000:.1f} "
+              f"p95={percentile(latencies, 95) * 1000:.1f} "
+              f"p99={percentile(latencies, 99) * 1000:.1f} "
+              f"mean={statistics.mean(latencies) * 1000:.1f}")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--email", default=None, help="existing account; a new employee is created if omitted")
+    parser.add_argument("--password", default="loadtest123")
+    parser.add_argument("--paths", nargs="+", default=DEFAULT_PATHS)
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
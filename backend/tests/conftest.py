@@ -1,11 +1,51 @@
+import os
+import tempfile
+import uuid
+from typing import Dict, NamedTuple
+
+# Tests share one client IP; the limiter has its own tests
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("PDF_CACHE_DIR", tempfile.mkdtemp(prefix="payroll-pdf-"))
+os.environ.setdefault("JOBS_RESULT_DIR", tempfile.mkdtemp(prefix="payroll-jobs-"))
+
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
+from app.utils.database import get_engine
+from app.utils.migrations import run_migrations
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    # Module-level TestClients never run the lifespan, so migrate once here
+    run_migrations(get_engine())
 
 @pytest.fixture
 def client():
     return TestClient(app)
 
+class AuthUser(NamedTuple):
+    id: int
+    email: str
+    headers: Dict[str, str]
+
+@pytest.fixture(scope="session")
+def make_user():
+    """Sign up a user with a unique email and log in; returns its id, email and auth headers."""
+    session_client = TestClient(app)
+
+    def make(role: str = "employee", **fields) -> AuthUser:
+        email = f"{role}-{uuid.uuid4().hex[:12]}@example.com"
+        signup = session_client.post("/auth/signup", json={
+            "email": email, "password": "testpass123", "role": role, **fields
+        })
+        assert signup.status_code == 200, signup.text
+        token = session_client.post("/auth/login", json={
+            "email": email, "password": "testpass123"
+        }).json()["access_token"]
+        return AuthUser(signup.json()["id"], email, {"Authorization": f"Bearer {token}"})
+
+    return make
+
 @pytest.fixture
 def admin_token(client):
     response = client.post("/auth/login", json={
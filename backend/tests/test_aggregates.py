@@ -0,0 +1,71 @@
+import uuid
+from fastapi.testclient import TestClient
+from sqlalchemy import func
+from app.main import app
+from app.models.aggregates import ExpenseTotal, MonthlySalaryTotal
+from app.models.expense import Expense
+from app.models.salary_slip import SalarySlip
+from app.utils.database import SessionLocal
+
+client = TestClient(app)
+
+def _expense_totals_from_base(db, employee_id):
+    rows = db.query(
+        Expense.category, Expense.status, func.sum(Expense.amount), func.count(Expense.id)
+    ).filter(Expense.employee_id == employee_id).group_by(Expense.category, Expense.status).all()
+    return {(r[0], r[1]): (r[2], r[3]) for r in rows}
+
+def _expense_totals_from_summary(db, employee_id):
+    rows = db.query(ExpenseTotal).filter(
+        ExpenseTotal.employee_id == employee_id, ExpenseTotal.expense_count > 0
+    ).all()
+    return {(r.category, r.status): (r.total_amount, r.expense_count) for r in rows}
+
+def test_expense_totals_follow_creates_and_status_changes(make_user):
+    employee_id, _, employee_headers = make_user("employee")
+    admin_headers = make_user("admin").headers
+    ids = []
+    for amount, category in [(10, "Meals"), (20, "Meals"), (35, "Travel")]:
+        ids.append(client.post("/employee/expenses", headers=employee_headers, json={
+            "amount": amount, "category": category, "description": "x", "expense_date": "2024-05-01"
+        }).json()["id"])
+    client.patch(f"/admin/expenses/{ids[0]}", headers=admin_headers, json={"status": "approved"})
+    client.patch(f"/admin/expenses/{ids[2]}", headers=admin_headers, json={"status": "rejected"})
+
+    with SessionLocal() as db:
+        expected = _expense_totals_from_base(db, employee_id)
+        assert _expense_totals_from_summary(db, employee_id) == expected
+        assert expected[("Meals", "approved")] == (10, 1)
+
+    breakdown = client.get("/analytics/my-expense-breakdown", headers=employee_headers).json()
+    assert breakdown == [{"category": "Meals", "total": 10.0}]
+
+def test_monthly_totals_follow_slip_updates(make_user):
+    employee_id = make_user("employee").id
+    admin_headers = make_user("admin").headers
+    month = f"2099-{uuid.uuid4().int % 12 + 1:02d}"
+    with SessionLocal() as db:
+        db.query(SalarySlip).filter(SalarySlip.month_year == month).delete()
+        db.query(MonthlySalaryTotal).filter(MonthlySalaryTotal.month_year == month).delete()
+        db.commit()
+
+    slip = client.post("/admin/salary-slips", headers=admin_headers, json={
+        "employee_id": employee_id, "month_year": month, "basic_salary": 1000, "tax": 100
+    }).json()
+    client.put(f"/admin/salary-slips/{slip['id']}", headers=admin_headers, json={"bonuses": 50})
+
+    with SessionLocal() as db:
+        total = db.get(MonthlySalaryTotal, month)
+        assert (total.total_net_salary, total.slip_count) == (950, 1)
+
+def test_rebuild_matches_incremental_state(make_user):
+    employee_id, _, employee_headers = make_user("employee")
+    admin_headers = make_user("admin").headers
+    client.post("/employee/expenses", headers=employee_headers, json={
+        "amount": 12, "category": "Supplies", "description": "x", "expense_date": "2024-05-01"
+    })
+    with SessionLocal() as db:
+        before = _expense_totals_from_summary(db, employee_id)
+    assert client.post("/admin/analytics/rebuild", headers=admin_headers).status_code == 200
+    with SessionLocal() as db:
+        assert _expense_totals_from_summary(db, employee_id) == before
@@ -0,0 +1,109 @@
+from datetime import date
+from fastapi.testclient import TestClient
+from app.main import app
+from app.models.aggregates import ExpenseMonthlyTotal
+from app.models.approval_rule import ApprovalRule
+from app.models.expense import Expense
+from app.services.approval_rules import RuleMatcher, approval_rule_service
+from app.utils.database import SessionLocal
+
+client = TestClient(app)
+
+def _submit(headers, amount, category="Travel", expense_date="2024-05-01"):
+    return client.post("/employee/expenses", headers=headers, json={
+        "amount": amount, "category": category, "description": "x", "expense_date": expense_date
+    }).json()
+
+def _monthly_totals(employee_id):
+    with SessionLocal() as db:
+        return {
+            (row.month_year, row.category, row.status): (row.total_amount, row.expense_count)
+            for row in db.query(ExpenseMonthlyTotal).filter(ExpenseMonthlyTotal.employee_id == employee_id)
+        }
+
+def test_matcher_picks_the_scope_and_checks_caps_only_when_needed():
+    rules = [
+        ApprovalRule(id=1, category="Meals", max_amount=25),
+        ApprovalRule(id=2, category="Travel", max_amount=50, monthly_cap=100),
+        ApprovalRule(id=3, employee_id=7, max_amount=500, monthly_cap=1000),
+    ]
+    # Unrelated rules must not change the outcome
+    rules += [ApprovalRule(id=100 + n, category=f"Other{n}", employee_id=n, max_amount=n) for n in range(5000)]
+    matcher = RuleMatcher(rules)
+    lookups = []
+
+    def spent(category):
+        lookups.append(category)
+        return {"Travel": 6000, None: 95000}[category]
+
+    assert matcher.match(1, "Meals", 2500, spent) == 1
+    assert lookups == []
+    assert matcher.match(1, "Meals", 2501, spent) is None
+    assert matcher.match(1, "Travel", 4000, spent) == 2
+    assert matcher.match(1, "Travel", 4001, spent) is None
+    # Over the Travel cap, but within employee 7's overall cap
+    assert matcher.match(7, "Travel", 4001, spent) == 3
+    assert matcher.match(7, "Travel", 5000, spent) == 3
+    assert matcher.match(7, "Travel", 5001, spent) is None
+    assert matcher.match(7, "Travel", 60000, spent) is None
+
+def test_submissions_are_auto_approved_within_the_rules(make_user):
+    employee_id, _, employee = make_user("employee")
+    admin = make_user("admin").headers
+    rule = client.post("/admin/approval-rules", headers=admin, json={
+        "name": "Small travel", "category": "Travel", "employee_id": employee_id,
+        "max_amount": 50, "monthly_cap": 100
+    })
+    assert rule.status_code == 200
+    rule_id = rule.json()["id"]
+
+    approved = _submit(employee, 40)
+    assert approved["status"] == "approved"
+    assert approved["reviewed_at"] is not None and approved["reviewed_by"] is None
+    assert _submit(employee, 40)["status"] == "approved"
+    assert _submit(employee, 40)["status"] == "pending"
+    assert _submit(employee, 60, expense_date="2024-06-01")["status"] == "pending"
+    assert _submit(employee, 40, expense_date="2024-06-02")["status"] == "approved"
+    assert _submit(employee, 10, category="Meals")["status"] == "pending"
+
+    expected = {
+        ("2024-05", "Travel", "approved"): (80, 2),
+        ("2024-05", "Travel", "pending"): (40, 1),
+        ("2024-05", "Meals", "pending"): (10, 1),
+        ("2024-06", "Travel", "pending"): (60, 1),
+        ("2024-06", "Travel", "approved"): (40, 1),
+    }
+    assert _monthly_totals(employee_id) == expected
+    client.post("/admin/analytics/rebuild", headers=admin)
+    assert _monthly_totals(employee_id) == expected
+
+    updated = client.put(f"/admin/approval-rules/{rule_id}", headers=admin, json={"is_active": False})
+    assert updated.json()["is_active"] is False
+    assert _submit(employee, 1, expense_date="2024-07-01")["status"] == "pending"
+    assert client.delete(f"/admin/approval-rules/{rule_id}", headers=admin).status_code == 204
+    assert client.delete(f"/admin/approval-rules/{rule_id}", headers=admin).status_code == 404
+
+def test_credits_and_zero_amounts_stay_pending(make_user):
+    employee_id, _, employee = make_user("employee")
+    admin = make_user("admin").headers
+    client.post("/admin/approval-rules", headers=admin, json={
+        "name": "Any travel", "category": "Travel", "employee_id": employee_id,
+        "max_amount": 50, "monthly_cap": 100
+    })
+    assert client.post("/employee/expenses", headers=employee, json={
+        "amount": -1000, "category": "Travel", "description": "x", "expense_date": "2024-05-01"
+    }).status_code == 422
+
+    with SessionLocal() as db:
+        for amount in (-1000, 0):
+            expense = Expense(
+                employee_id=employee_id, amount=amount, category="Travel", description="x",
+                expense_date=date(2024, 5, 1), status="pending"
+            )
+            assert approval_rule_service.apply(db, expense) is None
+            assert expense.status == "pending"
+
+def test_rules_need_a_limit(make_user):
+    admin = make_user("admin").headers
+    response = client.post("/admin/approval-rules", headers=admin, json={"name": "Everything"})
+    assert response.status_code == 400
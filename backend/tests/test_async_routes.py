@@ -0,0 +1,50 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.main import app as sync_app  # noqa: F401 - ensures the schema exists
+from app.routes.async_api import auth, admin, employee, analytics
+from app.utils.user_cache import user_cache
+
+async_app = FastAPI()
+for module in (auth, admin, employee, analytics):
+    async_app.include_router(module.router)
+
+client = TestClient(async_app)
+
+def test_async_expense_flow(make_user):
+    employee_id, _, employee_headers = make_user("employee")
+    admin_headers = make_user("admin").headers
+
+    created = client.post("/employee/expenses", headers=employee_headers, json={
+        "amount": 42.5, "category": "Meals", "description": "Lunch", "expense_date": "2024-04-01"
+    })
+    assert created.status_code == 200
+    expense_id = created.json()["id"]
+
+    mine = client.get("/employee/expenses", headers=employee_headers).json()
+    assert [e["id"] for e in mine] == [expense_id]
+
+    reviewed = client.patch(f"/admin/expenses/{expense_id}", headers=admin_headers, json={
+        "status": "approved"
+    })
+    assert reviewed.json()["status"] == "approved"
+
+    stats = client.get("/employee/dashboard-stats", headers=employee_headers).json()
+    assert stats["total_expenses"] == 1
+    assert stats["pending_expenses"] == 0
+
+    breakdown = client.get("/analytics/my-expense-breakdown", headers=employee_headers).json()
+    assert breakdown == [{"category": "Meals", "total": 42.5}]
+
+    assert client.get("/auth/me", headers=employee_headers).json()["id"] == employee_id
+    assert client.get("/admin/dashboard-stats", headers=employee_headers).status_code == 403
+
+def test_rollback_does_not_break_the_cached_user(make_user):
+    employee_id = make_user("employee").id
+    admin_headers = make_user("admin").headers
+    slip = {"employee_id": employee_id, "month_year": "2024-07", "basic_salary": 1000}
+    assert client.post("/admin/salary-slips", headers=admin_headers, json=slip).status_code == 200
+
+    # The duplicate's rollback must not expire the user cached by this request
+    user_cache.clear()
+    assert client.post("/admin/salary-slips", headers=admin_headers, json=slip).status_code == 400
+    assert client.get("/admin/salary-slips", headers=admin_headers).status_code == 200
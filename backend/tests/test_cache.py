@@ -0,0 +1,90 @@
+import asyncio
+import time
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services.dashboard import ADMIN_STATS_KEY
+from app.utils.cache import LocalCacheBackend, RedisCacheBackend, ResponseCache, response_cache
+
+client = TestClient(app)
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def mget(self, *keys):
+        return [self.data.get(key) for key in keys]
+
+    def incr(self, key):
+        self.data[key] = int(self.data.get(key) or 0) + 1
+        return self.data[key]
+
+    def expire(self, key, seconds):
+        pass
+
+    def set(self, key, value, px=None):
+        self.data[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def scan_iter(self, pattern):
+        return [key for key in list(self.data) if key.startswith(pattern.rstrip("*"))]
+
+def test_local_backend_ttl_and_lru():
+    backend = LocalCacheBackend(max_entries=2)
+    backend.set("a", 1, 60)
+    backend.set("b", 2, 0.01)
+    backend.set("c", 3, 60)
+    assert backend.get("a") is None
+    time.sleep(0.02)
+    assert backend.get("b") is None
+    assert backend.get("c") == 3
+
+def test_response_cache_with_shared_backend():
+    cache = ResponseCache(RedisCacheBackend(FakeRedis()))
+    calls = []
+    factory = lambda: calls.append(1) or {"count": len(calls)}
+    assert cache.get_or_set("k", factory) == {"count": 1}
+    assert cache.get_or_set("k", factory) == {"count": 1}
+    cache.invalidate("k")
+    assert cache.get_or_set("k", factory) == {"count": 2}
+
+@pytest.mark.parametrize("backend", [LocalCacheBackend, lambda: RedisCacheBackend(FakeRedis())])
+def test_invalidation_during_compute_is_not_overwritten(backend):
+    cache = ResponseCache(backend())
+
+    def racing_factory():
+        # A commit lands while the stale value is being computed
+        cache.invalidate("k")
+        return "stale"
+
+    assert cache.get_or_set("k", racing_factory) == "stale"
+    assert cache.get("k") is None
+    assert cache.get_or_set("k", lambda: "fresh") == "fresh"
+    assert cache.get("k") == "fresh"
+
+    async def racing_async_factory():
+        cache.invalidate("k")
+        return "stale"
+
+    cache.invalidate("k")
+    assert asyncio.run(cache.get_or_set_async("k", racing_async_factory)) == "stale"
+    assert cache.get("k") is None
+
+def test_dashboard_stats_invalidated_by_writes(make_user):
+    headers = make_user("employee").headers
+
+    assert client.get("/employee/dashboard-stats", headers=headers).json()["total_expenses"] == 0
+    response_cache.set(ADMIN_STATS_KEY, {"stale": True})
+    client.post("/employee/expenses", headers=headers, json={
+        "amount": 5, "category": "Meals", "description": "Coffee", "expense_date": "2024-05-01"
+    })
+    assert response_cache.get(ADMIN_STATS_KEY) is None
+    stats = client.get("/employee/dashboard-stats", headers=headers).json()
+    assert stats["total_expenses"] == 1
+    assert stats["pending_expenses"] == 1
@@ -0,0 +1,97 @@
+import uuid
+from datetime import datetime
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect, text
+from app.main import app
+from app.services import change_feed
+from app.utils.migrations import MIGRATIONS, VERSION_1_INDEXES, run_migrations
+
+client = TestClient(app)
+
+def _ids(feed, employee_id):
+    return (
+        [slip["id"] for slip in feed["salary_slips"] if slip["employee_id"] == employee_id],
+        [expense["id"] for expense in feed["expenses"] if expense["employee_id"] == employee_id]
+    )
+
+def _drain(headers, **params):
+    """Follow the feed until it is caught up; returns every page's rows merged."""
+    merged = {"salary_slips": [], "expenses": []}
+    while True:
+        feed = client.get("/admin/changes", headers=headers, params=params).json()
+        merged["salary_slips"] += feed["salary_slips"]
+        merged["expenses"] += feed["expenses"]
+        params = {"cursor": feed["next_cursor"], "limit": params.get("limit", 100)}
+        if not feed["has_more"]:
+            return merged, feed["next_cursor"]
+
+def test_feed_returns_only_rows_changed_since_the_cursor(monkeypatch, make_user):
+    monkeypatch.setattr(change_feed.change_feed_service, "settle_seconds", 0)
+    employee_id, _, employee = make_user("employee")
+    admin = make_user("admin").headers
+    since = datetime.utcnow().isoformat()
+
+    slip = client.post("/admin/salary-slips", headers=admin, json={
+        "employee_id": employee_id, "month_year": f"2097-{uuid.uuid4().hex[:6]}", "basic_salary": 1000
+    }).json()
+    expense = client.post("/employee/expenses", headers=employee, json={
+        "amount": 12, "category": "Meals", "description": "x", "expense_date": "2024-05-01"
+    }).json()
+    assert expense["updated_at"] is not None
+
+    changes, cursor = _drain(admin, since=since, limit=1)
+    assert _ids(changes, employee_id) == ([slip["id"]], [expense["id"]])
+    assert _ids(_drain(admin, cursor=cursor)[0], employee_id) == ([], [])
+
+    client.patch(f"/admin/expenses/{expense['id']}", headers=admin, json={"status": "approved"})
+    changes, cursor = _drain(admin, cursor=cursor)
+    assert _ids(changes, employee_id) == ([], [expense["id"]])
+    assert [e["status"] for e in changes["expenses"] if e["id"] == expense["id"]] == ["approved"]
+
+    # Set-based updates move updated_at too
+    client.post("/admin/expenses/review", headers=admin, json={
+        "status": "rejected", "filter": {"current_status": "approved", "employee_id": employee_id}
+    })
+    client.put(f"/admin/salary-slips/{slip['id']}", headers=admin, json={"bonuses": 5})
+    changes, _ = _drain(admin, cursor=cursor)
+    assert _ids(changes, employee_id) == ([slip["id"]], [expense["id"]])
+
+def test_recent_writes_are_held_back_until_they_settle(monkeypatch, make_user):
+    monkeypatch.setattr(change_feed.change_feed_service, "settle_seconds", 3600)
+    employee_id, _, employee = make_user("employee")
+    admin = make_user("admin").headers
+    since = datetime.utcnow().isoformat()
+    client.post("/employee/expenses", headers=employee, json={
+        "amount": 12, "category": "Meals", "description": "x", "expense_date": "2024-05-01"
+    })
+    feed = client.get("/admin/changes", headers=admin, params={"since": since}).json()
+    assert _ids(feed, employee_id) == ([], [])
+    assert feed["next_cursor"] is not None
+    assert client.get("/admin/changes", headers=admin, params={"cursor": "nope"}).status_code == 400
+
+def test_expense_updated_at_is_added_and_backfilled(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    run_migrations(engine)
+    with engine.begin() as conn:
+        # A database from before the migrations: no stamps, no added indexes, no expenses.updated_at
+        for name, *_ in VERSION_1_INDEXES:
+            conn.execute(text(f"DROP INDEX {name}"))
+        conn.execute(text("DROP INDEX ix_expenses_updated_at"))
+        conn.execute(text("DROP INDEX ix_salary_slips_updated_at"))
+        conn.execute(text("ALTER TABLE expenses DROP COLUMN updated_at"))
+        conn.execute(text("DELETE FROM schema_migrations"))
+        conn.execute(text(
+            "INSERT INTO users (id, email, password_hash, role) VALUES (1, 'legacy@example.com', 'x', 'employee')"
+        ))
+        conn.execute(text(
+            "INSERT INTO expenses (employee_id, amount, category, description, expense_date, status, created_at) "
+            "VALUES (1, 1235, 'travel', 'Taxi', '2020-01-02', 'pending', '2020-01-03 10:00:00.000000')"
+        ))
+
+    run_migrations(engine)
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT max(version) FROM schema_migrations")).scalar() == MIGRATIONS[-1].version
+        assert conn.execute(text("SELECT updated_at FROM expenses")).scalar() == "2020-01-03 10:00:00.000000"
+    for table in ("expenses", "salary_slips"):
+        indexes = {index["name"]: index["column_names"] for index in inspect(engine).get_indexes(table)}
+        assert indexes[f"ix_{table}_updated_at"] == ["updated_at", "id"]
@@ -0,0 +1,45 @@
+from contextlib import contextmanager
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app.main import app
+from app.services.dashboard import dashboard_service
+from app.utils.database import SessionLocal, engine
+
+client = TestClient(app)
+
+@contextmanager
+def count_statements():
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+@pytest.mark.filterwarnings("error::sqlalchemy.exc.SAWarning")
+def test_admin_stats_single_query():
+    with SessionLocal() as db:
+        db.connection()
+        with count_statements() as statements:
+            stats = dashboard_service.compute_admin_stats(db)
+    assert len(statements) == 1
+    assert set(stats["expenses_by_status"]) == {"pending", "approved", "rejected"}
+    assert stats["pending_expenses"] == stats["expenses_by_status"]["pending"]["count"]
+
+def test_employee_stats_single_query(make_user):
+    employee_id, _, headers = make_user("employee")
+    for amount in (10, 15):
+        client.post("/employee/expenses", headers=headers, json={
+            "amount": amount, "category": "Meals", "description": "x", "expense_date": "2024-05-01"
+        })
+
+    with SessionLocal() as db:
+        db.connection()
+        with count_statements() as statements:
+            stats = dashboard_service.compute_employee_stats(db, employee_id, "2024-05")
+    assert len(statements) == 1
+    assert stats["total_expenses"] == 2
+    assert stats["expenses_by_status"]["pending"] == {"count": 2, "amount": 25.0}
+    assert stats["current_month_salary"] == 0
@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from app.main import app
+from app.utils.database import (
+    create_configured_engine, engine_options, pool_status, TimedQueuePool
+)
+
+client = TestClient(app)
+
+def test_memory_sqlite_keeps_default_pool():
+    assert "poolclass" not in engine_options("sqlite://", TimedQueuePool)
+    assert engine_options("sqlite:///./x.db", TimedQueuePool)["poolclass"] is TimedQueuePool
+
+def test_sqlite_pragmas_and_pool_stats(tmp_path):
+    engine = create_configured_engine(f"sqlite:///{tmp_path / 'pragmas.db'}")
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1
+        status = pool_status(engine)
+        assert status["checked_out"] == 1
+        assert status["checkouts"] == 1
+    assert pool_status(engine)["checked_out"] == 0
+
+def test_db_pool_endpoint_requires_admin(make_user):
+    response = client.get("/admin/db-pool", headers=make_user("admin").headers)
+    assert response.status_code == 200
+    assert "utilization" in response.json()["primary"]
+
+def test_importing_the_app_does_not_touch_the_database(tmp_path):
+    database = tmp_path / "untouched.db"
+    probe = "import app.main, app.utils.database as d; print(d._engine is None)"
+    output = subprocess.run(
+        [sys.executable, "-c", probe], capture_output=True, text=True, check=True,
+        env={**os.environ, "DATABASE_URL": f"sqlite:///{database}"}
+    ).stdout
+    assert output.strip() == "True"
+    assert not database.exists()
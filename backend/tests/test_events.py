@@ -0,0 +1,197 @@
+import asyncio
+import json
+import queue
+import threading
+import time
+import uuid
+from functools import partial
+from fastapi.testclient import TestClient
+from jose import jwt
+from app.config import settings
+from app.main import app
+from app.models.user import User
+from app.routes.events import event_stream, still_authorized
+from app.services.events import EventHub, RedisBroker, event_hub
+from app.utils.auth import create_access_token
+from app.utils.database import SessionLocal
+
+client = TestClient(app)
+
+class FakeRedis:
+    """Pub/sub stand-in: every published message reaches every subscriber."""
+
+    def __init__(self):
+        self.subscribers = []
+
+    def publish(self, channel, data):
+        for pubsub in self.subscribers:
+            if channel in pubsub.channels:
+                pubsub.messages.put({"type": "message", "channel": channel, "data": data.encode()})
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        pubsub = FakePubSub()
+        self.subscribers.append(pubsub)
+        return pubsub
+
+class FakePubSub:
+    def __init__(self):
+        self.channels = set()
+        self.messages = queue.Queue()
+
+    def subscribe(self, channel):
+        self.channels.add(channel)
+
+    def get_message(self, timeout=0):
+        try:
+            return self.messages.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        pass
+
+def _change(employee_id, entity_id=1, action="updated"):
+    return {"entity": "expense", "id": entity_id, "employee_id": employee_id, "action": action}
+
+def test_hub_routes_changes_to_owners_and_admins():
+    async def scenario():
+        hub = EventHub(queue_size=2)
+        admin = hub.subscribe(1, True)
+        owner = hub.subscribe(7, False)
+        other = hub.subscribe(8, False)
+        # Commits are published from request threads
+        publisher = threading.Thread(target=hub.deliver, args=([_change(7), _change(9)],))
+        publisher.start()
+        publisher.join()
+
+        assert await admin.next(1) == [_change(7), _change(9)]
+        assert await owner.next(1) == [_change(7)]
+        assert await other.next(0.05) is None
+
+        for n in range(3):
+            hub._fan_out([_change(7, entity_id=n)])
+        assert owner.dropped == 1
+        assert await owner.next(1) == [_change(7, entity_id=1)]
+
+        for subscription in (admin, owner, other):
+            hub.unsubscribe(subscription)
+        assert hub.connections() == 0
+
+    asyncio.run(scenario())
+
+def test_commits_are_pushed_to_subscribers(make_user):
+    employee_id, _, employee = make_user("employee")
+    admin_id, _, admin = make_user("admin")
+
+    async def scenario():
+        own = event_hub.subscribe(employee_id, False)
+        everything = event_hub.subscribe(admin_id, True)
+        try:
+            expense = (await asyncio.to_thread(client.post, "/employee/expenses", headers=employee, json={
+                "amount": 12, "category": "Meals", "description": "x", "expense_date": "2024-05-01"
+            })).json()
+            created = _change(employee_id, expense["id"], "created")
+            assert await own.next(2) == [created]
+
+            await asyncio.to_thread(
+                client.patch, f"/admin/expenses/{expense['id']}", headers=admin, json={"status": "approved"}
+            )
+            assert await own.next(2) == [_change(employee_id, expense["id"])]
+
+            slip = (await asyncio.to_thread(client.post, "/admin/salary-slips", headers=admin, json={
+                "employee_id": employee_id, "month_year": f"2096-{uuid.uuid4().hex[:6]}", "basic_salary": 1000
+            })).json()
+            assert await own.next(2) == [
+                {"entity": "salary_slip", "id": slip["id"], "employee_id": employee_id, "action": "created"}
+            ]
+
+            seen = []
+            while (changes := await everything.next(0.5)) is not None:
+                seen.extend(changes)
+            assert created in seen
+        finally:
+            event_hub.unsubscribe(own)
+            event_hub.unsubscribe(everything)
+
+    asyncio.run(scenario())
+
+def test_stream_formats_events_and_heartbeats():
+    async def scenario():
+        stream = event_stream(42, False, heartbeat_seconds=0.05)
+        assert await stream.__anext__() == "retry: 5000\n\n"
+        assert await stream.__anext__() == ": keepalive\n\n"
+        connections = event_hub.connections()
+        event_hub.deliver([_change(42)])
+        assert await stream.__anext__() == f"event: changes\ndata: {json.dumps([_change(42)])}\n\n"
+        await stream.aclose()
+        assert event_hub.connections() == connections - 1
+
+    asyncio.run(scenario())
+
+def test_redis_broker_fans_out_across_workers():
+    redis = FakeRedis()
+
+    async def scenario():
+        workers = [EventHub(), EventHub()]
+        brokers = [RedisBroker(redis, hub) for hub in workers]
+        subscriptions = [hub.subscribe(1, True) for hub in workers]
+        for broker in brokers:
+            broker.start()
+        try:
+            await asyncio.to_thread(brokers[0].publish, [_change(3)])
+            for subscription in subscriptions:
+                assert await subscription.next(2) == [_change(3)]
+        finally:
+            for broker in brokers:
+                await asyncio.to_thread(broker.stop)
+
+    asyncio.run(scenario())
+
+def test_stream_requires_a_token():
+    assert client.get("/events/stream").status_code == 401
+    assert client.get("/events/stream", params={"access_token": "invalid"}).status_code == 401
+
+def test_stream_ends_when_the_token_expires(monkeypatch, make_user):
+    monkeypatch.setattr(settings, "EVENTS_HEARTBEAT_SECONDS", 0.05)
+    user = make_user("employee")
+    token = jwt.encode(
+        {"sub": str(user.id), "role": "employee", "exp": int(time.time()) + 1},
+        settings.SECRET_KEY, algorithm=settings.ALGORITHM
+    )
+    started = time.monotonic()
+    # The test client returns once the stream has ended
+    response = client.get("/events/stream", params={"access_token": token})
+    assert response.status_code == 200
+    assert response.text.startswith("retry: 5000")
+    assert time.monotonic() - started < 5
+
+def test_stream_ends_when_the_user_is_demoted_or_deleted(make_user):
+    def demote(user_id):
+        with SessionLocal() as db:
+            db.get(User, user_id).role = "employee"
+            db.commit()
+
+    def delete(user_id):
+        with SessionLocal() as db:
+            db.delete(db.get(User, user_id))
+            db.commit()
+
+    async def frames_until_closed(change):
+        user = await asyncio.to_thread(make_user, "admin")
+        token = create_access_token({"sub": user.id, "role": "admin"})
+        stream = event_stream(
+            user.id, True, heartbeat_seconds=0.05, authorize=partial(still_authorized, token, "admin")
+        )
+        frames = [await stream.__anext__(), await stream.__anext__()]
+        await asyncio.to_thread(change, user.id)
+        # A busy stream must still be re-checked
+        for _ in range(20):
+            event_hub.deliver([_change(1)])
+            await asyncio.sleep(0.01)
+        async for frame in stream:
+            frames.append(frame)
+        return frames
+
+    for change in (demote, delete):
+        frames = asyncio.run(asyncio.wait_for(frames_until_closed(change), 5))
+        assert frames[:2] == ["retry: 5000\n\n", ": keepalive\n\n"]
@@ -0,0 +1,86 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import func
+from app.main import app
+from app.models.aggregates import ExpenseTotal
+from app.models.expense import Expense
+from app.models.outbox import OutboxMessage
+from app.utils.database import SessionLocal
+
+client = TestClient(app)
+
+def _submit(headers, amount, category):
+    return client.post("/employee/expenses", headers=headers, json={
+        "amount": amount, "category": category, "description": "x", "expense_date": "2024-05-01"
+    }).json()["id"]
+
+def _statuses(ids):
+    with SessionLocal() as db:
+        return dict(db.query(Expense.id, Expense.status).filter(Expense.id.in_(ids)).all())
+
+def test_batch_review_by_ids_updates_totals_and_notifies(make_user):
+    employee_id, email, employee = make_user("employee")
+    admin_id, _, admin = make_user("admin")
+    ids = [_submit(employee, amount, "Meals") for amount in (10, 20, 30)]
+    client.patch(f"/admin/expenses/{ids[2]}", headers=admin, json={"status": "rejected"})
+
+    response = client.post("/admin/expenses/review", headers=admin, json={
+        "status": "approved", "ids": ids + [999999999]
+    })
+    assert response.status_code == 200
+    assert response.json() == {
+        "status": "approved", "updated": 2, "updated_ids": ids[:2], "skipped_ids": [ids[2], 999999999]
+    }
+    assert _statuses(ids) == {ids[0]: "approved", ids[1]: "approved", ids[2]: "rejected"}
+
+    with SessionLocal() as db:
+        reviewed = db.query(Expense).filter(Expense.id == ids[0]).one()
+        assert reviewed.reviewed_by == admin_id and reviewed.reviewed_at is not None
+        totals = {
+            row.status: (row.total_amount, row.expense_count)
+            for row in db.query(ExpenseTotal).filter(ExpenseTotal.employee_id == employee_id)
+        }
+        assert totals == {"pending": (0, 0), "approved": (30, 2), "rejected": (30, 1)}
+        subjects = db.query(OutboxMessage.subject).filter(OutboxMessage.recipient == email).all()
+        assert subjects.count(("Expense Request Approved",)) == 2
+
+def test_batch_review_by_filter(make_user):
+    employee_id, _, employee = make_user("employee")
+    admin = make_user("admin").headers
+    small_travel = _submit(employee, 49.99, "Travel")
+    large_travel = _submit(employee, 50.01, "Travel")
+    small_meal = _submit(employee, 5, "Meals")
+
+    response = client.post("/admin/expenses/review", headers=admin, json={
+        "status": "approved",
+        "filter": {"category": "Travel", "max_amount": 50, "employee_id": employee_id}
+    }).json()
+    assert response["updated_ids"] == [small_travel]
+    assert "skipped_ids" not in response
+    assert _statuses([small_travel, large_travel, small_meal]) == {
+        small_travel: "approved", large_travel: "pending", small_meal: "pending"
+    }
+
+    with SessionLocal() as db:
+        base = db.query(func.count(Expense.id)).filter(
+            Expense.employee_id == employee_id, Expense.status == "approved"
+        ).scalar()
+        summary = db.query(func.sum(ExpenseTotal.expense_count)).filter(
+            ExpenseTotal.employee_id == employee_id, ExpenseTotal.status == "approved"
+        ).scalar()
+        assert base == summary == 1
+
+def test_batch_review_requires_ids_or_filter(make_user):
+    admin = make_user("admin").headers
+    assert client.post("/admin/expenses/review", headers=admin, json={"status": "approved"}).status_code == 400
+    assert client.post("/admin/expenses/review", headers=admin, json={
+        "status": "pending", "filter": {}
+    }).status_code == 400
+
+def test_batch_review_rejects_unknown_statuses(make_user):
+    admin = make_user("admin").headers
+    assert client.post("/admin/expenses/review", headers=admin, json={
+        "status": "paid", "ids": [1]
+    }).status_code == 422
+    assert client.post("/admin/expenses/review", headers=admin, json={
+        "status": "approved", "filter": {"current_status": "Pending"}
+    }).status_code == 422
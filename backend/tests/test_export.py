@@ -0,0 +1,24 @@
+import csv
+from io import StringIO
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services.export import export_service, SALARY_SLIP_HEADERS
+from app.utils.database import SessionLocal
+
+client = TestClient(app)
+
+def test_stream_yields_header_then_row_chunks():
+    chunks = list(export_service.stream_salary_slips_csv(SessionLocal, chunk_size=2))
+    assert all(isinstance(chunk, bytes) for chunk in chunks)
+    rows = list(csv.reader(StringIO(b"".join(chunks).decode("utf-8"))))
+    assert rows[0] == SALARY_SLIP_HEADERS
+    for chunk in chunks[1:]:
+        assert len(list(csv.reader(StringIO(chunk.decode("utf-8"))))) <= 2
+
+def test_export_endpoints_stream_csv(make_user):
+    headers = make_user("admin").headers
+    for path in ("/admin/salary-slips/export", "/admin/expenses/export"):
+        response = client.get(path, headers=headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert response.text.splitlines()[0].startswith("ID,Employee ID")
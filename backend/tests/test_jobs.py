@@ -0,0 +1,119 @@
+import threading
+import time
+import uuid
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services.jobs import job_handler
+
+client = TestClient(app)
+
+release = threading.Event()
+started = threading.Event()
+
+@job_handler("test_blocking")
+def _blocking_job(ctx):
+    started.set()
+    while not release.wait(0.01):
+        ctx.progress(0.5, 1, "waiting")
+    return {"released": True}
+
+def _wait_for(job_id, headers, timeout=10):
+    deadline = time.monotonic() + timeout
+    while True:
+        job = client.get(f"/jobs/{job_id}", headers=headers).json()
+        if job["status"] in ("succeeded", "failed", "cancelled") or time.monotonic() > deadline:
+            return job
+        time.sleep(0.05)
+
+def _submit_blocking(admin_id):
+    from app.services.jobs import job_service
+    from app.utils.database import SessionLocal
+    with SessionLocal() as db:
+        return job_service.submit(db, "test_blocking", created_by=admin_id).id
+
+def test_background_payroll_run_reports_result(make_user):
+    employee_id = make_user("employee").id
+    admin = make_user("admin").headers
+    month = f"2099-{uuid.uuid4().hex[:6]}"
+
+    response = client.post("/admin/payroll-runs?background=true", headers=admin, json={
+        "month_year": month,
+        "items": [{"employee_id": employee_id, "basic_salary": 1000, "tax": 100}]
+    })
+    assert response.status_code == 202
+    body = response.json()
+    assert response.headers["Location"] == body["status_url"] == f"/jobs/{body['job_id']}"
+
+    job = _wait_for(body["job_id"], admin)
+    assert job["status"] == "succeeded"
+    assert job["kind"] == "payroll_run"
+    assert job["progress"] == 1.0
+    assert job["result"]["created"] == 1
+
+    slips = client.get(f"/admin/salary-slips?month_year={month}", headers=admin).json()
+    assert [slip["net_salary"] for slip in slips] == [900]
+
+def test_background_import_runs_without_persisting_passwords(make_user):
+    admin = make_user("admin").headers
+    email = f"jobs-import-{uuid.uuid4().hex[:12]}@example.com"
+    response = client.post("/admin/employees/import?background=true", headers=admin, json={
+        "users": [{"email": email, "password": "secret-pass-1"}]
+    })
+    assert response.status_code == 202
+
+    job = _wait_for(response.json()["job_id"], admin)
+    assert job["status"] == "succeeded"
+    assert job["result"]["created"] == 1
+    assert "secret-pass-1" not in str(job)
+    login = client.post("/auth/login", json={"email": email, "password": "secret-pass-1"})
+    assert login.status_code == 200
+
+def test_background_export_result_is_downloadable(make_user):
+    admin = make_user("admin").headers
+    response = client.get("/admin/expenses/export?background=true", headers=admin)
+    assert response.status_code == 202
+
+    job = _wait_for(response.json()["job_id"], admin)
+    assert job["status"] == "succeeded"
+    assert "file" not in job["result"]
+    assert job["result_url"] == f"/jobs/{job['id']}/result"
+
+    download = client.get(job["result_url"], headers=admin)
+    assert download.status_code == 200
+    assert download.headers["content-type"].startswith("text/csv")
+    assert download.text.startswith("ID,Employee ID,Amount")
+
+def test_running_job_can_be_cancelled(make_user):
+    admin_id, _, admin = make_user("admin")
+    release.clear()
+    started.clear()
+    job_id = _submit_blocking(admin_id)
+    assert started.wait(5)
+
+    response = client.post(f"/jobs/{job_id}/cancel", headers=admin)
+    assert response.status_code == 200
+    assert response.json()["cancel_requested"] is True
+
+    job = _wait_for(job_id, admin)
+    assert job["status"] == "cancelled"
+    assert job["progress"] == 0.5
+    assert client.post(f"/jobs/{job_id}/cancel", headers=admin).status_code == 409
+
+def test_jobs_are_private_to_their_creator_and_admins(make_user):
+    admin_id, _, admin = make_user("admin")
+    other_admin = make_user("admin").headers
+    employee = make_user("employee").headers
+    release.set()
+    job_id = _submit_blocking(admin_id)
+
+    assert client.get(f"/jobs/{job_id}", headers=employee).status_code == 404
+    assert client.post(f"/jobs/{job_id}/cancel", headers=employee).status_code == 404
+    assert client.get(f"/jobs/{job_id}", headers=other_admin).status_code == 200
+    assert [job["id"] for job in client.get("/jobs", headers=admin).json()] == [job_id]
+    assert client.get("/jobs", headers=employee).json() == []
+    assert _wait_for(job_id, admin)["status"] == "succeeded"
+
+def test_background_requires_admin(make_user):
+    employee = make_user("employee").headers
+    response = client.post("/admin/analytics/rebuild?background=true", headers=employee)
+    assert response.status_code == 403
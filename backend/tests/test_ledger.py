@@ -0,0 +1,125 @@
+import uuid
+from decimal import Decimal
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text, update
+from app.main import app
+from app.models.aggregates import MonthlySalaryTotal
+from app.models.salary_slip import SalarySlip
+from app.models.user import Base
+from app.utils.database import SessionLocal
+from app.utils.migrations import MIGRATIONS, MONEY_COLUMNS, run_migrations
+from app.utils.money import from_cents, money, to_cents
+
+client = TestClient(app)
+
+def test_money_rounds_to_the_cent():
+    assert to_cents(0.1 + 0.2) == 30
+    assert to_cents(19.999) == 2000
+    assert to_cents(Decimal("2.675")) == 268
+    assert from_cents(123456) == Decimal("1234.56")
+    assert money(0.1) + money(0.2) == Decimal("0.30")
+
+def test_net_salary_and_totals_are_exact(make_user):
+    employee_id = make_user("employee").id
+    admin = make_user("admin").headers
+    month = f"2098-{uuid.uuid4().hex[:6]}"
+
+    slip = client.post("/admin/salary-slips", headers=admin, json={
+        "employee_id": employee_id, "month_year": month,
+        "basic_salary": 0.1, "allowances": 0.2, "deductions": 0.3
+    }).json()
+    assert slip["net_salary"] == 0.0
+    assert slip["allowances"] == 0.2
+
+    with SessionLocal() as db:
+        stored = db.get(SalarySlip, slip["id"])
+        assert stored.net_salary == Decimal("0.00")
+        assert db.get(MonthlySalaryTotal, month).total_net_salary == Decimal("0.00")
+
+def test_recompute_reports_and_repairs_drift(make_user):
+    employee_id = make_user("employee").id
+    other_id = make_user("employee").id
+    admin = make_user("admin").headers
+    month = f"2098-{uuid.uuid4().hex[:6]}"
+    client.post("/admin/payroll-runs", headers=admin, json={
+        "month_year": month,
+        "items": [
+            {"employee_id": employee_id, "basic_salary": 3000.10, "bonuses": 99.99, "tax": 300.01},
+            {"employee_id": other_id, "basic_salary": 2500, "deductions": 25.5}
+        ]
+    })
+
+    clean = client.post(f"/admin/payroll-runs/{month}/recompute", headers=admin).json()
+    assert clean["slips"] == 2
+    assert clean["mismatched"] == 0
+    assert clean["summary_consistent"] is True
+    assert clean["recomputed_total"] == 5274.58
+
+    # Simulate drift written behind the ORM's back
+    with SessionLocal() as db:
+        db.execute(
+            update(SalarySlip.__table__)
+            .where(SalarySlip.__table__.c.employee_id == employee_id, SalarySlip.__table__.c.month_year == month)
+            .values(net_salary=Decimal("2800.07"))
+        )
+        db.commit()
+
+    report = client.post(f"/admin/payroll-runs/{month}/recompute", headers=admin).json()
+    assert report["mismatched"] == 1
+    assert report["mismatches"][0]["employee_id"] == employee_id
+    assert report["mismatches"][0]["expected_net_salary"] == 2800.08
+    assert report["mismatches"][0]["difference"] == -0.01
+    assert report["applied"] is False
+
+    fixed = client.post(f"/admin/payroll-runs/{month}/recompute?apply=true", headers=admin).json()
+    assert fixed["applied"] is True
+    after = client.post(f"/admin/payroll-runs/{month}/recompute", headers=admin).json()
+    assert after["mismatched"] == 0
+    assert after["summary_consistent"] is True
+    assert after["summary_total"] == 5274.58
+
+def test_float_columns_are_migrated_to_cents(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    run_migrations(engine)
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM schema_migrations WHERE version = 3"))
+        # Money columns were FLOAT before version 3
+        for table, columns in MONEY_COLUMNS.items():
+            for column in columns:
+                conn.execute(text(f"ALTER TABLE {table} DROP COLUMN {column}"))
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} FLOAT"))
+        conn.execute(text(
+            "INSERT INTO users (id, email, password_hash, role) VALUES (1, 'legacy@example.com', 'x', 'employee')"
+        ))
+        conn.execute(text(
+            "INSERT INTO salary_slips (employee_id, month_year, basic_salary, allowances, deductions, "
+            "bonuses, tax, net_salary, created_by) VALUES (1, '2020-01', 1000.1, 0.2, 0, 0, 100.05, 900.25, 1)"
+        ))
+        conn.execute(text(
+            "INSERT INTO expenses (employee_id, amount, category, description, expense_date, status) "
+            "VALUES (1, 12.345, 'travel', 'Taxi', '2020-01-02', 'pending')"
+        ))
+
+    run_migrations(engine)
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT max(version) FROM schema_migrations")).scalar() == MIGRATIONS[-1].version
+        assert conn.execute(text("SELECT basic_salary, tax, net_salary FROM salary_slips")).one() == (100010, 10005, 90025)
+        assert conn.execute(text("SELECT amount FROM expenses")).scalar() == 1235
+        assert conn.execute(text("SELECT total_net_salary FROM monthly_salary_totals")).scalar() == 90025
+
+def test_schema_from_create_all_is_not_converted_twice(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'seeded.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO users (id, email, password_hash, role) VALUES (1, 'seeded@example.com', 'x', 'employee')"
+        ))
+        conn.execute(text(
+            "INSERT INTO expenses (employee_id, amount, category, description, expense_date, status) "
+            "VALUES (1, 1235, 'travel', 'Taxi', '2020-01-02', 'pending')"
+        ))
+
+    run_migrations(engine)
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT max(version) FROM schema_migrations")).scalar() == MIGRATIONS[-1].version
+        assert conn.execute(text("SELECT amount FROM expenses")).scalar() == 1235
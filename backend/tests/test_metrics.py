@@ -0,0 +1,30 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from app.utils.metrics import Histogram, metrics
+
+client = TestClient(app)
+
+def test_histogram_quantiles():
+    histogram = Histogram((0.01, 0.1, 1))
+    for value in [0.005] * 90 + [0.5] * 10:
+        histogram.observe(value)
+    assert histogram.quantile(0.5) < 0.01
+    assert 0.1 < histogram.quantile(0.99) <= 1
+    assert histogram.count == 100
+
+def test_metrics_record_route_latency_and_queries(make_user):
+    headers = make_user("admin").headers
+    metrics.reset()
+
+    client.get("/admin/salary-slips", headers=headers)
+    client.get("/no-such-path", headers=headers)
+
+    body = client.get("/metrics").text
+    assert 'http_requests_total{method="GET",route="/admin/salary-slips",status="200"} 1' in body
+    assert 'route="unmatched",status="404"' in body
+    assert 'http_request_duration_seconds_count{method="GET",route="/admin/salary-slips"} 1' in body
+    assert "http_requests_in_flight" in body
+
+    summary = {row["route"]: row for row in client.get("/admin/metrics", headers=headers).json()}
+    assert summary["/admin/salary-slips"]["count"] == 1
+    assert summary["/admin/salary-slips"]["avg_queries"] >= 1
@@ -0,0 +1,130 @@
+import smtplib
+import uuid
+from datetime import date, datetime
+from fastapi.testclient import TestClient
+from app.main import app
+from app.models.expense import Expense
+from app.models.outbox import OutboxMessage
+from app.services.email import EmailService
+from app.services.outbox import OutboxDispatcher
+from app.utils.database import SessionLocal
+
+client = TestClient(app)
+
+class FakeSMTP:
+    """Local SMTP stand-in recording delivered messages."""
+    delivered = []
+    connections = 0
+    refuse = set()
+
+    def __init__(self):
+        FakeSMTP.connections += 1
+
+    def send_message(self, message):
+        if message["To"] in self.refuse:
+            raise smtplib.SMTPRecipientsRefused({message["To"]: (550, b"No such user")})
+        self.delivered.append(message)
+
+    def noop(self):
+        return (250, b"OK")
+
+    def quit(self):
+        pass
+
+    def close(self):
+        pass
+
+def _dispatcher(factory=FakeSMTP, **options):
+    return OutboxDispatcher(SessionLocal, EmailService(smtp_factory=factory), connections=2, **options)
+
+def _drain(dispatcher):
+    while dispatcher.dispatch_once():
+        pass
+
+def _messages(recipient):
+    with SessionLocal() as db:
+        return db.query(OutboxMessage).filter(OutboxMessage.recipient == recipient).all()
+
+def test_routes_enqueue_and_dispatcher_delivers_over_pooled_connections(make_user):
+    employee_id, employee_email, employee = make_user("employee")
+    admin = make_user("admin").headers
+
+    client.post("/admin/salary-slips", headers=admin, json={
+        "employee_id": employee_id, "month_year": "2024-05", "basic_salary": 1000,
+        "allowances": 0, "deductions": 0, "bonuses": 0, "tax": 0
+    })
+    expense = client.post("/employee/expenses", headers=employee, json={
+        "amount": 20, "category": "travel", "description": "taxi", "expense_date": "2024-05-02"
+    }).json()
+    client.patch(f"/admin/expenses/{expense['id']}", headers=admin, json={"status": "approved"})
+
+    queued = _messages(employee_email)
+    assert sorted(m.subject for m in queued) == ["Expense Request Approved", "Salary Slip Generated - 2024-05"]
+    assert all(m.status == "pending" for m in queued)
+
+    FakeSMTP.connections = 0
+    _drain(_dispatcher())
+    assert all(m.status == "sent" and m.sent_at for m in _messages(employee_email))
+    assert {m["To"] for m in FakeSMTP.delivered} >= {employee_email}
+    assert FakeSMTP.connections <= 2
+
+def test_payroll_run_enqueues_one_notification_per_slip(make_user):
+    employee_ids, emails = [], []
+    for _ in range(3):
+        employee_id, email, _ = make_user("employee")
+        employee_ids.append(employee_id)
+        emails.append(email)
+    admin = make_user("admin").headers
+    client.post("/admin/payroll-runs", headers=admin, json={
+        "month_year": "2024-06",
+        "items": [{"employee_id": employee_id, "basic_salary": 1000} for employee_id in employee_ids]
+    })
+    assert [len(_messages(email)) for email in emails] == [1, 1, 1]
+
+def test_failures_are_retried_with_backoff_or_failed_permanently():
+    transient = f"transient-{uuid.uuid4().hex[:12]}@example.com"
+    refused = f"refused-{uuid.uuid4().hex[:12]}@example.com"
+    with SessionLocal() as db:
+        db.add_all([
+            OutboxMessage(recipient=transient, subject="s", body="b"),
+            OutboxMessage(recipient=refused, subject="s", body="b")
+        ])
+        db.commit()
+
+    def unreachable():
+        raise ConnectionRefusedError("SMTP server down")
+
+    _dispatcher(unreachable, retry_base_seconds=60).dispatch_once()
+    deferred = _messages(transient)[0]
+    assert deferred.status == "pending" and deferred.attempts == 1
+    assert deferred.next_attempt_at > datetime.utcnow()
+    assert "ConnectionRefusedError" in deferred.last_error
+
+    with SessionLocal() as db:
+        db.query(OutboxMessage).filter(OutboxMessage.recipient.in_([transient, refused])).update(
+            {"next_attempt_at": datetime.utcnow()}
+        )
+        db.commit()
+    FakeSMTP.refuse = {refused}
+    try:
+        _drain(_dispatcher())
+    finally:
+        FakeSMTP.refuse = set()
+    assert _messages(transient)[0].status == "sent"
+    assert _messages(refused)[0].status == "failed"
+
+def test_status_change_without_recipient_skips_notification(make_user):
+    admin = make_user("admin").headers
+    with SessionLocal() as db:
+        # An expense left behind by a user that no longer exists
+        expense = Expense(
+            employee_id=10 ** 9, amount=25, category="Travel", description="orphan",
+            expense_date=date(2024, 5, 1), status="pending"
+        )
+        db.add(expense)
+        db.commit()
+        expense_id = expense.id
+
+    response = client.patch(f"/admin/expenses/{expense_id}", headers=admin, json={"status": "approved"})
+    assert response.status_code == 200
+    assert response.json()["status"] == "approved"
@@ -0,0 +1,65 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from app.config import settings
+from app.utils.pagination import encode_cursor, decode_cursor
+
+client = TestClient(app)
+
+def test_cursor_round_trip():
+    from datetime import datetime
+    created_at = datetime(2024, 3, 1, 12, 30, 15, 123456)
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+def test_invalid_cursor_rejected(make_user):
+    response = client.get("/employee/expenses", headers=make_user("employee").headers, params={"cursor": "%%%"})
+    assert response.status_code == 400
+
+def test_keyset_pages_cover_all_rows_once(make_user):
+    headers = make_user("employee").headers
+    for i in range(5):
+        client.post("/employee/expenses", headers=headers, json={
+            "amount": 10 + i,
+            "category": "Travel" if i % 2 else "Meals",
+            "description": f"Expense {i}",
+            "expense_date": "2024-03-0%d" % (i + 1)
+        })
+
+    seen = []
+    params = {"limit": 2}
+    while True:
+        response = client.get("/employee/expenses", headers=headers, params=params)
+        assert response.status_code == 200
+        assert len(response.json()) <= 2
+        seen.extend(e["id"] for e in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        params = {"limit": 2, "cursor": cursor}
+
+    assert len(seen) == 5
+    assert seen == sorted(seen, reverse=True)
+
+    travel = client.get("/employee/expenses", headers=headers, params={"category": "Travel"}).json()
+    assert {e["category"] for e in travel} == {"Travel"}
+    assert len(travel) == 2
+
+    ranged = client.get("/employee/expenses", headers=headers, params={
+        "date_from": "2024-03-02", "date_to": "2024-03-03"
+    }).json()
+    assert len(ranged) == 2
+
+def test_unpaginated_by_default(monkeypatch, make_user):
+    monkeypatch.setattr(settings, "DEFAULT_PAGE_SIZE", 2)
+    headers = make_user("employee").headers
+    for i in range(3):
+        client.post("/employee/expenses", headers=headers, json={
+            "amount": 10 + i, "category": "Meals", "description": f"Expense {i}", "expense_date": "2024-03-01"
+        })
+
+    everything = client.get("/employee/expenses", headers=headers)
+    assert len(everything.json()) == 3
+    assert "X-Next-Cursor" not in everything.headers
+
+    first = client.get("/employee/expenses", headers=headers, params={"limit": 2})
+    rest = client.get("/employee/expenses", headers=headers, params={"cursor": first.headers["X-Next-Cursor"]})
+    assert [e["id"] for e in first.json() + rest.json()] == [e["id"] for e in everything.json()]
@@ -0,0 +1,46 @@
+import asyncio
+import threading
+import time
+import pytest
+from app.utils.password_hasher import PasswordHasher, PasswordHasherBusy
+
+@pytest.mark.parametrize("use_processes", [False, True])
+def test_hash_and_verify(use_processes):
+    hasher = PasswordHasher(workers=2, rounds=4, use_processes=use_processes)
+    try:
+        hashed = asyncio.run(hasher.hash("s3cret"))
+        assert hashed.startswith("$2b$04$")
+        assert asyncio.run(hasher.verify("s3cret", hashed))
+        assert not asyncio.run(hasher.verify("wrong", hashed))
+        assert len(hasher.hash_many(["a", "b", "c"])) == 3
+    finally:
+        hasher.shutdown()
+
+def test_admission_control_sheds_excess_load():
+    hasher = PasswordHasher(workers=1, max_pending=2, rounds=10, use_processes=False)
+
+    async def storm():
+        return await asyncio.gather(*(hasher.hash("pw") for _ in range(5)), return_exceptions=True)
+
+    try:
+        results = asyncio.run(storm())
+    finally:
+        hasher.shutdown()
+    assert sum(isinstance(r, PasswordHasherBusy) for r in results) == 3
+    assert hasher.pending == 0
+
+def test_verify_is_not_queued_behind_an_import():
+    hasher = PasswordHasher(workers=1, bulk_workers=1, rounds=4, use_processes=False)
+    hashed = asyncio.run(hasher.hash("s3cret"))
+    hasher.rounds = 10
+    importing = threading.Thread(target=hasher.hash_many, args=(["pw"] * 40,))
+    try:
+        importing.start()
+        time.sleep(0.05)
+        started = time.monotonic()
+        assert asyncio.run(hasher.verify("s3cret", hashed))
+        assert importing.is_alive()
+        assert time.monotonic() - started < 1
+    finally:
+        importing.join()
+        hasher.shutdown()
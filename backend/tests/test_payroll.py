@@ -0,0 +1,70 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect, text
+from app.main import app
+from app.utils.migrations import VERSION_1_INDEXES, run_migrations
+
+client = TestClient(app)
+
+def test_payroll_run_items_and_errors(make_user):
+    headers = make_user("admin").headers
+    employee_id = make_user("employee").id
+
+    response = client.post("/admin/payroll-runs", headers=headers, json={
+        "month_year": "2024-02",
+        "items": [
+            {"employee_id": employee_id, "basic_salary": 5000, "allowances": 500,
+             "bonuses": 200, "deductions": 100, "tax": 600},
+            {"employee_id": employee_id, "basic_salary": 5000},
+            {"employee_id": -1, "basic_salary": 5000}
+        ]
+    })
+    assert response.status_code == 200
+    data = response.json()
+    assert data["requested"] == 3
+    assert data["created"] == 1
+    assert [e["index"] for e in data["errors"]] == [1, 2]
+
+    created = client.get("/admin/salary-slips", headers=headers, params={
+        "employee_id": employee_id, "month_year": "2024-02"
+    }).json()
+    assert len(created) == 1
+    assert created[0]["net_salary"] == 5000.0
+
+    rerun = client.post("/admin/payroll-runs", headers=headers, json={
+        "month_year": "2024-02",
+        "items": [{"employee_id": employee_id, "basic_salary": 5000}]
+    }).json()
+    assert rerun["created"] == 0
+    assert "already exists" in rerun["errors"][0]["error"]
+
+def test_payroll_run_requires_items_or_template(make_user):
+    response = client.post(
+        "/admin/payroll-runs",
+        headers=make_user("admin").headers,
+        json={"month_year": "2024-02"}
+    )
+    assert response.status_code == 400
+
+def test_duplicate_salary_slip_rejected(make_user):
+    headers = make_user("admin").headers
+    employee_id = make_user("employee").id
+    slip = {"employee_id": employee_id, "month_year": "2024-03", "basic_salary": 4000}
+
+    assert client.post("/admin/salary-slips", headers=headers, json=slip).status_code == 200
+    response = client.post("/admin/salary-slips", headers=headers, json=slip)
+    assert response.status_code == 400
+    assert "already exists" in response.json()["detail"]
+
+def test_migration_1_creates_its_own_indexes(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    run_migrations(engine)
+    with engine.begin() as conn:
+        for name, *_ in VERSION_1_INDEXES:
+            conn.execute(text(f"DROP INDEX {name}"))
+        conn.execute(text("DELETE FROM schema_migrations WHERE version = 1"))
+
+    run_migrations(engine)
+    inspector = inspect(engine)
+    for name, table, columns, unique in VERSION_1_INDEXES:
+        index = next(index for index in inspector.get_indexes(table) if index["name"] == name)
+        assert (tuple(index["column_names"]), bool(index["unique"])) == (columns, unique)
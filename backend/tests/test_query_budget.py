@@ -0,0 +1,72 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.utils.cache import response_cache
+from app.utils.query_budget import QueryBudget, QueryBudgetExceeded
+
+client = TestClient(app)
+
+@pytest.fixture(scope="module")
+def seeded(make_user):
+    employee_id, _, employee = make_user("employee")
+    admin = make_user("admin").headers
+    # Warm the user cache so budgets measure the endpoint, not authentication
+    for headers in (employee, admin):
+        client.get("/auth/me", headers=headers)
+    for i in range(5):
+        client.post("/employee/expenses", headers=employee, json={
+            "amount": 10 + i, "category": f"cat-{i % 2}", "description": "budget",
+            "expense_date": "2024-03-01"
+        })
+    client.post("/admin/payroll-runs", headers=admin, json={
+        "month_year": "2024-03", "items": [{"employee_id": employee_id, "basic_salary": 1000}]
+    })
+    return {"admin": admin, "employee": employee}
+
+# Hot endpoints and the exact number of statements each issues; the counts
+# must not grow with the number of rows returned
+HOT_ENDPOINTS = [
+    ("admin", "/admin/dashboard-stats", 1),
+    ("employee", "/employee/dashboard-stats", 1),
+    ("admin", "/admin/salary-slips", 1),
+    ("admin", "/admin/expenses", 1),
+    ("admin", "/admin/employees", 1),
+    ("employee", "/employee/expenses", 1),
+    ("employee", "/employee/salary-slips", 1),
+    ("admin", "/analytics/employee-expenses", 1),
+    ("admin", "/analytics/salary-trends", 1),
+    ("admin", "/analytics/expense-breakdown", 1),
+    ("employee", "/analytics/my-expense-breakdown", 1),
+]
+
+@pytest.mark.parametrize("role,path,max_queries", HOT_ENDPOINTS)
+def test_hot_endpoint_query_budget(seeded, role, path, max_queries):
+    response_cache.backend.clear()
+    with QueryBudget(max_queries=max_queries, label=path) as budget:
+        response = client.get(path, headers=seeded[role])
+    assert response.status_code == 200
+    # A budget above the real count would let a regression through unnoticed
+    assert budget.count == max_queries
+
+def test_budget_reports_repeated_statements():
+    from app.models.user import User
+    from app.utils.database import SessionLocal
+
+    with pytest.raises(QueryBudgetExceeded) as excinfo:
+        with QueryBudget(max_queries=2, label="n+1"), SessionLocal() as db:
+            for user_id in range(3):
+                db.get(User, user_id)
+    assert "n+1 issued 3 queries, budget is 2" in str(excinfo.value)
+    assert "3x SELECT users" in str(excinfo.value)
+
+def test_budget_decorator_and_slow_threshold():
+    from sqlalchemy import text
+    from app.utils.database import engine
+
+    @QueryBudget(slow_query_ms=0)
+    def run_query():
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    with pytest.raises(QueryBudgetExceeded, match="run_query ran a .*ms statement"):
+        run_query()
@@ -0,0 +1,85 @@
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from app.middleware.rate_limit import LocalRateLimitStore, RateLimiter, RateLimitRule, parse_rate
+from app.utils.auth import create_access_token
+
+def test_parse_rate():
+    assert parse_rate("60/minute") == RateLimitRule(60, 60)
+    assert parse_rate("5/seconds") == RateLimitRule(5, 1)
+
+def test_sliding_window_weights_previous_window():
+    store = LocalRateLimitStore()
+    rule = RateLimitRule(10, 60)
+    for _ in range(10):
+        assert store.hit("k", rule, now=60.0).allowed
+    assert not store.hit("k", rule, now=119.0).allowed
+
+    # Halfway into the next window, half of the previous 10 still count
+    decisions = [store.hit("k", rule, now=150.0) for _ in range(6)]
+    assert [d.allowed for d in decisions] == [True] * 5 + [False]
+    assert decisions[-1].retry_after >= 1
+
+def test_idle_keys_are_evicted():
+    store = LocalRateLimitStore()
+    rule = RateLimitRule(10, 60)
+    store.hit("old", rule, now=0.0)
+    store.hit("recent", rule, now=100.0)
+    assert store.evict_idle(now=130.0) == 1
+    assert len(store) == 1
+
+def _client(**options):
+    app = FastAPI()
+    limiter = RateLimiter(LocalRateLimitStore(), **options)
+    app.middleware("http")(limiter)
+
+    @app.get("/health")
+    def health():
+        return {"status": "healthy"}
+
+    @app.post("/auth/login")
+    def login():
+        return {}
+
+    @app.get("/data")
+    def data():
+        return {}
+
+    return TestClient(app)
+
+def test_middleware_returns_429_with_retry_after():
+    client = _client(anonymous="2/minute", exempt_paths=("/health",))
+    assert client.get("/data").headers["X-RateLimit-Remaining"] == "1"
+    assert client.get("/data").status_code == 200
+    limited = client.get("/data")
+    assert limited.status_code == 429
+    assert int(limited.headers["Retry-After"]) >= 1
+    assert client.get("/health").status_code == 200
+
+def test_route_and_user_limits():
+    client = _client(anonymous="100/minute", authenticated="3/minute", routes={"POST /auth/*": "1/minute"})
+    assert client.post("/auth/login").status_code == 200
+    assert client.post("/auth/login").status_code == 429
+    assert client.get("/data").status_code == 200
+
+    # Each user gets a separate bucket from the anonymous client IP
+    for user_id in (1, 2):
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': user_id})}"}
+        assert [client.get("/data", headers=headers).status_code for _ in range(4)] == [200, 200, 200, 429]
+
+def test_rejected_route_does_not_consume_client_quota():
+    client = _client(anonymous="3/minute", routes={"POST /auth/*": "1/minute"})
+    assert [client.post("/auth/login").status_code for _ in range(3)] == [200, 429, 429]
+    assert [client.get("/data").status_code for _ in range(3)] == [200, 200, 429]
+
+def test_client_ip_from_trusted_proxy():
+    limiter = RateLimiter(LocalRateLimitStore(), trusted_proxies=("10.0.0.0/8",))
+
+    def request(peer, forwarded=None):
+        headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+        return Request({"type": "http", "client": (peer, 1234), "headers": headers})
+
+    assert limiter.client_ip(request("10.0.0.1", "203.0.113.7, 10.0.0.2")) == "203.0.113.7"
+    assert limiter.client_ip(request("10.0.0.1", "198.51.100.1, 203.0.113.7")) == "203.0.113.7"
+    assert limiter.client_ip(request("10.0.0.1")) == "10.0.0.1"
+    # A client cannot pick its own bucket by sending the header directly
+    assert limiter.client_ip(request("203.0.113.7", "198.51.100.1")) == "203.0.113.7"
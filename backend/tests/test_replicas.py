@@ -0,0 +1,86 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from app.main import app
+from app.models.aggregates import MonthlySalaryTotal
+from app.utils import replicas as replica_module
+from app.utils.database import STICKY_KEY, SessionLocal, create_configured_engine
+from app.utils.migrations import run_migrations
+from app.utils.replicas import ReplicaRouter
+
+client = TestClient(app)
+
+def _replica(path, month):
+    """A SQLite stand-in whose monthly total identifies it."""
+    url = f"sqlite:///{path}"
+    engine = create_configured_engine(url)
+    run_migrations(engine)
+    with engine.begin() as conn:
+        conn.execute(MonthlySalaryTotal.__table__.insert().values(
+            month_year=month, total_net_salary=1, slip_count=1
+        ))
+    engine.dispose()
+    return url
+
+def _served_by(session):
+    return session.execute(text("SELECT month_year FROM monthly_salary_totals WHERE month_year LIKE 'replica-%'")).scalar()
+
+@pytest.fixture
+def router(tmp_path, monkeypatch):
+    urls = [_replica(tmp_path / "a.db", "replica-a"), _replica(tmp_path / "b.db", "replica-b")]
+    router = ReplicaRouter(urls, sticky_seconds=60, retry_seconds=60)
+    monkeypatch.setattr(replica_module, "replicas", router)
+    return router
+
+def test_reads_rotate_across_replicas(router):
+    served = set()
+    for _ in range(4):
+        with router.read_session() as db:
+            served.add(_served_by(db))
+    assert served == {"replica-a", "replica-b"}
+
+def test_unreachable_replica_fails_over_and_recovers(router, tmp_path):
+    router.urls.append(f"sqlite:///{tmp_path / 'missing' / 'c.db'}")
+    for _ in range(3):
+        with router.read_session() as db:
+            assert _served_by(db) in ("replica-a", "replica-b")
+    assert router.urls[2] not in router.healthy()
+
+    router.check_health()
+    assert router.healthy() == router.urls[:2]
+    (tmp_path / "missing").mkdir()
+    router.check_health()
+    assert router.healthy() == router.urls
+
+def test_all_replicas_down_falls_back_to_primary(router):
+    for url in router.urls:
+        router.mark_down(url)
+    with router.read_session() as db:
+        assert db.info.get("replica") is None
+        assert _served_by(db) is None
+
+def test_recent_writers_read_from_the_primary(router):
+    with SessionLocal() as db:
+        db.info[STICKY_KEY] = "Bearer writer"
+        db.commit()
+    with router.read_session("Bearer writer") as db:
+        assert db.info.get("replica") is None
+    with router.read_session("Bearer someone-else") as db:
+        assert db.info.get("replica") in router.urls
+
+def test_replica_sessions_refuse_writes(router):
+    with router.read_session() as db:
+        db.add(MonthlySalaryTotal(month_year="never", total_net_salary=1, slip_count=1))
+        with pytest.raises(RuntimeError):
+            db.flush()
+
+def test_analytics_endpoint_reads_from_replica_until_the_caller_writes(router, make_user):
+    headers = make_user("admin").headers
+
+    months = {row["month"] for row in client.get("/analytics/salary-trends?months=1000", headers=headers).json()}
+    assert months & {"replica-a", "replica-b"}
+
+    # A write through the primary keeps this caller's reads there
+    client.post("/admin/analytics/rebuild", headers=headers)
+    months = {row["month"] for row in client.get("/analytics/salary-trends?months=1000", headers=headers).json()}
+    assert not months & {"replica-a", "replica-b"}
@@ -0,0 +1,58 @@
+import io
+import os
+import uuid
+import zipfile
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services.slip_documents import slip_documents
+
+client = TestClient(app)
+
+def _cached_files(slip_id):
+    directory = os.path.join(slip_documents.cache_dir, "slips")
+    return sorted(name for name in os.listdir(directory) if name.startswith(f"slip-{slip_id}-"))
+
+def test_slip_pdf_download_is_cached_and_invalidated_by_edits(make_user):
+    employee_id, _, employee = make_user("employee")
+    admin = make_user("admin").headers
+    other = make_user("employee").headers
+    slip = client.post("/admin/salary-slips", headers=admin, json={
+        "employee_id": employee_id, "month_year": "2024-04", "basic_salary": 4200,
+        "allowances": 300, "deductions": 0, "bonuses": 0, "tax": 500
+    }).json()
+
+    first = client.get(f"/employee/salary-slips/{slip['id']}/pdf", headers=employee)
+    assert first.status_code == 200
+    assert first.headers["content-type"] == "application/pdf"
+    assert first.content.startswith(b"%PDF-1.4") and b"$4,000.00" in first.content
+    cached = _cached_files(slip["id"])
+    assert len(cached) == 1
+
+    assert client.get(f"/admin/salary-slips/{slip['id']}/pdf", headers=admin).content == first.content
+    assert client.get(f"/employee/salary-slips/{slip['id']}/pdf", headers=other).status_code == 404
+
+    client.put(f"/admin/salary-slips/{slip['id']}", headers=admin, json={"bonuses": 1000})
+    edited = client.get(f"/employee/salary-slips/{slip['id']}/pdf", headers=employee)
+    assert b"$5,000.00" in edited.content
+    assert _cached_files(slip["id"]) != cached and len(_cached_files(slip["id"])) == 1
+
+def test_month_archive(make_user):
+    month_year = f"2030-{uuid.uuid4().int % 12 + 1:02d}-{uuid.uuid4().hex[:6]}"
+    admin = make_user("admin").headers
+    employee_ids = [make_user("employee").id for _ in range(3)]
+    client.post("/admin/payroll-runs", headers=admin, json={
+        "month_year": month_year,
+        "items": [{"employee_id": employee_id, "basic_salary": 1000} for employee_id in employee_ids]
+    })
+
+    response = client.get("/admin/salary-slips/archive", headers=admin, params={"month_year": month_year})
+    assert response.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        names = archive.namelist()
+        assert len(names) == 3
+        assert all(archive.read(name).startswith(b"%PDF") for name in names)
+
+    again = client.get("/admin/salary-slips/archive", headers=admin, params={"month_year": month_year})
+    assert again.content == response.content
+    missing = client.get("/admin/salary-slips/archive", headers=admin, params={"month_year": "1999-01"})
+    assert missing.status_code == 404
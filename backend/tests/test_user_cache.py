@@ -0,0 +1,46 @@
+import time
+from fastapi.testclient import TestClient
+from app.main import app
+from app.config import settings
+from app.models.user import User
+from app.utils.database import SessionLocal
+from app.utils.user_cache import UserCache, user_cache
+
+client = TestClient(app)
+
+def test_lru_eviction():
+    cache = UserCache(max_size=2, ttl_seconds=60)
+    cache.set(1, "a")
+    cache.set(2, "b")
+    assert cache.get(1) == "a"
+    cache.set(3, "c")
+    assert cache.get(2) is None
+    assert cache.get(1) == "a"
+    assert cache.get(3) == "c"
+
+def test_ttl_expiry():
+    cache = UserCache(max_size=10, ttl_seconds=0.01)
+    cache.set(1, "a")
+    time.sleep(0.02)
+    assert cache.get(1) is None
+    assert len(cache) == 0
+
+def test_authenticated_requests_use_cache_and_see_updates(make_user):
+    user_id, _, headers = make_user("employee", full_name="Before")
+    assert client.get("/auth/me", headers=headers).json()["full_name"] == "Before"
+    assert user_cache.get(user_id) is not None
+
+    with SessionLocal() as db:
+        db.query(User).filter(User.id == user_id).one().full_name = "After"
+        db.commit()
+
+    assert user_cache.get(user_id) is None
+    assert client.get("/auth/me", headers=headers).json()["full_name"] == "After"
+
+def test_trusted_claims_skip_database(monkeypatch, make_user):
+    headers = make_user("employee").headers
+    monkeypatch.setattr(settings, "AUTH_TRUST_TOKEN_CLAIMS", True)
+    user_cache.clear()
+    response = client.get("/employee/dashboard-stats", headers=headers)
+    assert response.status_code == 200
+    assert len(user_cache) == 0
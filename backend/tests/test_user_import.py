@@ -0,0 +1,55 @@
+import uuid
+from fastapi.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+
+def test_import_employees_reports_each_row(make_user):
+    headers = make_user("admin").headers
+    tag = uuid.uuid4().hex[:12]
+    existing = f"existing-{tag}@example.com"
+    client.post("/auth/signup", json={"email": existing, "password": "pw", "role": "employee"})
+
+    response = client.post("/admin/employees/import", headers=headers, json={
+        "users": [
+            {"email": f"new-a-{tag}@example.com", "password": "pw-a", "full_name": "A"},
+            {"email": existing, "password": "pw"},
+            {"email": f"new-a-{tag}@example.com", "password": "pw-again"},
+            {"email": f"new-b-{tag}@example.com", "password": "pw-b"}
+        ],
+        "chunk_size": 1
+    })
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["requested"], data["created"], data["failed"]) == (4, 2, 2)
+    assert [r["status"] for r in data["results"]] == ["created", "error", "error", "created"]
+    assert "already registered" in data["results"][1]["error"]
+    assert "Duplicate" in data["results"][2]["error"]
+
+    login = client.post("/auth/login", json={"email": f"new-b-{tag}@example.com", "password": "pw-b"})
+    assert login.status_code == 200
+
+def test_import_employees_csv(make_user):
+    headers = make_user("admin").headers
+    tag = uuid.uuid4().hex[:12]
+    content = (
+        "email,password,full_name\n"
+        f"csv-{tag}@example.com,pw,CSV User\n"
+        "not-an-email,pw,\n"
+        f"csv-nopw-{tag}@example.com,,\n"
+    )
+    response = client.post(
+        "/admin/employees/import/csv", headers=headers,
+        files={"file": ("employees.csv", content, "text/csv")}
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert results[0]["status"] == "created"
+    assert results[1]["error"].startswith("email")
+    assert results[2]["error"].startswith("password")
+
+    bad = client.post(
+        "/admin/employees/import/csv", headers=headers,
+        files={"file": ("employees.csv", "name\nx\n", "text/csv")}
+    )
+    assert bad.status_code == 400
@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { adminAPI } from '../../services/api';
+import { useServerEvents } from '../../hooks/useServerEvents';
 import CreateSalarySlip from './CreateSalarySlip';
 import { Card, CardContent, Typography, Button, Table, TableBody, TableCell, TableContainer, TableHead, TableRow, Paper, IconButton, CircularProgress } from '@mui/material';
 import StatCard from '../common/StatCard';
@@ -29,15 +30,11 @@ const AdminDashboard = () => {
 
   useEffect(() => {
     loadData();
-    
-    // Auto-refresh every 30 seconds
-    const interval = setInterval(() => {
-      loadData(true);
-    }, 30000);
-
-    return () => clearInterval(interval);
   }, []);
 
+  // Refresh when a salary slip or expense changes instead of polling
+  useServerEvents(() => loadData(true));
+
   const loadData = async (silent = false) => {
     if (!silent) {
       setLoading(true);
@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { employeeAPI } from '../../services/api';
+import { useServerEvents } from '../../hooks/useServerEvents';
 import ExpenseForm from './ExpenseForm';
 import { Card, CardContent, Button, Table, TableBody, TableCell, TableContainer, TableHead, TableRow, Paper, CircularProgress } from '@mui/material';
 import StatCard from '../common/StatCard';
@@ -24,15 +25,11 @@ const EmployeeDashboard = () => {
 
   useEffect(() => {
     loadData();
-    
-    // Auto-refresh every 30 seconds
-    const interval = setInterval(() => {
-      loadData(true);
-    }, 30000);
-
-    return () => clearInterval(interval);
   }, []);
 
+  // Refresh when a salary slip or expense changes instead of polling
+  useServerEvents(() => loadData(true));
+
   const generatePDF = (slip) => {
     try {
       const doc = new jsPDF();
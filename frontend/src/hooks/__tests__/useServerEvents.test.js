@@ -0,0 +1,91 @@
+import { renderHook, act } from '@testing-library/react';
+import { useServerEvents } from '../useServerEvents';
+
+class MockEventSource {
+  static instances = [];
+
+  constructor(url) {
+    this.url = url;
+    this.listeners = {};
+    this.closed = false;
+    MockEventSource.instances.push(this);
+  }
+
+  addEventListener(type, listener) {
+    this.listeners[type] = listener;
+  }
+
+  emit(type) {
+    this.listeners[type]({ data: '[]' });
+  }
+
+  close() {
+    this.closed = true;
+  }
+}
+
+describe('useServerEvents Hook', () => {
+  beforeEach(() => {
+    jest.useFakeTimers();
+    MockEventSource.instances = [];
+    global.EventSource = MockEventSource;
+    localStorage.setItem('token', 'abc');
+  });
+
+  afterEach(() => {
+    jest.runOnlyPendingTimers();
+    jest.useRealTimers();
+    delete global.EventSource;
+    localStorage.clear();
+  });
+
+  test('subscribes with the stored token', () => {
+    renderHook(() => useServerEvents(jest.fn()));
+    expect(MockEventSource.instances[0].url).toContain('/events/stream?access_token=abc');
+  });
+
+  test('debounces pushed changes into one refresh', () => {
+    const onChange = jest.fn();
+    renderHook(() => useServerEvents(onChange, { debounce: 500 }));
+    const source = MockEventSource.instances[0];
+
+    act(() => {
+      source.emit('changes');
+      source.emit('changes');
+      jest.advanceTimersByTime(500);
+    });
+
+    expect(onChange).toHaveBeenCalledTimes(1);
+  });
+
+  test('polls only while the stream is down', () => {
+    const onChange = jest.fn();
+    renderHook(() => useServerEvents(onChange, { fallbackInterval: 1000 }));
+    const source = MockEventSource.instances[0];
+
+    act(() => {
+      source.onopen();
+      jest.advanceTimersByTime(5000);
+    });
+    expect(onChange).not.toHaveBeenCalled();
+
+    act(() => {
+      source.onerror();
+      jest.advanceTimersByTime(2000);
+    });
+    expect(onChange).toHaveBeenCalledTimes(2);
+
+    act(() => {
+      source.onopen();
+      jest.advanceTimersByTime(5000);
+    });
+    // One catch-up refresh after reconnecting, then no more polling
+    expect(onChange).toHaveBeenCalledTimes(3);
+  });
+
+  test('closes the stream on unmount', () => {
+    const { unmount } = renderHook(() => useServerEvents(jest.fn()));
+    unmount();
+    expect(MockEventSource.instances[0].closed).toBe(true);
+  });
+});
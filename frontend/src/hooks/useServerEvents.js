@@ -0,0 +1,54 @@
+import { useEffect, useRef } from 'react';
+import { API_URL } from '../services/api';
+
+// Calls `onChange` when the server pushes a change the user can see, instead
+// of polling on a timer. Polls every `fallbackInterval` ms only while the
+// event stream is unavailable; EventSource reconnects on its own.
+export const useServerEvents = (onChange, { debounce = 500, fallbackInterval = 30000 } = {}) => {
+  const callback = useRef(onChange);
+  callback.current = onChange;
+
+  useEffect(() => {
+    let refreshTimer = null;
+    let pollInterval = null;
+
+    const refresh = () => {
+      clearTimeout(refreshTimer);
+      refreshTimer = setTimeout(() => callback.current(), debounce);
+    };
+    const startPolling = () => {
+      if (!pollInterval) {
+        pollInterval = setInterval(() => callback.current(), fallbackInterval);
+      }
+    };
+    const stopPolling = () => {
+      clearInterval(pollInterval);
+      pollInterval = null;
+    };
+
+    const token = localStorage.getItem('token');
+    if (!token || typeof EventSource === 'undefined') {
+      startPolling();
+      return stopPolling;
+    }
+
+    let opened = false;
+    const source = new EventSource(`${API_URL}/events/stream?access_token=${encodeURIComponent(token)}`);
+    source.addEventListener('changes', refresh);
+    source.onopen = () => {
+      stopPolling();
+      // Catch up on anything missed while reconnecting
+      if (opened) {
+        refresh();
+      }
+      opened = true;
+    };
+    source.onerror = startPolling;
+
+    return () => {
+      source.close();
+      stopPolling();
+      clearTimeout(refreshTimer);
+    };
+  }, [debounce, fallbackInterval]);
+};